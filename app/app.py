@@ -1,6 +1,31 @@
+from typing import Callable
+
 import reflex as rx
+from starlette.applications import Starlette
+from starlette.routing import Route
+from app.states import routes
 from app.states.quiz_state import QuizState
+from app.states.leaderboard import warm_leaderboard
+from app.states.leaderboard_state import LeaderboardState
+from app.states.location_state import LocationState
+from app.states.qr_cache import warm_location_qr_codes
+from app.states.rating_broadcast import broadcast_rating_aggregates
+from app.states.redis_state import install_state_manager
+from app.states.delta_metrics import (
+    DeltaSizeMiddleware,
+    delta_metrics_enabled,
+    delta_metrics_endpoint,
+    log_delta_summary,
+)
+from app.states.var_profiler import (
+    VarProfileMiddleware,
+    log_var_profile_summary,
+    profile_computed_vars,
+    profiling_enabled,
+    var_profile_endpoint,
+)
 from app.components.header import header
+from app.components.offline import offline_head, offline_sync_trigger
 from app.components.home_page import home_page
 from app.components.quiz_page import quiz_page
 from app.components.results_page import results_page
@@ -9,31 +34,42 @@ from app.components.location_detail_page import location_detail_page
 from app.components.profile_page import profile_page
 from app.components.achievements_page import achievements_page
 from app.components.visited_locations_page import visited_locations_page
+from app.components.leaderboard_page import leaderboard_page
+
 
+def layout(page: Callable[[], rx.Component], route: str) -> Callable[[], rx.Component]:
+    """Wrap a page in the shared header and page chrome."""
 
-def index() -> rx.Component:
-    return rx.el.main(
-        rx.el.div(
-            header(),
+    def component() -> rx.Component:
+        return rx.el.main(
             rx.el.div(
-                rx.match(
-                    QuizState.current_page,
-                    ("home", home_page()),
-                    ("quiz", quiz_page()),
-                    ("results", results_page()),
-                    ("locations", locations_page()),
-                    ("location_detail", location_detail_page()),
-                    ("profile", profile_page()),
-                    ("achievements", achievements_page()),
-                    ("visited_locations", visited_locations_page()),
-                    home_page(),
+                header(route),
+                offline_sync_trigger(),
+                rx.el.div(
+                    page(),
+                    class_name="w-full max-w-4xl mx-auto p-4 md:p-8",
                 ),
-                class_name="w-full max-w-4xl mx-auto p-4 md:p-8",
+                class_name="min-h-screen bg-[#0a0a0f] text-white flex flex-col items-center",
             ),
-            class_name="min-h-screen bg-[#0a0a0f] text-white flex flex-col items-center",
-        ),
-        class_name="font-['Press_Start_2P'] bg-[#0a0a0f]",
-    )
+            class_name="font-['Press_Start_2P'] bg-[#0a0a0f]",
+        )
+
+    component.__name__ = page.__name__
+    return component
+
+
+# route -> (page, extra on_load handlers); every page restores the player first
+PAGES = {
+    routes.HOME: (home_page, []),
+    routes.QUIZ: (quiz_page, [QuizState.reset_quiz]),
+    routes.RESULTS: (results_page, [QuizState.require_finished_quiz]),
+    routes.LOCATIONS: (locations_page, []),
+    routes.LOCATION_DETAIL: (location_detail_page, [LocationState.open_location]),
+    routes.PROFILE: (profile_page, []),
+    routes.ACHIEVEMENTS: (achievements_page, []),
+    routes.VISITED_LOCATIONS: (visited_locations_page, []),
+    routes.LEADERBOARD: (leaderboard_page, [LeaderboardState.refresh]),
+}
 
 
 app = rx.App(
@@ -45,7 +81,27 @@ app = rx.App(
             href="https://fonts.googleapis.com/css2?family=Press+Start+2P&display=swap",
             rel="stylesheet",
         ),
+        *offline_head(),
     ],
     stylesheets=["/styles.css"],
+    # The metrics endpoints only exist while their measurements are switched on
+    api_transformer=Starlette(
+        routes=[
+            *([Route("/metrics/deltas", delta_metrics_endpoint)] if delta_metrics_enabled() else []),
+            *([Route("/metrics/computed-vars", var_profile_endpoint)] if profiling_enabled() else []),
+        ]
+    ),
 )
-app.add_page(index, route="/")
\ No newline at end of file
+install_state_manager(app)
+for route, (page, on_load) in PAGES.items():
+    app.add_page(layout(page, route), route=route, on_load=[LocationState.load_player, *on_load])
+app.register_lifespan_task(warm_location_qr_codes)
+app.register_lifespan_task(warm_leaderboard)
+app.register_lifespan_task(broadcast_rating_aggregates, reflex_app=app)
+if delta_metrics_enabled():
+    app.add_middleware(DeltaSizeMiddleware())
+    app.register_lifespan_task(log_delta_summary)
+if profiling_enabled():
+    profile_computed_vars()
+    app.add_middleware(VarProfileMiddleware())
+    app.register_lifespan_task(log_var_profile_summary)
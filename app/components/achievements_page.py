@@ -1,6 +1,6 @@
 import reflex as rx
-from app.states.user_state import UserState
-from app.states.quiz_state import QuizState
+from app.states import routes
+from app.states.user_state import ACHIEVEMENTS, UserState
 
 
 def achievement_card(achievement_id: str, achievement_data: dict, unlocked: bool) -> rx.Component:
@@ -60,7 +60,7 @@ def achievements_page() -> rx.Component:
                 rx.el.div(
                     rx.el.button(
                         rx.icon("arrow-left", size=16),
-                        on_click=lambda: QuizState.set_page("home"),
+                        on_click=rx.redirect(routes.HOME),
                         class_name="p-1 border border-[#00ff9f] text-[#00ff9f] hover:bg-[#00ff9f] hover:text-black transition-colors mr-4",
                     ),
                     rx.el.div(
@@ -96,14 +96,14 @@ def achievements_page() -> rx.Component:
 
             # Grid
             rx.el.div(
-                rx.foreach(
-                    UserState.achievements,
-                    lambda item: achievement_card(
-                        item[0],
-                        item[1],
-                        UserState.unlocked_achievements.contains(item[0]),
-                    ),
-                ),
+                *[
+                    achievement_card(
+                        achievement_id,
+                        achievement,
+                        UserState.unlocked_achievements.contains(achievement_id),
+                    )
+                    for achievement_id, achievement in ACHIEVEMENTS.items()
+                ],
                 class_name="grid grid-cols-1 md:grid-cols-2 gap-4 w-full",
             ),
 
@@ -1,20 +1,32 @@
 import reflex as rx
-from app.states.quiz_state import QuizState
+from reflex.experimental.client_state import ClientStateVar
+from app.states import routes
 
+NAV_ROUTES = (
+    ("Home", routes.HOME),
+    ("Quiz", routes.QUIZ),
+    ("Locations", routes.LOCATIONS),
+    ("Ranks", routes.LEADERBOARD),
+    ("Profile", routes.PROFILE),
+)
+# Opened and closed in the browser only
+MOBILE_MENU_OPEN = ClientStateVar.create("mobile_menu_open", default=False)
 
-def nav_button(text: str, page: str, is_mobile: bool = False) -> rx.Component:
+
+def nav_button(text: str, route: str, active_route: str) -> rx.Component:
     return rx.el.button(
         text,
-        on_click=lambda: QuizState.set_page(page),
-        class_name=rx.cond(
-            QuizState.current_page == page,
-            "px-4 py-2 text-sm text-[#00ff9f] text-shadow-neon border-b-4 border-[#00ff9f]",
-            "px-4 py-2 text-sm text-gray-400 hover:text-white transition-colors",
+        on_click=rx.redirect(route),
+        class_name=(
+            "px-4 py-2 text-sm text-[#00ff9f] text-shadow-neon border-b-4 border-[#00ff9f]"
+            if route == active_route
+            else "px-4 py-2 text-sm text-gray-400 hover:text-white transition-colors"
         ),
     )
 
 
-def header() -> rx.Component:
+def header(active_route: str) -> rx.Component:
+    """Site header; ``active_route`` is the nav entry to highlight."""
     return rx.el.header(
         rx.el.div(
             rx.el.div(
@@ -29,16 +41,13 @@ def header() -> rx.Component:
                 class_name="flex items-center",
             ),
             rx.el.nav(
-                nav_button("Home", "home"),
-                nav_button("Quiz", "quiz"),
-                nav_button("Locations", "locations"),
-                nav_button("Profile", "profile"),
+                *[nav_button(text, route, active_route) for text, route in NAV_ROUTES],
                 class_name="hidden md:flex items-center gap-4",
             ),
             rx.el.div(
                 rx.el.button(
                     rx.icon(tag="menu", class_name="h-6 w-6"),
-                    on_click=QuizState.toggle_mobile_menu,
+                    on_click=MOBILE_MENU_OPEN.set_value(~MOBILE_MENU_OPEN.value),
                     class_name="md:hidden p-2 text-white",
                 ),
                 class_name="md:hidden",
@@ -46,15 +55,14 @@ def header() -> rx.Component:
             class_name="w-full max-w-4xl flex justify-between items-center",
         ),
         rx.cond(
-            QuizState.mobile_menu_open,
+            MOBILE_MENU_OPEN.value,
             rx.el.div(
                 rx.el.nav(
-                    nav_button("Home", "home", is_mobile=True),
-                    nav_button("Quiz", "quiz", is_mobile=True),
-                    nav_button("Locations", "locations", is_mobile=True),
-                    nav_button("Profile", "profile", is_mobile=True),
+                    *[nav_button(text, route, active_route) for text, route in NAV_ROUTES],
                     class_name="flex flex-col items-start gap-4 p-4",
                 ),
+                # A click on any entry bubbles up here and closes the menu
+                on_click=MOBILE_MENU_OPEN.set_value(False),
                 class_name="md:hidden absolute top-full left-0 w-full bg-[#1a1a2e]/90 backdrop-blur-sm border-b-4 border-[#00ff9f]/20",
             ),
             None,
@@ -1,41 +1,52 @@
 import reflex as rx
-from app.states.location_state import LocationState as LS
+from reflex.event import EventChain
+from reflex.experimental.client_state import ClientStateVar
+from reflex.vars.function import ArgsFunctionOperation, FunctionVar
+from app.components.responsive_image import responsive_image
+from app.states.image_manifest import (
+    MAP_ZOOM_LEVELS,
+    ImageSources,
+    Tile,
+    TileLayout,
+    image_sources,
+    tile_layout,
+)
+from app.states.location_state import FLOOR_SPOTS
+from app.states.routes import location_route
+from app.states.spot_geometry import (
+    BUILDINGS,
+    CAMPUS_MAP_IMAGE,
+    FLOOR_MAPS,
+    OUTDOOR,
+    building_floors,
+)
+
+# Icon under the pointer; kept in the browser, so hovering sends no events
+HOVERED_ICON = ClientStateVar.create("hovered_map_icon", default="")
+
+# Part of the tiled map inside its scroll box, as fractions of the map size.
+# Kept in the browser, so panning picks tiles without a server round trip
+MAP_VIEWPORT = ClientStateVar.create(
+    "map_viewport", default={"left": 0, "top": 0, "right": 1, "bottom": 1}
+)
+MAP_VIEWPORT_ATTR = "data-map-viewport"
 
 
 class MapState(rx.State):
     """State for interactive map navigation"""
     selected_building: str = ""  # "library" or "jcit" or ""
     current_floor: str = "G"  # Current floor level
-    hovered_icon: str = ""  # Currently hovered location icon
     show_floor_detail: bool = False  # Show detailed floor map
-    
-    # Building to floor mapping
-    building_floors: dict[str, list[str]] = {
-        "library": ["G"],
-        "jcit": ["11", "P"]
-    }
-    
-    # Location to building/floor mapping
-    location_map: dict[str, dict[str, str]] = {
-        "cloud-nine-credit": {"building": "library", "floor": "G", "icon": "far", "x": "60%", "y": "9%"},
-        "the-spynap-alley": {"building": "library", "floor": "G", "icon": "middle", "x": "7%", "y": "9%"},
-        "the-public-isolation": {"building": "library", "floor": "G", "icon": "close", "x": "43%", "y": "65%"},
-        "the-urban-zen": {"building": "outdoor", "floor": "outdoor", "icon": "middle", "x": "60%", "y": "59%"},
-        "the-shade-throne": {"building": "outdoor", "floor": "outdoor", "icon": "close", "x": "50%", "y": "48%"},
-        "the-stonecold-zen": {"building": "outdoor", "floor": "outdoor", "icon": "far", "x": "40%", "y": "60%"},
-        "the-bobafueled-snooze": {"building": "jcit", "floor": "P", "icon": "close", "x": "72%", "y": "28%"},
-        "the-stairwell-stealth": {"building": "jcit", "floor": "11", "icon": "far", "x": "48%", "y": "35%"},
-        "the-curtaincall-nap": {"building": "jcit", "floor": "11", "icon": "middle", "x": "60%", "y": "45%"},
-        "the-modular-dream": {"building": "jcit", "floor": "11", "icon": "middle", "x": "53%", "y": "60%"},
-    }
+    map_zoom: int = 1  # Zoom factor of the tiled map, one of MAP_ZOOM_LEVELS
     
     @rx.event
     def select_building(self, building: str):
         """Select a building and show its first floor"""
         self.selected_building = building
         self.show_floor_detail = True
-        if building in self.building_floors:
-            self.current_floor = self.building_floors[building][0]
+        self.map_zoom = 1
+        if building in BUILDINGS:
+            self.current_floor = BUILDINGS[building]["floors"][0]
     
     @rx.event
     def change_floor(self, direction: str):
@@ -43,7 +54,7 @@ class MapState(rx.State):
         if not self.selected_building:
             return
         
-        floors = self.building_floors.get(self.selected_building, [])
+        floors = building_floors(self.selected_building)
         if not floors:
             return
         
@@ -56,111 +67,36 @@ class MapState(rx.State):
         except ValueError:
             pass
     
-    @rx.event
-    async def select_location_and_close(self, location_id: str):
-        """Select a location and close the floor view"""
-        location_state = await self.get_state(LS)
-        await location_state.select_location(location_id)
-        self.show_floor_detail = False
-        self.selected_building = ""
-    
     @rx.event
     def close_floor_view(self):
         """Close the detailed floor view"""
         self.show_floor_detail = False
         self.selected_building = ""
+        self.map_zoom = 1
     
     @rx.event
-    def set_hovered_icon(self, location_id: str):
-        """Set the hovered location icon"""
-        self.hovered_icon = location_id
+    def zoom_map(self, direction: str):
+        """Step the tiled map zoom in or out"""
+        index = MAP_ZOOM_LEVELS.index(self.map_zoom) if self.map_zoom in MAP_ZOOM_LEVELS else 0
+        if direction == "in":
+            index = min(index + 1, len(MAP_ZOOM_LEVELS) - 1)
+        elif direction == "out":
+            index = max(index - 1, 0)
+        self.map_zoom = MAP_ZOOM_LEVELS[index]
     
     @rx.var
     def current_floor_locations(self) -> list[dict]:
         """Get locations for the current floor"""
         if not self.selected_building:
             return []
-        
-        # Access locations directly from the class
-        all_locations = [
-            {
-                "id": "cloud-nine-credit",
-                "location": "Study room on the G floor of the library",
-                "name": "Cloud Nine Credit Charge",
-                "icon_type": "far",
-                "x": "30%",
-                "y": "18%"
-            },
-            {
-                "id": "the-spynap-alley",
-                "location": "The corridor of bookshelves on the G floor of the library",
-                "name": "The Spy-Nap Alley",
-                "icon_type": "middle",
-                "x": "7%",
-                "y": "18%"
-            },
-            {
-                "id": "the-public-isolation",
-                "location": "Sofa on the G floor of the library",
-                "name": "The Public Isolation Island",
-                "icon_type": "close",
-                "x": "42%",
-                "y": "64%"
-            },
-            {
-                "id": "the-bobafueled-snooze",
-                "location": "JCIT Milk Tea Shop",
-                "name": "The Boba-Fueled Snooze Booth",
-                "icon_type": "close",
-                "x": "68%",
-                "y": "33%"
-            },
-            {
-                "id": "the-stairwell-stealth",
-                "location": "JCIT Stairwell",
-                "name": "The Stairwell Stealth Suite",
-                "icon_type": "far",
-                "x": "43%",
-                "y": "35%"
-            },
-            {
-                "id": "the-curtaincall-nap",
-                "location": "JCIT Study Room Partition Area",
-                "name": "The Curtain-Call Nap Studio",
-                "icon_type": "middle",
-                "x": "63%",
-                "y": "55%"
-            },
-            {
-                "id": "the-modular-dream",
-                "location": "JCIT Study Room Sofa",
-                "name": "The Modular Dream Fort",
-                "icon_type": "middle",
-                "x": "54%",
-                "y": "75%"
-            },
-        ]
-        
-        locations = []
-        for loc in all_locations:
-            loc_id = loc["id"]
-            if loc_id in self.location_map:
-                loc_info = self.location_map[loc_id]
-                if (loc_info["building"] == self.selected_building and 
-                    loc_info["floor"] == self.current_floor):
-                    locations.append(loc)
-        return locations
-    
-    def get_floor_locations(self, all_locations: list) -> list[dict]:
-        """Get locations for the current floor (unused, kept for compatibility)"""
-        return []
+        return FLOOR_SPOTS.get((self.selected_building, self.current_floor), [])
     
     @rx.var
     def can_go_up(self) -> bool:
         """Check if can navigate up"""
         if not self.selected_building:
             return False
-        floors = self.building_floors.get(self.selected_building, [])
+        floors = building_floors(self.selected_building)
         try:
             return floors.index(self.current_floor) > 0
         except ValueError:
@@ -171,7 +107,7 @@ class MapState(rx.State):
         """Check if can navigate down"""
         if not self.selected_building:
             return False
-        floors = self.building_floors.get(self.selected_building, [])
+        floors = building_floors(self.selected_building)
         try:
             return floors.index(self.current_floor) < len(floors) - 1
         except ValueError:
@@ -180,52 +116,50 @@ class MapState(rx.State):
     @rx.var
     def floor_map_image(self) -> str:
         """Get the floor map image path"""
-        if not self.selected_building or not self.current_floor:
-            return ""
-        
-        if self.selected_building == "library":
-            if self.current_floor == "G":
-                return "/map images/Pao Yue-kong Library G Floor.png"
-            elif self.current_floor == "1":
-                return "/map images/Pao Yue-kong Library floor 1.png"
-        elif self.selected_building == "jcit":
-            if self.current_floor == "P":
-                return "/map images/Jockey Club Innovation Tower P.png"
-            elif self.current_floor == "11":
-                return "/map images/Jockey Club Innovation Tower 11F.png"
-        
-        return ""
+        floor_map = FLOOR_MAPS.get((self.selected_building, self.current_floor))
+        return floor_map["image"] if floor_map else ""
     
     @rx.var
     def building_display_name(self) -> str:
         """Get display name for building"""
-        if self.selected_building == "library":
-            return "Pao Yue-kong Library"
-        elif self.selected_building == "jcit":
-            return "Jockey Club Innovation Tower"
-        return ""
+        building = BUILDINGS.get(self.selected_building)
+        return building["name"] if building else ""
     
     @rx.var
     def floor_display_name(self) -> str:
         """Get display name for current floor"""
-        if self.selected_building == "library":
-            if self.current_floor == "G":
-                return "Ground Floor"
-            elif self.current_floor == "1":
-                return "1st Floor"
-        elif self.selected_building == "jcit":
-            if self.current_floor == "P":
-                return "P Floor"
-            elif self.current_floor == "11":
-                return "11th Floor"
-        return self.current_floor
+        floor_map = FLOOR_MAPS.get((self.selected_building, self.current_floor))
+        return floor_map["name"] if floor_map else self.current_floor
     
     @rx.var
     def current_map_image(self) -> str:
         """Get current map image - floor map if building selected, otherwise campus map"""
         if self.selected_building:
             return self.floor_map_image
-        return "/map images/POLYU MAP.png"
+        return CAMPUS_MAP_IMAGE
+    
+    @rx.var
+    def current_map_sources(self) -> ImageSources:
+        """Optimized srcsets for the current map image"""
+        return image_sources(self.current_map_image)
+    
+    @rx.var
+    def current_map_tiles(self) -> TileLayout:
+        """Deep-zoom tile grid of the current map at the current zoom"""
+        return tile_layout(self.current_map_image, self.map_zoom)
+    
+    @rx.var
+    def map_zoom_width(self) -> str:
+        """Width of the zoomed map relative to its viewport"""
+        return f"{self.map_zoom * 100}%"
+    
+    @rx.var
+    def can_zoom_in(self) -> bool:
+        return self.map_zoom < MAP_ZOOM_LEVELS[-1]
+    
+    @rx.var
+    def can_zoom_out(self) -> bool:
+        return self.map_zoom > MAP_ZOOM_LEVELS[0]
 
 
 def floor_location_icon(location: rx.Var[dict]) -> rx.Component:
@@ -247,7 +181,7 @@ def floor_location_icon(location: rx.Var[dict]) -> rx.Component:
         ),
         # Popup on hover
         rx.cond(
-            MapState.hovered_icon == location.id,
+            HOVERED_ICON.value == location.id,
             rx.el.div(
                 rx.el.div(
                     rx.text(
@@ -264,16 +198,17 @@ def floor_location_icon(location: rx.Var[dict]) -> rx.Component:
             ),
             rx.el.div()
         ),
-        on_mouse_enter=MapState.set_hovered_icon(location.id),
-        on_mouse_leave=MapState.set_hovered_icon(""),
-        on_click=MapState.select_location_and_close(location.id),
+        on_mouse_enter=HOVERED_ICON.set_value(location.id),
+        on_mouse_leave=HOVERED_ICON.set_value(""),
+        # Navigate right away; the floor view is closed for when the player comes back
+        on_click=[rx.redirect(location_route(location.id)), MapState.close_floor_view],
         class_name="absolute cursor-pointer",
         # Position based on location data
         style={
             "top": location.y,
             "left": location.x,
             "transform": "translate(-50%, -100%)",  # Center the icon horizontally and position bottom at coordinate
-            "zIndex": rx.cond(MapState.hovered_icon == location.id, "100", "40"),
+            "zIndex": rx.cond(HOVERED_ICON.value == location.id, "100", "40"),
         }
     )
 
@@ -296,13 +231,13 @@ def outdoor_location_icon(location_id: str, location_name: str, x: str, y: str,
                     }
                 }
             ),
-            on_click=LS.select_location(location_id),
+            on_click=rx.redirect(location_route(location_id)),
             class_name="relative z-30"
         ),
         
         # Hover popup showing location name
         rx.cond(
-            MapState.hovered_icon == location_id,
+            HOVERED_ICON.value == location_id,
             rx.el.div(
                 rx.el.div(
                     rx.text(
@@ -320,15 +255,15 @@ def outdoor_location_icon(location_id: str, location_name: str, x: str, y: str,
             rx.el.div()
         ),
         
-        on_mouse_enter=MapState.set_hovered_icon(location_id),
-        on_mouse_leave=MapState.set_hovered_icon(""),
+        on_mouse_enter=HOVERED_ICON.set_value(location_id),
+        on_mouse_leave=HOVERED_ICON.set_value(""),
         
         class_name="absolute cursor-pointer",
         style={
             "top": y,
             "left": x,
             "transform": "translate(-50%, -100%)",
-            "zIndex": rx.cond(MapState.hovered_icon == location_id, "100", "30"),
+            "zIndex": rx.cond(HOVERED_ICON.value == location_id, "100", "30"),
         }
     )
 
@@ -357,11 +292,11 @@ def building_icon_on_main_map(building: str, x: str, y: str) -> rx.Component:
         
         # Hover popup showing building name
         rx.cond(
-            MapState.hovered_icon == building,
+            HOVERED_ICON.value == building,
             rx.el.div(
                 rx.el.div(
                     rx.text(
-                        "Pao Yue-kong Library" if building == "library" else "Jockey Club Innovation Tower",
+                        BUILDINGS[building]["name"],
                         class_name="text-sm font-bold text-[#00ff9f] mb-1"
                     ),
                     rx.text(
@@ -375,18 +310,104 @@ def building_icon_on_main_map(building: str, x: str, y: str) -> rx.Component:
             rx.el.div()
         ),
         
-        on_mouse_enter=MapState.set_hovered_icon(building),
-        on_mouse_leave=MapState.set_hovered_icon(""),
+        on_mouse_enter=HOVERED_ICON.set_value(building),
+        on_mouse_leave=HOVERED_ICON.set_value(""),
         
         class_name="absolute cursor-pointer",
         style={
             "top": y,
             "left": x,
-            "zIndex": rx.cond(MapState.hovered_icon == building, "100", "30"),
+            "zIndex": rx.cond(HOVERED_ICON.value == building, "100", "30"),
+        }
+    )
+
+
+def measure_map_viewport(element: str) -> rx.Var:
+    """Event handler that stores the visible part of the map in MAP_VIEWPORT.
+
+    ``element`` is JS for the scroll box, evaluated against the event ``_e``.
+    """
+    viewport = rx.Var(
+        f"((box) => ({{left: box.scrollLeft / box.scrollWidth, top: box.scrollTop / box.scrollHeight, "
+        f"right: (box.scrollLeft + box.clientWidth) / box.scrollWidth, "
+        f"bottom: (box.scrollTop + box.clientHeight) / box.scrollHeight}}))({element})"
+    )
+    return ArgsFunctionOperation.create(("_e",), MAP_VIEWPORT.set.call(viewport)).to(FunctionVar, EventChain)
+
+
+# Tiles of ``layout`` overlapping ``view``, plus one tile of margin on every side
+_VISIBLE_TILES = ArgsFunctionOperation.create(
+    ("layout", "view"),
+    rx.Var(
+        """const size = layout.tile_size;
+const first = (start, extent, count) => Math.min(count, Math.max(0, Math.floor(start * extent / size) - 1));
+const last = (end, extent, count) => Math.min(count, Math.ceil(end * extent / size) + 1);
+const percent = (value, extent) => `${(value * 100 / extent).toFixed(4)}%`;
+const tiles = [];
+for (let row = first(view.top, layout.height, layout.rows); row < last(view.bottom, layout.height, layout.rows); row++) {
+  for (let col = first(view.left, layout.width, layout.cols); col < last(view.right, layout.width, layout.cols); col++) {
+    tiles.push({
+      src: `${layout.path}/${col}_${row}.webp`,
+      left: percent(col * size, layout.width),
+      top: percent(row * size, layout.height),
+      width: percent(Math.min(size, layout.width - col * size), layout.width),
+      height: percent(Math.min(size, layout.height - row * size), layout.height),
+    });
+  }
+}
+return tiles;"""
+    ),
+    explicit_return=True,
+)
+
+
+def visible_map_tiles() -> rx.Var[list[Tile]]:
+    return _VISIBLE_TILES.call(MapState.current_map_tiles, MAP_VIEWPORT.value).to(list[Tile])
+
+
+def map_tile(tile: rx.Var[Tile]) -> rx.Component:
+    """One deep-zoom tile"""
+    return rx.el.img(
+        src=tile["src"],
+        decoding="async",
+        draggable=False,
+        class_name="absolute block max-w-none select-none",
+        style={
+            "left": tile["left"],
+            "top": tile["top"],
+            "width": tile["width"],
+            "height": tile["height"],
         }
     )
 
 
+def tiled_map() -> rx.Component:
+    """Tiles in view over a tiny placeholder so first paint never waits on the full map"""
+    return rx.el.div(
+        # Remounted on every zoom step, so its load event measures the resized scroll box
+        rx.el.img(
+            src=MapState.current_map_tiles["thumbnail"],
+            key=MapState.map_zoom,
+            alt="",
+            draggable=False,
+            # Img has no on_load trigger in Reflex; the handler is a plain React prop
+            custom_attrs={"onLoad": measure_map_viewport(f'_e.currentTarget.closest("[{MAP_VIEWPORT_ATTR}]")')},
+            class_name="absolute inset-0 w-full h-full max-w-none select-none",
+        ),
+        rx.foreach(visible_map_tiles(), map_tile),
+        class_name="absolute inset-0",
+    )
+
+
+def map_zoom_button(icon: str, direction: str, enabled: rx.Var[bool]) -> rx.Component:
+    return rx.el.button(
+        rx.icon(tag=icon, size=20, color="#00ff9f"),
+        on_click=MapState.zoom_map(direction),
+        disabled=~enabled,
+        class_name="p-2 hover:bg-gray-800 rounded transition-colors disabled:opacity-30"
+    )
+
+
 def interactive_campus_map() -> rx.Component:
     """Main interactive campus map"""
     return rx.el.div(
@@ -421,40 +442,69 @@ def interactive_campus_map() -> rx.Component:
             
             # Main map display area
             rx.el.div(
-                # Map image (campus or floor)
+                # Map image (campus or floor), scrollable when zoomed
                 rx.el.div(
-                    rx.image(
-                        src=MapState.current_map_image,
-                        class_name="w-full h-auto"
-                    ),
+                    rx.el.div(
+                        rx.cond(
+                            MapState.current_map_tiles["tiled"],
+                            tiled_map(),
+                            responsive_image(
+                                MapState.current_map_sources,
+                                sizes="(min-width: 768px) 768px, 100vw",
+                                loading="eager",
+                                class_name="w-full h-auto"
+                            ),
+                        ),
                     
-                    # Campus map icons (only show when no building selected)
-                    rx.cond(
-                        MapState.selected_building == "",
-                        rx.fragment(
-                            # Building icons
-                            building_icon_on_main_map("library", "47%", "76%"),
-                            building_icon_on_main_map("jcit", "48%", "28%"),
+                        # Campus map icons (only show when no building selected)
+                        rx.cond(
+                            MapState.selected_building == "",
+                            rx.fragment(
+                                # Building icons
+                                *[
+                                    building_icon_on_main_map(building_id, building["x"], building["y"])
+                                    for building_id, building in BUILDINGS.items()
+                                ],
                             
-                            # Outdoor locations
-                            outdoor_location_icon("the-urban-zen", "The Urban Zen Bench", "60%", "59%", "middle"),
-                            outdoor_location_icon("the-shade-throne", "The Shade Throne", "58%", "51%", "close"),
-                            outdoor_location_icon("the-stonecold-zen", "The Stone-Cold Zen Zone", "57%", "62%", "far"),
+                                # Outdoor locations
+                                *[
+                                    outdoor_location_icon(spot["id"], spot["name"], spot["x"], spot["y"], spot["icon_type"])
+                                    for spot in FLOOR_SPOTS[(OUTDOOR, OUTDOOR)]
+                                ],
+                            ),
+                            rx.fragment()
                         ),
-                        rx.fragment()
-                    ),
                     
-                    # Floor location icons (only show when building selected)
-                    rx.cond(
-                        MapState.selected_building != "",
-                        rx.foreach(
-                            MapState.current_floor_locations,
-                            floor_location_icon
+                        # Floor location icons (only show when building selected)
+                        rx.cond(
+                            MapState.selected_building != "",
+                            rx.foreach(
+                                MapState.current_floor_locations,
+                                floor_location_icon
+                            ),
+                            rx.fragment()
                         ),
-                        rx.fragment()
-                    ),
                     
-                    class_name="relative w-full"
+                        class_name="relative",
+                        style={
+                            "width": MapState.map_zoom_width,
+                            "aspectRatio": MapState.current_map_tiles["aspect_ratio"],
+                        }
+                    ),
+                    on_scroll=measure_map_viewport("_e.currentTarget"),
+                    custom_attrs={MAP_VIEWPORT_ATTR: ""},
+                    class_name=rx.cond(MapState.map_zoom > 1, "w-full overflow-auto max-h-[70vh]", "w-full")
+                ),
+                
+                # Zoom controls (only for tiled maps)
+                rx.cond(
+                    MapState.current_map_tiles["tiled"],
+                    rx.el.div(
+                        map_zoom_button("zoom-in", "in", MapState.can_zoom_in),
+                        map_zoom_button("zoom-out", "out", MapState.can_zoom_out),
+                        class_name="flex flex-col gap-1 absolute left-4 top-4 z-50 bg-[#0a0a0f]/90 pixel-border rounded p-1"
+                    ),
+                    rx.fragment()
                 ),
                 
                 # Floor navigation arrows (only show when building selected and has multiple floors)
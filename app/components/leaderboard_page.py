@@ -0,0 +1,75 @@
+import reflex as rx
+from app.states import routes
+from app.states.leaderboard_state import LEADERBOARD_SIZE, LeaderboardState
+
+
+def leaderboard_row(entry: rx.Var[dict]) -> rx.Component:
+    return rx.el.div(
+        rx.text(
+            "#", entry["rank"],
+            class_name="w-12 text-sm font-bold text-[#ffd700]"
+        ),
+        rx.el.div(
+            rx.text(entry["name"], class_name="text-sm font-bold text-gray-200 uppercase tracking-wider truncate"),
+            rx.text("LVL ", entry["level"], class_name="text-[10px] text-gray-500"),
+            class_name="flex flex-col flex-grow min-w-0"
+        ),
+        rx.text(entry["xp"], " XP", class_name="text-xs font-bold text-[#00ff9f] ml-4"),
+        class_name=rx.cond(
+            entry["is_you"],
+            "flex items-center p-3 bg-[#00ff9f]/10 border border-[#00ff9f]",
+            "flex items-center p-3 bg-[#0f172a] border border-gray-800",
+        ),
+    )
+
+
+def leaderboard_page() -> rx.Component:
+    return rx.el.div(
+        rx.el.div(
+            # Header Section
+            rx.el.div(
+                rx.el.div(
+                    rx.el.button(
+                        rx.icon("arrow-left", size=16),
+                        on_click=rx.redirect(routes.HOME),
+                        class_name="p-1 border border-[#00ff9f] text-[#00ff9f] hover:bg-[#00ff9f] hover:text-black transition-colors mr-4",
+                    ),
+                    rx.el.div(
+                        rx.el.h1("LEADERBOARD", class_name="text-2xl font-bold text-[#00ff9f] tracking-widest text-shadow-neon-green"),
+                        rx.el.p(
+                            rx.text("TOP ", LEADERBOARD_SIZE, " OF ", LeaderboardState.total_players, " NAPPERS"),
+                            class_name="text-xs text-gray-400 font-mono mt-1"
+                        ),
+                        class_name="flex flex-col"
+                    ),
+                    class_name="flex items-center"
+                ),
+                rx.el.button(
+                    rx.icon("refresh-cw", class_name="w-6 h-6"),
+                    on_click=LeaderboardState.refresh,
+                    class_name="text-[#ffd700] hover:opacity-80 transition-opacity",
+                ),
+                class_name="w-full border-2 border-[#00ff9f] p-4 flex justify-between items-center bg-[#00ff9f]/5 mb-6"
+            ),
+
+            # Your Rank
+            rx.el.div(
+                rx.text("YOUR RANK", class_name="text-xs font-bold text-gray-400 tracking-wider"),
+                rx.cond(
+                    LeaderboardState.my_rank > 0,
+                    rx.text("#", LeaderboardState.my_rank, class_name="text-xs font-bold text-[#00ff9f]"),
+                    rx.text("EARN XP TO GET RANKED", class_name="text-xs font-bold text-gray-500"),
+                ),
+                class_name="w-full border border-[#bd00ff] p-4 bg-[#bd00ff]/5 mb-8 flex justify-between"
+            ),
+
+            # Rankings
+            rx.el.div(
+                rx.foreach(LeaderboardState.top_players, leaderboard_row),
+                class_name="flex flex-col gap-2 w-full",
+            ),
+
+            class_name="max-w-4xl mx-auto w-full"
+        ),
+        class_name="min-h-screen bg-[#050510] p-4 md:p-8 font-mono"
+    )
@@ -1,12 +1,45 @@
 import reflex as rx
-from app.states.quiz_state import QuizState
+from reflex.event import EventChain
+from reflex.experimental.client_state import ClientStateVar
+from reflex.vars.function import ArgsFunctionOperation, FunctionVar
+from app.states import routes
+from app.states.rating_stats import DEFAULT_STARS, RATING_DIMENSIONS
 from app.states.location_state import LocationState
-from app.components.sketchfab import sketchfab_model
+from app.components.offline import offline_action
+from app.components.sketchfab import sketchfab_facade
+from app.components.responsive_image import responsive_image
+
+# Whether the pointer is over the spot's address, which shows its map
+HOVERING_LOCATION_TITLE = ClientStateVar.create("hovering_location_title", default=False)
+
+# The rating being drafted lives in the browser, so dragging a slider sends
+# nothing to the backend; the five values go in one event on submit
+RATING_DRAFT = {
+    dimension: ClientStateVar.create(f"rating_draft_{dimension}", default=DEFAULT_STARS)
+    for dimension in RATING_DIMENSIONS
+}
+
+
+def rating_draft() -> dict[str, rx.Var]:
+    return {dimension: draft.value for dimension, draft in RATING_DRAFT.items()}
+
+
+def reset_rating_draft() -> rx.Var:
+    """Click handler that moves every slider back to the default."""
+    return ArgsFunctionOperation.create(
+        (), rx.Var.create([draft.set.call(DEFAULT_STARS) for draft in RATING_DRAFT.values()])
+    ).to(FunctionVar, EventChain)
+
+
+def set_rating_draft(category: str) -> rx.Var:
+    """``on_change`` handler that keeps a slider's value in the draft."""
+    slider_value = rx.Var("_e").to(dict)["target"].to(dict)["valueAsNumber"].to(int)
+    return RATING_DRAFT[category].set_value(slider_value)
 
 
 def rating_bar_stat(label: str, category: str, icon: str, color: str) -> rx.Component:
     """Display a rating stat with bars instead of slider"""
-    current_value = LocationState.new_rating[category]
+    current_value = RATING_DRAFT[category].value
     
     return rx.el.div(
         rx.el.div(
@@ -34,8 +67,8 @@ def rating_bar_stat(label: str, category: str, icon: str, color: str) -> rx.Comp
             type="range",
             min=1,
             max=5,
-            default_value=LocationState.new_rating[category].to(str),
-            on_change=lambda val: LocationState.set_new_rating_value(category, val).throttle(50),
+            value=current_value,
+            on_change=set_rating_draft(category),
             key=f"rating-slider-{category}",
             class_name="w-full h-1 bg-[#1a1a2e] rounded-lg appearance-none cursor-pointer accent-[#00ff9f] opacity-0 absolute",
             style={"marginTop": "-30px"}
@@ -44,14 +77,41 @@ def rating_bar_stat(label: str, category: str, icon: str, color: str) -> rx.Comp
             type="range",
             min=1,
             max=5,
-            default_value=LocationState.new_rating[category].to(str),
-            on_change=lambda val: LocationState.set_new_rating_value(category, val).throttle(50),
+            value=current_value,
+            on_change=set_rating_draft(category),
             class_name="w-full h-2 bg-[#0a0a0f] rounded-lg appearance-none cursor-pointer range-lg accent-[#00ff9f]",
         ),
         class_name="w-full mb-4 relative"
     )
 
 
+def rating_distribution_row(label: str, category: str, color: str) -> rx.Component:
+    """Horizontal 1-5 star distribution bars for one rating dimension"""
+    distribution = LocationState.selected_location_distribution[category]
+
+    return rx.el.div(
+        rx.text(label, class_name="text-[10px] text-gray-400 font-bold tracking-wider w-24 shrink-0"),
+        rx.el.div(
+            rx.foreach(
+                range(5),
+                lambda i: rx.el.div(
+                    rx.el.div(
+                        class_name="h-full transition-all duration-500",
+                        style={
+                            "width": distribution[i].to_string() + "%",
+                            "backgroundColor": color,
+                        }
+                    ),
+                    title=f"{i + 1}★",
+                    class_name="flex-1 h-2 bg-[#1a1a2e] mr-1"
+                )
+            ),
+            class_name="flex items-center flex-1"
+        ),
+        class_name="flex items-center mb-2"
+    )
+
+
 def location_detail_page() -> rx.Component:
     return rx.cond(
         LocationState.selected_location,
@@ -61,7 +121,7 @@ def location_detail_page() -> rx.Component:
                 rx.el.div(
                     rx.el.button(
                         rx.icon("arrow-left", size=20),
-                        on_click=lambda: QuizState.set_page("locations"),
+                        on_click=rx.redirect(routes.LOCATIONS),
                         class_name="p-2 pixel-border text-[#00ff9f] hover:bg-[#00ff9f] hover:text-black transition-colors"
                     ),
                     rx.el.div(
@@ -82,16 +142,17 @@ def location_detail_page() -> rx.Component:
                                 rx.el.p(
                                     "\ud83d\udccd ", LocationState.selected_location["location"],
                                     class_name="text-xs text-gray-500 mt-1 font-mono cursor-help hover:text-[#00ff9f] transition-colors",
-                                    on_mouse_enter=LocationState.set_hovering_location_title(True),
-                                    on_mouse_leave=LocationState.set_hovering_location_title(False),
+                                    on_mouse_enter=HOVERING_LOCATION_TITLE.set_value(True),
+                                    on_mouse_leave=HOVERING_LOCATION_TITLE.set_value(False),
                                 ),
                                 # Hover Map Popup
                                 rx.cond(
-                                    LocationState.is_hovering_location_title,
+                                    HOVERING_LOCATION_TITLE.value,
                                     rx.el.div(
                                         rx.el.div(
-                                            rx.image(
-                                                src=LocationState.selected_location_map_image,
+                                            responsive_image(
+                                                LocationState.selected_location_map_sources,
+                                                sizes="600px",
                                                 class_name="w-full h-full object-cover opacity-50"
                                             ),
                                             # Pin
@@ -133,10 +194,10 @@ def location_detail_page() -> rx.Component:
                         "[ 3D LOCATION SCAN ]",
                         class_name="text-[#00d4ff] font-bold mb-3 text-center tracking-widest text-sm",
                     ),
-                    sketchfab_model(
+                    sketchfab_facade(
                         model_id=LocationState.selected_location["model_id"],
-                        height="450px",
-                        title=LocationState.selected_location["name"]
+                        poster=LocationState.selected_location_preview_sources,
+                        title=LocationState.selected_location["name"],
                     ),
                     class_name="w-full pixel-border-cyan p-4 bg-[#0a0a0f]/50 mb-6"
                 ),
@@ -155,7 +216,7 @@ def location_detail_page() -> rx.Component:
                                 range(5),
                                 lambda i: rx.el.div(
                                     class_name=rx.cond(
-                                        LocationState.new_rating["comfort"] > i,
+                                        RATING_DRAFT["comfort"].value > i,
                                         "w-3 h-3 bg-[#00ff9f] mr-1",
                                         "w-3 h-3 bg-[#333] mr-1"
                                     )
@@ -177,7 +238,7 @@ def location_detail_page() -> rx.Component:
                                 range(5),
                                 lambda i: rx.el.div(
                                     class_name=rx.cond(
-                                        LocationState.new_rating["quietness"] > i,
+                                        RATING_DRAFT["quietness"].value > i,
                                         "w-3 h-3 bg-[#bd00ff] mr-1",
                                         "w-3 h-3 bg-[#333] mr-1"
                                     )
@@ -199,7 +260,7 @@ def location_detail_page() -> rx.Component:
                                 range(5),
                                 lambda i: rx.el.div(
                                     class_name=rx.cond(
-                                        LocationState.new_rating["accessibility"] > i,
+                                        RATING_DRAFT["accessibility"].value > i,
                                         "w-3 h-3 bg-[#ff0055] mr-1",
                                         "w-3 h-3 bg-[#333] mr-1"
                                     )
@@ -221,7 +282,7 @@ def location_detail_page() -> rx.Component:
                                 range(5),
                                 lambda i: rx.el.div(
                                     class_name=rx.cond(
-                                        LocationState.new_rating["vibe_check"] > i,
+                                        RATING_DRAFT["vibe_check"].value > i,
                                         "w-3 h-3 bg-[#ffd700] mr-1",
                                         "w-3 h-3 bg-[#333] mr-1"
                                     )
@@ -243,7 +304,7 @@ def location_detail_page() -> rx.Component:
                                 range(5),
                                 lambda i: rx.el.div(
                                     class_name=rx.cond(
-                                        LocationState.new_rating["danger"] > i,
+                                        RATING_DRAFT["danger"].value > i,
                                         "w-3 h-3 bg-[#00d4ff] mr-1",
                                         "w-3 h-3 bg-[#333] mr-1"
                                     )
@@ -256,6 +317,28 @@ def location_detail_page() -> rx.Component:
                     class_name="grid grid-cols-2 gap-4 mb-6"
                 ),
 
+                # Rating Distribution
+                rx.cond(
+                    LocationState.selected_location_rating_count > 0,
+                    rx.el.div(
+                        rx.el.div(
+                            rx.icon("chart-bar", size=16, class_name="mr-2 text-[#00d4ff]"),
+                            rx.text(
+                                "NAPPER VERDICT (", LocationState.selected_location_rating_count, " RATINGS)",
+                                class_name="text-xs text-[#00d4ff] font-bold tracking-widest"
+                            ),
+                            class_name="flex items-center justify-center mb-4"
+                        ),
+                        rating_distribution_row("COMFORT", "comfort", "#00ff9f"),
+                        rating_distribution_row("QUIETNESS", "quietness", "#bd00ff"),
+                        rating_distribution_row("ACCESS", "accessibility", "#ff0055"),
+                        rating_distribution_row("VIBE", "vibe_check", "#ffd700"),
+                        rating_distribution_row("DANGER", "danger", "#00d4ff"),
+                        class_name="w-full pixel-border-cyan bg-[#0a0a0f] p-6 mb-6"
+                    ),
+                    rx.el.div()
+                ),
+
                 # Rating Section with Interactive Sliders
                 rx.el.div(
                     rx.el.div(
@@ -273,7 +356,7 @@ def location_detail_page() -> rx.Component:
 
                 # First Time Rating Bonus
                 rx.cond(
-                    ~LocationState.ratings.contains(LocationState.selected_location["id"]),
+                    ~LocationState.selected_location_rated,
                     rx.el.div(
                         rx.icon("triangle-alert", size=16, class_name="mr-2 text-[#ffd700]"),
                         rx.text("▲ FIRST TIME HERE? Rate this location to unlock XP! ▲", class_name="text-xs text-[#ffd700] font-bold tracking-wider"),
@@ -287,7 +370,10 @@ def location_detail_page() -> rx.Component:
                 rx.el.button(
                     rx.icon("send", size=16, class_name="mr-2"),
                     "SUBMIT RATING",
-                    on_click=LocationState.submit_rating,
+                    # Queued in the browser outbox and synced by LocationState.sync_offline_actions;
+                    # offline.js reads the draft before this click handler resets it
+                    custom_attrs=offline_action("rating", LocationState.selected_location_id, rating_draft()),
+                    on_click=reset_rating_draft(),
                     class_name="w-full bg-[#00ff9f] text-black font-bold text-sm py-3 hover:bg-[#00ff9f]/80 transition-colors flex items-center justify-center tracking-wider mb-6"
                 ),
 
@@ -297,6 +383,16 @@ def location_detail_page() -> rx.Component:
                         "[ CHECK IN ]",
                         class_name="text-[#bd00ff] font-bold mb-4 text-center tracking-widest text-sm",
                     ),
+                    rx.cond(
+                        LocationState.selected_location_qr_code != "",
+                        rx.image(
+                            src=rx.get_upload_url(LocationState.selected_location_qr_code),
+                            alt="Location QR code",
+                            loading="lazy",
+                            class_name="w-32 h-32 mx-auto mb-4 pixel-border"
+                        ),
+                        rx.fragment()
+                    ),
                     rx.el.div(
                         rx.cond(
                             LocationState.checked_in_locations.contains(LocationState.selected_location["id"]),
@@ -314,7 +410,7 @@ def location_detail_page() -> rx.Component:
                                 rx.el.button(
                                     rx.icon("map-pin", size=16, class_name="mr-2"),
                                     "CHECK IN NOW",
-                                    on_click=lambda: LocationState.check_in_location(LocationState.selected_location["id"]),
+                                    custom_attrs=offline_action("check_in", LocationState.selected_location_id),
                                     class_name="w-full pixel-border-purple text-[#bd00ff] text-sm py-3 hover:bg-[#bd00ff] hover:text-black transition-colors font-bold tracking-wider flex items-center justify-center"
                                 ),
                                 class_name="flex flex-col items-center justify-center p-6"
@@ -331,10 +427,9 @@ def location_detail_page() -> rx.Component:
         ),
         rx.el.div(
             rx.el.p(
-                "No location selected. Returning to map...",
+                "Loading location...",
                 class_name="text-xl text-center text-gray-400",
             ),
-            on_mount=lambda: QuizState.set_page("locations"),
             class_name="min-h-screen bg-[#050510] flex items-center justify-center"
         ),
     )
\ No newline at end of file
@@ -1,5 +1,6 @@
 import reflex as rx
-from app.states.location_state import LocationState, Location
+from app.states import routes
+from app.states.location_state import LOCATIONS, RARITY_COLORS, LocationState, Location
 from app.states.quiz_state import QuizState
 from app.components.sketchfab import sketchfab_model
 from app.components.interactive_map import interactive_campus_map
@@ -44,15 +45,7 @@ def location_card(location: Location) -> rx.Component:
     is_checked_in = LocationState.checked_in_locations.contains(location["id"])
     is_recommended = QuizState.personality_details["spots"].contains(location["id"])
     
-    rarity_color = rx.match(
-        location["rarity"],
-        ("LEGENDARY", "#ffd700"),
-        ("EPIC", "#bd00ff"),
-        ("RARE", "#00d4ff"),
-        ("UNCOMMON", "#00ff9f"),
-        ("MYTHICAL", "#ff0055"),
-        "gray-400"
-    )
+    rarity_color = RARITY_COLORS.get(location["rarity"], "gray-400")
 
     # Use a dynamic border color based on recommendation
     # We define the styles as dictionaries and switch between them
@@ -132,7 +125,7 @@ def location_card(location: Location) -> rx.Component:
             ),
             rx.el.button(
                 "VIEW DETAILS",
-                on_click=lambda: LocationState.select_location(location["id"]),
+                on_click=rx.redirect(routes.location_route(location["id"])),
                 class_name="w-full pixel-border text-[#00ff9f] text-xs py-2 hover:bg-[#00ff9f] hover:text-black transition-colors font-bold tracking-wider"
             ),
             class_name="mt-auto w-full"
@@ -163,8 +156,7 @@ def locations_page() -> rx.Component:
                 rx.el.div(
                     rx.el.button(
                         rx.icon("arrow-left", size=16),
-                        # on_click=lambda: QuizState.set_page("home"), # Assuming QuizState is available or imported if needed, but keeping it simple for now or removing back button if not in design. 
-                        # The design shows a back button.
+                        on_click=rx.redirect(routes.HOME),
                         class_name="p-1 pixel-border text-[#00ff9f] hover:bg-[#00ff9f] hover:text-black transition-colors mr-4",
                     ),
                     rx.el.div(
@@ -192,7 +184,7 @@ def locations_page() -> rx.Component:
 
             # Locations Grid
             rx.el.div(
-                rx.foreach(LocationState.locations, location_card),
+                *[location_card(location) for location in LOCATIONS],
                 class_name="grid grid-cols-1 md:grid-cols-2 gap-4 md:gap-6 w-full",
             ),
             
@@ -0,0 +1,40 @@
+import reflex as rx
+from app.states.location_state import LocationState
+from app.states.offline_queue import OFFLINE_JS, SYNC_TRIGGER_ID, service_worker_enabled
+
+
+def offline_head() -> list[rx.Component]:
+    """Web app manifest and the outbox script; the script also registers the service worker."""
+    return [
+        rx.el.link(rel="manifest", href="/manifest.webmanifest"),
+        rx.el.meta(name="theme-color", content="#0a0a0f"),
+        rx.el.script(
+            src="/offline.js",
+            custom_attrs={"data-service-worker": "/sw.js" if service_worker_enabled() else ""},
+        ),
+    ]
+
+
+def offline_action(
+    kind: str, location_id: rx.Var, rating: dict[str, rx.Var] | None = None
+) -> dict[str, rx.Var]:
+    """``custom_attrs`` that put a check-in or rating in the outbox when the element is clicked.
+
+    The click is recorded by offline.js outside Reflex's event queue, so it
+    is kept in localStorage even while the websocket is down.
+    """
+    action = {"kind": kind, "location_id": location_id}
+    if rating is not None:
+        action["rating"] = rating
+    return {"data-offline-action": rx.Var.create(action).to_string()}
+
+
+def offline_sync_trigger() -> rx.Component:
+    """Hidden button offline.js clicks to send the outbox in one event."""
+    return rx.el.button(
+        id=SYNC_TRIGGER_ID,
+        on_click=rx.call_script(f"{OFFLINE_JS}.pending()", callback=LocationState.sync_offline_actions),
+        tab_index=-1,
+        aria_hidden="true",
+        class_name="hidden",
+    )
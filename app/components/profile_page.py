@@ -1,5 +1,5 @@
 import reflex as rx
-from app.states.quiz_state import QuizState
+from app.states import routes
 from app.states.location_state import LocationState
 from app.states.user_state import UserState
 
@@ -12,7 +12,7 @@ def profile_page() -> rx.Component:
                 rx.el.div(
                     rx.el.button(
                         rx.icon("arrow-left", size=16),
-                        on_click=lambda: QuizState.set_page("home"),
+                        on_click=rx.redirect(routes.HOME),
                         class_name="p-1 pixel-border text-[#00ff9f] hover:bg-[#00ff9f] hover:text-black transition-colors mr-4",
                     ),
                     rx.el.div(
@@ -82,7 +82,7 @@ def profile_page() -> rx.Component:
                         rx.text("View history", class_name="text-[10px] text-gray-500 font-mono hover:text-[#00ff9f] transition-colors"),
                         class_name="flex flex-col"
                     ),
-                    on_click=lambda: QuizState.set_page("locations"),
+                    on_click=rx.redirect(routes.LOCATIONS),
                     class_name="p-4 pixel-border bg-[#00ff9f]/5 hover:bg-[#00ff9f]/10 transition-colors cursor-pointer w-full text-left"
                 ),
                 # Locations (clickable)
@@ -97,7 +97,7 @@ def profile_page() -> rx.Component:
                         rx.text("View history", class_name="text-[10px] text-gray-500 font-mono hover:text-[#bd00ff] transition-colors"),
                         class_name="flex flex-col"
                     ),
-                    on_click=lambda: QuizState.set_page("visited_locations"),
+                    on_click=rx.redirect(routes.VISITED_LOCATIONS),
                     class_name="p-4 pixel-border-purple bg-[#bd00ff]/5 hover:bg-[#bd00ff]/10 transition-colors cursor-pointer w-full text-left"
                 ),
                 # S-Ranks
@@ -130,7 +130,7 @@ def profile_page() -> rx.Component:
                         rx.text(f"{UserState.unlocked_achievements_count}/{UserState.total_achievements_count} unlocked", class_name="text-[10px] text-gray-500 font-mono hover:text-[#ff00ff] transition-colors"),
                         class_name="flex flex-col"
                     ),
-                    on_click=lambda: QuizState.set_page("achievements"),
+                    on_click=rx.redirect(routes.ACHIEVEMENTS),
                     class_name="p-4 pixel-border-pink bg-[#ff00ff]/5 hover:bg-[#ff00ff]/10 transition-colors cursor-pointer w-full text-left"
                 ),
                 class_name="grid grid-cols-2 gap-4 w-full mb-6"
@@ -1,5 +1,5 @@
 import reflex as rx
-from app.states.quiz_state import QuizState
+from app.states.quiz_state import QUESTIONS, QuizState
 
 
 def choice_button(
@@ -90,21 +90,21 @@ def quiz_page() -> rx.Component:
                         rx.text("STAGE ", class_name="text-xs text-[#bd00ff] font-mono"),
                         rx.text(QuizState.current_question_index + 1, class_name="text-xs text-[#bd00ff] font-mono"),
                         rx.text(" / ", class_name="text-xs text-gray-500 font-mono"),
-                        rx.text(QuizState.questions.length(), class_name="text-xs text-gray-500 font-mono"),
+                        rx.text(len(QUESTIONS), class_name="text-xs text-gray-500 font-mono"),
                         class_name="flex justify-center gap-1 mb-2"
                     ),
                     # Progress Squares (Visual only for now, could be dynamic)
                     rx.el.div(
-                        rx.foreach(
-                            QuizState.questions,
-                            lambda _, i: rx.el.div(
+                        *[
+                            rx.el.div(
                                 class_name=rx.cond(
                                     i <= QuizState.current_question_index,
                                     "w-2 h-2 bg-[#00ff9f] mx-0.5",
                                     "w-2 h-2 bg-[#1a1a2e] border border-gray-700 mx-0.5"
                                 )
                             )
-                        ),
+                            for i in range(len(QUESTIONS))
+                        ],
                         class_name="flex justify-center mb-4"
                     ),
                     class_name="w-full pixel-border p-4 bg-[#00ff9f]/5 mb-0 max-w-2xl mx-auto"
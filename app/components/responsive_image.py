@@ -0,0 +1,15 @@
+import reflex as rx
+
+
+def responsive_image(sources: rx.Var, sizes: str = "100vw", **props) -> rx.Component:
+    """<picture> preferring AVIF, then WebP, then the original image.
+
+    ``sources`` is an ``ImageSources`` var; a format whose ``srcset`` is empty
+    is skipped by the browser, so unbuilt images fall back to the PNG.
+    """
+    props.setdefault("loading", "lazy")
+    return rx.el.picture(
+        rx.el.source(type="image/avif", src_set=sources["avif"], sizes=sizes),
+        rx.el.source(type="image/webp", src_set=sources["webp"], sizes=sizes),
+        rx.el.img(src=sources["src"], decoding="async", **props),
+    )
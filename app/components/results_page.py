@@ -1,7 +1,7 @@
 import reflex as rx
-from app.states.quiz_state import QuizState
+from app.states import routes
+from app.states.quiz_state import QUESTIONS, QuizState
 from app.states.user_state import UserState
-from app.states.location_state import LocationState
 
 
 def unlocked_location_tag(spot_id: str) -> rx.Component:
@@ -24,11 +24,28 @@ def unlocked_location_tag(spot_id: str) -> rx.Component:
     return rx.el.div(
         rx.icon("map-pin", size=12, class_name="mr-1"),
         rx.text(location_name, class_name="text-[10px] font-bold"),
-        on_click=LocationState.select_location(spot_id),
+        on_click=rx.redirect(routes.location_route(spot_id)),
         class_name="flex items-center px-2 py-1 border border-[#bd00ff] text-[#bd00ff] bg-[#bd00ff]/10 mr-2 mb-2 cursor-pointer hover:bg-[#bd00ff]/30 transition-colors"
     )
 
 
+def crowd_stat_row(index: int, question_id: str) -> rx.Component:
+    """How many nappers picked the same answer as the player"""
+    percent = QuizState.user_answer_stats[question_id]
+    return rx.el.div(
+        rx.text(f"Q{index + 1}", class_name="text-[10px] text-gray-500 font-bold w-8"),
+        rx.el.div(
+            rx.el.div(
+                class_name="h-full bg-[#bd00ff]",
+                style={"width": f"{percent}%"}
+            ),
+            class_name="flex-1 h-2 bg-[#333] mr-3"
+        ),
+        rx.text(f"{percent}% of nappers chose this", class_name="text-[10px] text-gray-300 w-48 text-right"),
+        class_name="flex items-center mb-2"
+    )
+
+
 def results_page() -> rx.Component:
     return rx.el.div(
         rx.el.div(
@@ -96,24 +113,34 @@ def results_page() -> rx.Component:
                 class_name="w-full border border-[#bd00ff] p-6 bg-[#1a1a2e] mb-6 max-w-2xl mx-auto"
             ),
 
+            # Crowd Stats Box
+            rx.el.div(
+                rx.text(">> CROWD STATS / YOUR ANSWERS:", class_name="text-xs text-[#00ff9f] font-bold mb-3 tracking-wider"),
+                *[
+                    crowd_stat_row(index, question["id"])
+                    for index, question in enumerate(QUESTIONS)
+                ],
+                class_name="w-full border border-[#bd00ff] p-6 bg-[#1a1a2e] mb-6 max-w-2xl mx-auto"
+            ),
+
             # Action Buttons
             rx.el.div(
                 rx.el.button(
                     rx.icon("map-pin", size=14, class_name="mr-2 text-black"),
                     "START QUEST",
-                    on_click=lambda: QuizState.set_page("locations"),
+                    on_click=rx.redirect(routes.LOCATIONS),
                     class_name="flex-1 bg-[#00ff9f] text-black font-bold text-sm py-3 hover:bg-[#00ff9f]/80 transition-colors flex items-center justify-center mr-2"
                 ),
                 rx.el.button(
                     rx.icon("rotate-ccw", size=14, class_name="mr-2 text-[#bd00ff]"),
                     "RETRY",
-                    on_click=QuizState.reset_quiz,
+                    on_click=rx.redirect(routes.QUIZ),
                     class_name="px-6 border border-[#bd00ff] text-[#bd00ff] font-bold text-sm py-3 hover:bg-[#bd00ff]/10 transition-colors flex items-center justify-center mr-2"
                 ),
                 rx.el.button(
                     rx.icon("home", size=14, class_name="mr-2 text-[#bd00ff]"),
                     "HOME",
-                    on_click=lambda: QuizState.set_page("home"),
+                    on_click=rx.redirect(routes.HOME),
                     class_name="px-6 border border-[#bd00ff] text-[#bd00ff] font-bold text-sm py-3 hover:bg-[#bd00ff]/10 transition-colors flex items-center justify-center"
                 ),
                 class_name="flex w-full max-w-2xl mx-auto mb-8"
@@ -1,5 +1,12 @@
 import reflex as rx
 from typing import Optional
+from reflex.experimental.client_state import ClientStateVar
+
+from app.components.responsive_image import responsive_image
+
+# Model id of the scan the player asked to load; kept in the browser, and a
+# different spot shows its poster again
+REQUESTED_MODEL = ClientStateVar.create("sketchfab_requested_model", default="")
 
 def sketchfab_model(model_id: str, height: str = "360px", title: Optional[str] = None):
     """
@@ -17,7 +24,7 @@ def sketchfab_model(model_id: str, height: str = "360px", title: Optional[str] =
                 f"""
                 <div style="width:100%; position:relative; padding-bottom:56.25%; height:0; overflow:hidden;">
                   <iframe
-                    title="{{title.to(str)}}"
+                    title="{title}"
                     src="https://sketchfab.com/models/{model_id}/embed?autostart=1&transparent=1&ui_theme=dark&ui_infos=0&ui_controls=0&ui_stop=0"
                     frameborder="0"
                     allow="autoplay; fullscreen; xr-spatial-tracking"
@@ -61,4 +68,34 @@ def sketchfab_model(model_id: str, height: str = "360px", title: Optional[str] =
               </iframe>
             </div>
             """
-        )
\ No newline at end of file
+        )
+
+
+def sketchfab_facade(model_id: rx.Var, poster: rx.Var, title: rx.Var) -> rx.Component:
+    """Local poster with a load button, swapped for the Sketchfab viewer on request.
+
+    The viewer pulls megabytes of scripts and model data, so it is only
+    embedded once the player clicks the poster. ``poster`` is an
+    ``ImageSources`` var.
+    """
+    return rx.cond(
+        REQUESTED_MODEL.value == model_id,
+        sketchfab_model(model_id=model_id, title=title),
+        rx.el.button(
+            responsive_image(
+                poster,
+                sizes="(min-width: 896px) 830px, 100vw",
+                alt=title,
+                class_name="absolute inset-0 w-full h-full object-cover opacity-60 group-hover:opacity-80 transition-opacity",
+            ),
+            rx.el.div(
+                rx.icon("box", size=32, class_name="text-[#00d4ff] mb-2"),
+                rx.el.span("LOAD 3D SCAN", class_name="text-xs text-[#00d4ff] tracking-widest"),
+                class_name="relative flex flex-col items-center pixel-border-cyan bg-[#0a0a0f]/80 px-4 py-3",
+            ),
+            type="button",
+            on_click=REQUESTED_MODEL.set_value(model_id),
+            aria_label="Load the 3D scan",
+            class_name="group relative w-full aspect-video overflow-hidden flex items-center justify-center bg-[#0a0a0f] cursor-pointer",
+        ),
+    )
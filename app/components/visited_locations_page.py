@@ -1,21 +1,13 @@
 import reflex as rx
-from app.states.location_state import LocationState, Location
-from app.states.quiz_state import QuizState
+from app.states import routes
+from app.states.location_state import LOCATIONS, RARITY_COLORS, LocationState, Location
 
 
 def visited_location_card(location: Location) -> rx.Component:
     avg_ratings = LocationState.average_ratings.get(location["id"], {})
     overall_rating = avg_ratings.get("overall", 0.0)
     
-    rarity_color = rx.match(
-        location["rarity"],
-        ("LEGENDARY", "#ffd700"),
-        ("EPIC", "#bd00ff"),
-        ("RARE", "#00d4ff"),
-        ("UNCOMMON", "#00ff9f"),
-        ("MYTHICAL", "#ff0055"),
-        "gray-400"
-    )
+    rarity_color = RARITY_COLORS.get(location["rarity"], "gray-400")
 
     return rx.el.div(
         # Header with Icon and Names
@@ -69,7 +61,7 @@ def visited_location_card(location: Location) -> rx.Component:
             ),
             rx.el.button(
                 "VIEW DETAILS",
-                on_click=lambda: LocationState.select_location(location["id"]),
+                on_click=rx.redirect(routes.location_route(location["id"])),
                 class_name="w-full border-4 border-[#00ff9f] text-[#00ff9f] text-xs py-2 hover:bg-[#00ff9f] hover:text-black transition-colors font-bold tracking-wider"
             ),
             class_name="mt-auto w-full"
@@ -87,7 +79,7 @@ def visited_locations_page() -> rx.Component:
                 rx.el.div(
                     rx.el.button(
                         rx.icon("arrow-left", size=16),
-                        on_click=lambda: QuizState.set_page("profile"),
+                        on_click=rx.redirect(routes.PROFILE),
                         class_name="p-1 border-4 border-[#bd00ff] text-[#bd00ff] hover:bg-[#bd00ff] hover:text-black transition-colors mr-4",
                     ),
                     rx.el.div(
@@ -109,7 +101,7 @@ def visited_locations_page() -> rx.Component:
                     class_name="flex flex-col items-center justify-center p-4 border border-[#bd00ff] bg-[#bd00ff]/5"
                 ),
                 rx.el.div(
-                    rx.text(f"{LocationState.explored_count}/{LocationState.locations.length()}", class_name="text-2xl font-bold text-[#00ff9f] mb-1"),
+                    rx.text(f"{LocationState.explored_count}/{len(LOCATIONS)}", class_name="text-2xl font-bold text-[#00ff9f] mb-1"),
                     rx.text("PROGRESS", class_name="text-[10px] text-gray-400 uppercase tracking-wider"),
                     class_name="flex flex-col items-center justify-center p-4 border border-[#00ff9f] bg-[#00ff9f]/5"
                 ),
@@ -121,14 +113,14 @@ def visited_locations_page() -> rx.Component:
                 LocationState.explored_count > 0,
                 # Locations Grid
                 rx.el.div(
-                    rx.foreach(
-                        LocationState.locations,
-                        lambda loc: rx.cond(
+                    *[
+                        rx.cond(
                             LocationState.checked_in_locations.contains(loc["id"]),
                             visited_location_card(loc),
                             rx.fragment()
                         )
-                    ),
+                        for loc in LOCATIONS
+                    ],
                     class_name="grid grid-cols-1 md:grid-cols-2 gap-4 md:gap-6 w-full",
                 ),
                 # Empty State
@@ -139,7 +131,7 @@ def visited_locations_page() -> rx.Component:
                     rx.el.button(
                         rx.icon("map", size=16, class_name="mr-2"),
                         "EXPLORE LOCATIONS",
-                        on_click=lambda: QuizState.set_page("locations"),
+                        on_click=rx.redirect(routes.LOCATIONS),
                         class_name="border-2 border-[#00ff9f] text-[#00ff9f] px-6 py-3 hover:bg-[#00ff9f] hover:text-black transition-colors font-bold tracking-wider flex items-center"
                     ),
                     class_name="w-full border-2 border-gray-800 p-12 flex flex-col items-center justify-center bg-[#0a0a0f]"
@@ -0,0 +1,164 @@
+"""Declarative achievement rules compiled into an index keyed by trigger event.
+
+Each achievement in the catalog lists, per trigger event, a set of conditions
+that must all hold::
+
+    "rules": {"check_in": {"checked_in_building": "library"}}
+
+At import the conditions are compiled into predicates over precomputed id
+sets. Rules are also indexed by the rating value or location id they depend
+on, so an event only evaluates the handful of rules it can possibly satisfy.
+"""
+
+from typing import AbstractSet, Callable, Mapping, NamedTuple, TypedDict
+
+from app.states.rating_stats import RATING_DIMENSIONS
+
+RATING_EVENT = "rating"
+CHECK_IN_EVENT = "check_in"
+QUIZ_DONE_EVENT = "quiz_done"
+
+
+class AchievementEvent(TypedDict, total=False):
+    rating: Mapping[str, int]
+    location_id: str
+    rated_location_ids: AbstractSet[str]
+    checked_in: AbstractSet[str]
+    quiz_finished: bool
+
+
+Predicate = Callable[[AchievementEvent], bool]
+IndexKey = tuple
+
+
+class CompiledRule(NamedTuple):
+    order: int
+    achievement_id: str
+    predicates: tuple[Predicate, ...]
+
+    def matches(self, event: AchievementEvent) -> bool:
+        return all(predicate(event) for predicate in self.predicates)
+
+
+class EventRules(NamedTuple):
+    # Rules evaluated on every occurrence of the event
+    always: tuple[CompiledRule, ...]
+    # Rules that can only match when the event carries one of these keys
+    by_key: Mapping[IndexKey, tuple[CompiledRule, ...]]
+
+
+def _rating_key(dimension: str, stars: int) -> IndexKey:
+    return ("rating", dimension, stars)
+
+
+def _location_key(location_id: str) -> IndexKey:
+    return ("location", location_id)
+
+
+def _compile_condition(
+    name: str,
+    value,
+    *,
+    location_ids_by_building: Mapping[str, frozenset[str]],
+    location_ids_by_rarity: Mapping[str, frozenset[str]],
+    secret_location_ids: frozenset[str],
+    all_location_ids: frozenset[str],
+) -> tuple[Predicate, list[IndexKey] | None]:
+    """Return a predicate and, when the condition allows it, its index keys."""
+    if name == "rating_all":
+        return (
+            lambda event: all(event["rating"][d] == value for d in RATING_DIMENSIONS),
+            [_rating_key(RATING_DIMENSIONS[0], value)],
+        )
+    if name == "rating_equals":
+        expected = tuple(value.items())
+        first_dimension, first_stars = expected[0]
+        return (
+            lambda event: all(event["rating"][d] == stars for d, stars in expected),
+            [_rating_key(first_dimension, first_stars)],
+        )
+    if name == "min_rated_locations":
+        return lambda event: len(event["rated_location_ids"]) >= value, None
+    if name == "rated_all_locations":
+        return lambda event: event["rated_location_ids"] >= all_location_ids, None
+    if name == "quiz_finished":
+        return lambda event: event.get("quiz_finished", False) == value, None
+    if name == "checked_in_secret":
+        return (
+            lambda event: event["location_id"] in secret_location_ids,
+            [_location_key(location_id) for location_id in secret_location_ids],
+        )
+    if name in ("checked_in_building", "checked_in_rarity"):
+        groups = location_ids_by_building if name == "checked_in_building" else location_ids_by_rarity
+        required = groups.get(value, frozenset())
+        return (
+            lambda event: event["checked_in"] >= required,
+            [_location_key(location_id) for location_id in required],
+        )
+    raise ValueError(f"Unknown achievement condition: {name}")
+
+
+def compile_achievement_rules(achievements: Mapping[str, Mapping], **location_sets) -> Mapping[str, EventRules]:
+    """Compile catalog rules into an index of ``event -> EventRules``."""
+    always: dict[str, list[CompiledRule]] = {}
+    by_key: dict[str, dict[IndexKey, list[CompiledRule]]] = {}
+
+    for order, (achievement_id, achievement) in enumerate(achievements.items()):
+        for event_name, conditions in achievement.get("rules", {}).items():
+            predicates = []
+            index_keys = None
+            for name, value in conditions.items():
+                predicate, keys = _compile_condition(name, value, **location_sets)
+                predicates.append(predicate)
+                # Index on the most selective condition that can be indexed
+                if keys is not None and (index_keys is None or len(keys) < len(index_keys)):
+                    index_keys = keys
+            rule = CompiledRule(order, achievement_id, tuple(predicates))
+            if index_keys is None:
+                always.setdefault(event_name, []).append(rule)
+            else:
+                for key in index_keys:
+                    by_key.setdefault(event_name, {}).setdefault(key, []).append(rule)
+
+    return {
+        event_name: EventRules(
+            always=tuple(always.get(event_name, ())),
+            by_key={key: tuple(rules) for key, rules in by_key.get(event_name, {}).items()},
+        )
+        for event_name in set(always) | set(by_key)
+    }
+
+
+def _event_keys(event: AchievementEvent) -> list[IndexKey]:
+    keys = []
+    if "rating" in event:
+        keys.extend(_rating_key(d, event["rating"][d]) for d in RATING_DIMENSIONS)
+    if "location_id" in event:
+        keys.append(_location_key(event["location_id"]))
+    return keys
+
+
+def evaluate_achievements(
+    rules: Mapping[str, EventRules],
+    event_name: str,
+    event: AchievementEvent,
+    unlocked: AbstractSet[str],
+) -> list[str]:
+    """Ids of newly earned achievements for this event, in catalog order."""
+    event_rules = rules.get(event_name)
+    if event_rules is None:
+        return []
+
+    candidates = {rule.order: rule for rule in event_rules.always}
+    for key in _event_keys(event):
+        for rule in event_rules.by_key.get(key, ()):
+            candidates[rule.order] = rule
+
+    earned = []
+    for order in sorted(candidates):
+        rule = candidates[order]
+        if rule.achievement_id in unlocked or rule.achievement_id in earned:
+            continue
+        if rule.matches(event):
+            earned.append(rule.achievement_id)
+    return earned
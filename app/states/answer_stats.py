@@ -0,0 +1,137 @@
+"""Crowd statistics of quiz answers.
+
+``handle_answer`` bumps an in-memory counter in one of several shards, which
+costs a single dict increment under an uncontended lock. A background
+flusher periodically drains the shards into the ratings store and rebuilds
+an immutable percentage snapshot, so reads never aggregate anything. The
+totals are re-read from the store on each flush that wrote something or
+found answers committed by another backend worker.
+"""
+
+import atexit
+import functools
+import itertools
+import threading
+import time
+from collections import Counter
+from types import MappingProxyType
+from typing import Iterable, Mapping
+
+from reflex.utils import console
+
+from app.states.ratings_store import RatingsStore, get_ratings_store
+
+Snapshot = Mapping[str, Mapping[str, int]]
+
+
+def answer_percentages(counts: Mapping[str, int], choices: Iterable[str]) -> dict[str, int]:
+    """Whole-percent share of each choice; an even split before anyone answers."""
+    choices = tuple(choices)
+    total = sum(counts.get(choice, 0) for choice in choices)
+    if not total:
+        return {choice: round(100 / len(choices)) for choice in choices}
+    return {choice: round(counts.get(choice, 0) * 100 / total) for choice in choices}
+
+
+class AnswerStats:
+    """Sharded answer counters flushed to the store on an interval."""
+
+    def __init__(
+        self,
+        store: RatingsStore,
+        choices_by_question: Mapping[str, tuple[str, ...]],
+        shards: int = 8,
+        flush_interval: float = 2.0,
+    ):
+        self.store = store
+        self.choices_by_question = choices_by_question
+        self.flush_interval = flush_interval
+        self._shards = [(threading.Lock(), Counter()) for _ in range(shards)]
+        self._next_shard = itertools.count()
+        self._flush_lock = threading.Lock()
+        self._data_version = store.data_version()
+        self._totals = self._load_totals()
+        self._snapshot = self._build_snapshot()
+        self._flusher: threading.Thread | None = None
+        self._flusher_lock = threading.Lock()
+
+    def record(self, question_id: str, choice: str):
+        lock, counter = self._shards[next(self._next_shard) % len(self._shards)]
+        with lock:
+            counter[(question_id, choice)] += 1
+        self._ensure_flusher()
+
+    def _ensure_flusher(self):
+        if self._flusher is not None:
+            return
+        with self._flusher_lock:
+            if self._flusher is None:
+                self._flusher = threading.Thread(
+                    target=self._flush_loop, name="answer-stats-flusher", daemon=True
+                )
+                self._flusher.start()
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except Exception as error:
+                # The drained counts are back in a shard; keep the thread for the next attempt
+                console.error(f"Quiz answer stats flush failed, retrying: {error!r}")
+
+    def _load_totals(self) -> dict[str, Counter]:
+        return {question_id: Counter(counts) for question_id, counts in self.store.answer_counts().items()}
+
+    def flush(self):
+        """Drain every shard into the store and publish a fresh snapshot.
+
+        Counts that fail to reach the store go back in a shard and the error
+        is raised.
+        """
+        with self._flush_lock:
+            drained: Counter = Counter()
+            for lock, counter in self._shards:
+                with lock:
+                    if counter:
+                        drained.update(counter)
+                        counter.clear()
+            try:
+                self.store.add_answer_counts(dict(drained))
+            except Exception:
+                lock, counter = self._shards[0]
+                with lock:
+                    counter.update(drained)
+                raise
+            version = self.store.data_version()
+            if not drained and version == self._data_version:
+                return
+            self._data_version = version
+            self._totals = self._load_totals()
+            self._snapshot = self._build_snapshot()
+
+    def _build_snapshot(self) -> Snapshot:
+        return MappingProxyType({
+            question_id: MappingProxyType(
+                answer_percentages(self._totals.get(question_id, {}), choices)
+            )
+            for question_id, choices in self.choices_by_question.items()
+        })
+
+    def snapshot(self) -> Snapshot:
+        """Latest flushed percentages per question and choice."""
+        # Also keeps a worker that only shows results in step with the others
+        self._ensure_flusher()
+        return self._snapshot
+
+
+@functools.lru_cache(maxsize=None)
+def get_answer_stats() -> AnswerStats:
+    from app.states.quiz_state import QUESTIONS
+
+    stats = AnswerStats(
+        get_ratings_store(),
+        {question["id"]: tuple(question["choices"]) for question in QUESTIONS},
+    )
+    atexit.register(stats.flush)
+    return stats
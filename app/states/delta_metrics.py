@@ -0,0 +1,129 @@
+"""Size accounting for the state deltas sent to clients.
+
+Enabled with ``POLYUNAP_DELTA_METRICS=1``, as it serializes every delta a
+second time. ``DeltaSizeMiddleware`` then records the serialized size of
+every outgoing delta, both per event handler and per state var, computed
+vars included. The totals are served as JSON on ``/metrics/deltas`` and
+summarized in the backend log every ``POLYUNAP_METRICS_LOG_INTERVAL``
+seconds, so bloated vars stand out.
+"""
+
+import asyncio
+import functools
+import os
+import threading
+
+from reflex.middleware import Middleware
+from reflex.utils import console, format
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+DEFAULT_LOG_INTERVAL = 60.0
+
+
+def delta_metrics_enabled() -> bool:
+    return os.environ.get("POLYUNAP_DELTA_METRICS", "") not in ("", "0")
+
+
+def short_state_name(full_name: str) -> str:
+    """``reflex___state____state.app___states___quiz_state____quiz_state`` -> ``quiz_state``"""
+    return full_name.rsplit("____", 1)[-1]
+
+
+class SizeStats:
+    __slots__ = ("count", "total_bytes", "max_bytes")
+
+    def __init__(self):
+        self.count = 0
+        self.total_bytes = 0
+        self.max_bytes = 0
+
+    def add(self, size: int):
+        self.count += 1
+        self.total_bytes += size
+        self.max_bytes = max(self.max_bytes, size)
+
+    def as_dict(self) -> dict[str, int]:
+        return {
+            "count": self.count,
+            "total_bytes": self.total_bytes,
+            "mean_bytes": self.total_bytes // self.count if self.count else 0,
+            "max_bytes": self.max_bytes,
+        }
+
+
+class DeltaMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_handler: dict[str, SizeStats] = {}
+        self._by_var: dict[str, SizeStats] = {}
+
+    def record(self, handler: str, delta: dict[str, dict]):
+        """Account one delta (``{state: {var: value}}``) to its handler and vars."""
+        if not delta:
+            return
+        var_sizes = {
+            f"{short_state_name(state_name)}.{var_name.removesuffix('_rx_state_')}": len(
+                format.json_dumps(value).encode()
+            )
+            for state_name, state_delta in delta.items()
+            for var_name, value in state_delta.items()
+        }
+        total = len(format.json_dumps(delta).encode())
+        with self._lock:
+            self._by_handler.setdefault(handler, SizeStats()).add(total)
+            for var_name, size in var_sizes.items():
+                self._by_var.setdefault(var_name, SizeStats()).add(size)
+
+    def snapshot(self) -> dict[str, dict[str, dict[str, int]]]:
+        with self._lock:
+            return {
+                "handlers": {name: stats.as_dict() for name, stats in self._by_handler.items()},
+                "vars": {name: stats.as_dict() for name, stats in self._by_var.items()},
+            }
+
+    def summary(self, top: int = 5) -> str:
+        snapshot = self.snapshot()
+        lines = ["Delta sizes (total bytes, count, max):"]
+        for section in ("handlers", "vars"):
+            ranked = sorted(
+                snapshot[section].items(), key=lambda item: item[1]["total_bytes"], reverse=True
+            )
+            lines.append(f"  top {section}:")
+            lines += [
+                f"    {name}: {stats['total_bytes']} B, {stats['count']}x, max {stats['max_bytes']} B"
+                for name, stats in ranked[:top]
+            ]
+        return "\n".join(lines)
+
+
+@functools.lru_cache(maxsize=None)
+def get_delta_metrics() -> DeltaMetrics:
+    return DeltaMetrics()
+
+
+def handler_name(event_name: str) -> str:
+    """``<state path>.quiz_state.handle_answer`` -> ``quiz_state.handle_answer``"""
+    state_path, _, handler = event_name.rpartition(".")
+    return f"{short_state_name(state_path)}.{handler}"
+
+
+class DeltaSizeMiddleware(Middleware):
+    async def preprocess(self, app, state, event):
+        return None
+
+    async def postprocess(self, app, state, event, update):
+        get_delta_metrics().record(handler_name(event.name), update.delta)
+        return update
+
+
+async def delta_metrics_endpoint(request: Request) -> JSONResponse:
+    return JSONResponse(get_delta_metrics().snapshot())
+
+
+async def log_delta_summary():
+    """Lifespan task writing the delta size summary to the backend log."""
+    interval = float(os.environ.get("POLYUNAP_METRICS_LOG_INTERVAL", DEFAULT_LOG_INTERVAL))
+    while True:
+        await asyncio.sleep(interval)
+        console.info(get_delta_metrics().summary())
@@ -0,0 +1,159 @@
+"""Lookup of the map image variants built by the asset scripts.
+
+``optimize_map_images.py`` writes WebP/AVIF renditions at several widths with
+content-hashed names under ``assets/optimized/`` plus a ``manifest.json``
+keyed by the original public path. ``build_map_tiles.py`` cuts the campus and
+floor maps into a deep-zoom tile pyramid under ``assets/tiles/``. When a
+manifest is missing (the build step has not been run) every image falls back
+to its original PNG.
+"""
+
+import functools
+import json
+from pathlib import Path
+from typing import Mapping, TypedDict
+
+OPTIMIZED_SUBDIR = "optimized"
+MANIFEST_NAME = "manifest.json"
+MANIFEST_PATH = Path("assets") / OPTIMIZED_SUBDIR / MANIFEST_NAME
+
+TILES_SUBDIR = "tiles"
+TILES_MANIFEST_PATH = Path("assets") / TILES_SUBDIR / MANIFEST_NAME
+
+# Widest CSS width the map is laid out at; tile levels are picked against it
+MAP_VIEWPORT_WIDTH = 768
+MAP_ZOOM_LEVELS: tuple[int, ...] = (1, 2, 4)
+
+# Formats in the order the browser should prefer them
+IMAGE_FORMATS: tuple[str, ...] = ("avif", "webp")
+
+
+class ImageVariant(TypedDict):
+    width: int
+    src: str
+
+
+class ManifestEntry(TypedDict):
+    width: int
+    height: int
+    source_hash: str
+    widths: list[int]
+    variants: dict[str, list[ImageVariant]]
+
+
+class ImageSources(TypedDict):
+    src: str
+    avif: str
+    webp: str
+
+
+class TileLevel(TypedDict):
+    width: int
+    height: int
+    cols: int
+    rows: int
+
+
+class TilePyramid(TypedDict):
+    width: int
+    height: int
+    tile_size: int
+    source_hash: str
+    path: str
+    levels: list[TileLevel]
+
+
+# A visible tile, as the map component lays it out in the browser
+class Tile(TypedDict):
+    src: str
+    left: str
+    top: str
+    width: str
+    height: str
+
+
+# One pyramid level; the browser picks the tiles in view from its grid
+class TileLayout(TypedDict):
+    tiled: bool
+    thumbnail: str
+    aspect_ratio: str
+    # Tiles are ``{path}/{col}_{row}.webp``
+    path: str
+    tile_size: int
+    width: int
+    height: int
+    cols: int
+    rows: int
+
+
+@functools.lru_cache(maxsize=None)
+def load_image_manifest() -> Mapping[str, ManifestEntry]:
+    try:
+        return json.loads(MANIFEST_PATH.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+@functools.lru_cache(maxsize=None)
+def load_tile_manifest() -> Mapping[str, TilePyramid]:
+    try:
+        return json.loads(TILES_MANIFEST_PATH.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def srcset(variants: list[ImageVariant]) -> str:
+    return ", ".join(f"{variant['src']} {variant['width']}w" for variant in variants)
+
+
+def image_sources(src: str) -> ImageSources:
+    """``srcset`` strings for each optimized format of ``src``; empty when not built."""
+    entry = load_image_manifest().get(src)
+    variants = entry["variants"] if entry else {}
+    return ImageSources(
+        src=src,
+        avif=srcset(variants.get("avif", [])),
+        webp=srcset(variants.get("webp", [])),
+    )
+
+
+def tile_level_for_zoom(pyramid: TilePyramid, zoom: int) -> int:
+    """Smallest pyramid level at least as wide as the zoomed map viewport."""
+    target = MAP_VIEWPORT_WIDTH * zoom
+    for index, level in enumerate(pyramid["levels"]):
+        if level["width"] >= target:
+            return index
+    return len(pyramid["levels"]) - 1
+
+
+@functools.lru_cache(maxsize=128)
+def tile_layout(src: str, zoom: int = 1) -> TileLayout:
+    """Grid of the pyramid level that covers ``src`` at ``zoom``."""
+    pyramid = load_tile_manifest().get(src)
+    if pyramid is None:
+        return TileLayout(
+            tiled=False, thumbnail="", aspect_ratio="", path="", tile_size=0, width=0, height=0, cols=0, rows=0
+        )
+
+    index = tile_level_for_zoom(pyramid, zoom)
+    level = pyramid["levels"][index]
+    return TileLayout(
+        tiled=True,
+        thumbnail=f"{pyramid['path']}/0/0_0.webp",
+        aspect_ratio=f"{pyramid['width']} / {pyramid['height']}",
+        path=f"{pyramid['path']}/{index}",
+        tile_size=pyramid["tile_size"],
+        width=level["width"],
+        height=level["height"],
+        cols=level["cols"],
+        rows=level["rows"],
+    )
+
+
+def tile_sources(layout: TileLayout) -> list[str]:
+    """URL of every tile in ``layout``, for precaching."""
+    return [
+        f"{layout['path']}/{col}_{row}.webp"
+        for row in range(layout["rows"])
+        for col in range(layout["cols"])
+    ]
@@ -0,0 +1,112 @@
+"""Process-wide XP leaderboard.
+
+Players are kept in a bisect-maintained list sorted by ``(-xp, reached_at)``,
+so the earlier of two players on equal XP ranks higher. "My rank" is a
+binary search, "top N" a slice, and an XP change is one search plus a
+memmove, which stays in the microseconds with tens of thousands of players.
+
+Every change is also queued to the ratings store, so the board survives a
+restart and each backend worker can ``sync`` the changes made by the others.
+"""
+
+import asyncio
+import bisect
+import functools
+import itertools
+import threading
+from typing import TypedDict
+
+from app.states.ratings_store import RatingsStore, get_ratings_store
+
+RankKey = tuple[int, int, str]
+
+
+class LeaderboardRow(TypedDict):
+    rank: int
+    player_id: str
+    name: str
+    xp: int
+
+
+class Leaderboard:
+    def __init__(self, store: RatingsStore | None = None):
+        self.store = store
+        self._synced_seq = 0
+        self._keys: list[RankKey] = []
+        self._key_by_player: dict[str, RankKey] = {}
+        self._names: dict[str, str] = {}
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def update(self, player_id: str, xp: int, name: str = ""):
+        """Raise a player's XP, moving them to their new position.
+
+        XP never goes down, as in the store, so a stale session cannot demote
+        a player.
+        """
+        self._set(player_id, xp, name)
+        if self.store is not None:
+            self.store.record_player(player_id, name, xp)
+
+    def _set(self, player_id: str, xp: int, name: str):
+        with self._lock:
+            if name:
+                self._names[player_id] = name
+            old_key = self._key_by_player.get(player_id)
+            if old_key is not None:
+                if -old_key[0] >= xp:
+                    return
+                del self._keys[bisect.bisect_left(self._keys, old_key)]
+            key = (-xp, next(self._sequence), player_id)
+            bisect.insort(self._keys, key)
+            self._key_by_player[player_id] = key
+
+    def rename(self, player_id: str, name: str):
+        with self._lock:
+            self._names[player_id] = name
+            key = self._key_by_player.get(player_id)
+        if self.store is not None:
+            self.store.record_player(player_id, name, -key[0] if key else 0)
+
+    def sync(self):
+        """Apply the changes other workers have flushed to the store."""
+        if self.store is None:
+            return
+        rows, self._synced_seq = self.store.players_since(self._synced_seq)
+        for player_id, name, xp in rows:
+            # Our own newer XP may not have been flushed yet; _set keeps the higher one
+            self._set(player_id, xp, name)
+
+    def rank(self, player_id: str) -> int:
+        """1-based rank of the player, or 0 when they have no XP recorded."""
+        with self._lock:
+            key = self._key_by_player.get(player_id)
+            if key is None:
+                return 0
+            return bisect.bisect_left(self._keys, key) + 1
+
+    def top(self, count: int) -> list[LeaderboardRow]:
+        with self._lock:
+            return [
+                LeaderboardRow(
+                    rank=index + 1,
+                    player_id=player_id,
+                    name=self._names.get(player_id, ""),
+                    xp=-negative_xp,
+                )
+                for index, (negative_xp, _, player_id) in enumerate(self._keys[:count])
+            ]
+
+
+@functools.lru_cache(maxsize=None)
+def get_leaderboard() -> Leaderboard:
+    """The process-wide board; it starts empty until warm_leaderboard has synced it."""
+    return Leaderboard(get_ratings_store())
+
+
+async def warm_leaderboard():
+    """Load the stored board in a thread, off the event loop."""
+    await asyncio.to_thread(get_leaderboard().sync)
@@ -0,0 +1,42 @@
+import asyncio
+
+import reflex as rx
+from typing import TypedDict
+from app.states.leaderboard import get_leaderboard
+from app.states.user_state import UserState, level_for_xp
+
+LEADERBOARD_SIZE = 50
+
+
+class LeaderboardEntry(TypedDict):
+    rank: int
+    name: str
+    xp: int
+    level: int
+    is_you: bool
+
+
+class LeaderboardState(rx.State):
+    top_players: list[LeaderboardEntry] = []
+    my_rank: int = 0
+    total_players: int = 0
+
+    @rx.event
+    async def refresh(self):
+        """Snapshot the global leaderboard around this player"""
+        user_state = await self.get_state(UserState)
+        player_id = user_state._player_id
+        board = get_leaderboard()
+        await asyncio.to_thread(board.sync)
+        self.top_players = [
+            {
+                "rank": row["rank"],
+                "name": row["name"] or f"NAPPER #{row['player_id'][:4].upper()}",
+                "xp": row["xp"],
+                "level": level_for_xp(row["xp"]),
+                "is_you": row["player_id"] == player_id,
+            }
+            for row in board.top(LEADERBOARD_SIZE)
+        ]
+        self.my_rank = board.rank(player_id) if player_id else 0
+        self.total_players = len(board)
@@ -0,0 +1,95 @@
+"""The nap spot catalog compiled from the location spreadsheet.
+
+``ingest_locations.py`` parses ``assets/location_data.xlsx`` and writes
+``app/data/location_catalog.json``. The catalog records a version that is
+bumped whenever its content changes, plus a hash of each source row, so a
+re-ingest only re-parses the rows that were edited. The app loads the
+catalog once at startup.
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import TypedDict
+
+from app.states.rating_stats import RATING_DIMENSIONS
+from app.states.spot_geometry import BUILDINGS, OUTDOOR
+
+CATALOG_PATH = Path(__file__).resolve().parent.parent / "data" / "location_catalog.json"
+# Bumped when the file layout changes, not when locations are edited
+CATALOG_FORMAT = 1
+
+RARITIES: tuple[str, ...] = ("LEGENDARY", "EPIC", "RARE", "UNCOMMON", "MYTHICAL")
+BUILDING_IDS: tuple[str, ...] = (*BUILDINGS, OUTDOOR)
+
+_LOCATION_ID = re.compile(r"^[a-z0-9]+(-[a-z0-9]+)*$")
+_SKETCHFAB_ID = re.compile(r"^[a-f0-9]{32}$")
+_ICON_NAME = re.compile(r"^[a-z0-9]+(-[a-z0-9]+)*$")
+
+
+class Rating(TypedDict):
+    comfort: int
+    quietness: int
+    accessibility: int
+    vibe_check: int
+    danger: int
+
+
+class Location(TypedDict):
+    id: str
+    location: str
+    building: str
+    name: str
+    description: str
+    icon: str
+    model_id: str
+    rarity: str
+    is_secret: bool
+    sample_rating: Rating
+
+
+class LocationCatalog(TypedDict):
+    format: int
+    version: int
+    source: str
+    # Source row hash -> id of the location compiled from that row
+    row_hashes: dict[str, str]
+    locations: list[Location]
+
+
+def validate_location(location: Location) -> list[str]:
+    """Problems with one compiled location; empty when it is valid."""
+    errors = []
+    if not _LOCATION_ID.match(location["id"]):
+        errors.append(f"id {location['id']!r} is not a lowercase slug")
+    for field in ("location", "name", "description"):
+        if not location[field].strip():
+            errors.append(f"{field} is empty")
+    if location["building"] not in BUILDING_IDS:
+        errors.append(f"building {location['building']!r} is not one of {BUILDING_IDS}")
+    if not _ICON_NAME.match(location["icon"]):
+        errors.append(f"icon {location['icon']!r} is not a Lucide icon name")
+    if location["model_id"] and not _SKETCHFAB_ID.match(location["model_id"]):
+        errors.append(f"model_id {location['model_id']!r} is not a Sketchfab model id")
+    if location["rarity"] not in RARITIES:
+        errors.append(f"rarity {location['rarity']!r} is not one of {RARITIES}")
+    rating = location["sample_rating"]
+    if set(rating) != set(RATING_DIMENSIONS):
+        errors.append(f"sample_rating keys {sorted(rating)} do not match {list(RATING_DIMENSIONS)}")
+    errors += [
+        f"sample_rating {key} = {value!r} is outside 1-5"
+        for key, value in rating.items()
+        if not isinstance(value, int) or not 1 <= value <= 5
+    ]
+    return errors
+
+
+def load_location_catalog(path: Path = CATALOG_PATH) -> LocationCatalog:
+    with open(path, encoding="utf-8") as f:
+        catalog = json.load(f)
+    if catalog.get("format") != CATALOG_FORMAT:
+        raise ValueError(
+            f"{path} has catalog format {catalog.get('format')}, expected {CATALOG_FORMAT}; "
+            "re-run ingest_locations.py"
+        )
+    return catalog
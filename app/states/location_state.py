@@ -1,213 +1,210 @@
+import asyncio
 import reflex as rx
-from typing import TypedDict, cast
-import qrcode
-import io
-import base64
-from collections import Counter
+from types import MappingProxyType
+from typing import AbstractSet, Mapping, TypedDict
+import uuid
+from app.states.achievement_rules import (
+    CHECK_IN_EVENT,
+    RATING_EVENT,
+    compile_achievement_rules,
+    evaluate_achievements,
+)
+from app.states.image_manifest import ImageSources, image_sources
+from app.states.location_catalog import Location, LocationCatalog, Rating, load_location_catalog
+from app.states.offline_queue import MAX_BATCH, ack_script, action_id, parse_offline_action
+from app.states.qr_cache import get_qr_cache, location_qr_payload
+from app.states import routes
+from app.states.rating_broadcast import get_rating_broadcaster
+from app.states.ratings_store import get_ratings_store
+from app.states.spot_geometry import (
+    SPOT_GEOMETRY,
+    SPOT_IDS_BY_FLOOR,
+    FloorKey,
+    spot_map_image,
+    spot_preview_image,
+)
+from app.states.user_state import ACHIEVEMENTS
+from app.states.rating_stats import (
+    RATING_DIMENSIONS,
+    FrozenHistograms,
+    histogram_mean,
+    histogram_percentages,
+    is_s_rank,
+)
 
 
-class Rating(TypedDict):
-    comfort: int
-    quietness: int
-    accessibility: int
-    vibe_check: int
-    danger: int
-
-
-class Location(TypedDict):
+class FloorSpot(TypedDict):
     id: str
     location: str
     name: str
-    description: str
-    icon: str
-    model_id: str
-    rarity: str
-    is_secret: bool
-    sample_rating: Rating
+    icon_type: str
+    x: str
+    y: str
 
 
-class LocationState(rx.State):
-    checked_in_locations: set[str] = set()
-    
-    locations: list[Location] = [
-        {
-            "id": "cloud-nine-credit",
-            "location": "Study room on the G floor of the library",
-            "name": "Cloud Nine Credit Charge",
-            "description": "Your demand for comfort rivals that of a five-star hotel sleep tester. Here, the sofa is a cloud, the power outlet is a magical spring. With stable Wi-Fi, you might even dream of being rewarded with credit hours.",
-            "icon": "sofa",
-            "model_id": "b67d3200015b48db9546fc8e2afd6168",
-            "rarity": "LEGENDARY",
-            "is_secret": False,
-            "sample_rating": {"comfort": 5, "quietness": 5, "accessibility": 3, "vibe_check": 3, "danger": 1}
-        },
-        {
-            "id": "the-spynap-alley",
-            "location": "The corridor of bookshelves on the G floor of the library",
-            "name": "The Spy-Nap Alley",
-            "description": "Your sleep here is like a footnote in a thesis—precise, brief, yet indispensable. Each time you close your eyes, it's like activating 'Deep Recovery Mode,' restoring 80% energy in 5 minutes. But, sleeping here... is this bookshelf about to fall over...?",
-            "icon": "zap",
-            "model_id": "d682b1a9ea2f4683914f9e6384dcb845",
-            "rarity": "EPIC",
-            "is_secret": False,
-            "sample_rating": {"comfort": 4, "quietness": 3, "accessibility": 4, "vibe_check": 3, "danger": 1}
-        },
-        {
-            "id": "the-public-isolation",
-            "location": "Sofa on the G floor of the library",
-            "name": "The Public Isolation Island",
-            "description": "This isn't a sofa; it's your 'Ergonomic Island.' People passing by? They're just the sightseers in your dream's bullet comments. You recharge your energy and your inspiration—waking up fully charged, with inspiration unlocked in a new skin.",
-            "icon": "sofa",
-            "model_id": "5d549bf015bf49f8add67eb74e86ad26",
-            "rarity": "LEGENDARY",
-            "is_secret": False,
-            "sample_rating": {"comfort": 4, "quietness": 4, "accessibility": 5, "vibe_check": 3, "danger": 1}
-        },
-        {
-            "id": "the-urban-zen",
-            "location": "Outdoor wooden chair",
-            "name": "The Urban Zen Bench",
-            "description": "You sleep on the city's pulse. The subway vibrations are white noise, the passing shadows are your dynamic screensaver. You're not napping outdoors; you're starring in a live performance of 'Urban Sleep Log.'",
-            "icon": "compass",
-            "model_id": "932a64b422a94be9bec6899d36c6f6ea",
-            "rarity": "UNCOMMON",
-            "is_secret": False,
-            "sample_rating": {"comfort": 2, "quietness": 2, "accessibility": 4, "vibe_check": 3, "danger": 1}
-        },
-        {
-            "id": "the-shade-throne",
-            "location": "Outdoor dining chair",
-            "name": "The Shade Throne",
-            "description": "Under the sunshade umbrella, you are your own shopkeeper. Occasionally someone studying? They're just extras in your dream~",
-            "icon": "compass",
-            "model_id": "0201608218144d65892e4f63647774d0",
-            "rarity": "UNCOMMON",
-            "is_secret": False,
-            "sample_rating": {"comfort": 3, "quietness": 3, "accessibility": 5, "vibe_check": 3, "danger": 1}
-        },
-        {
-            "id": "the-stonecold-zen",
-            "location": "Outdoor stone chair",
-            "name": "The Stone-Cold Zen Zone",
-            "description": "A four-person stone bench, you occupy one corner, the greenery is your screen. An occasional passerby? They're just forest spirits in your dream~",
-            "icon": "compass",
-            "model_id": "d33020d326bb4e6bbcf6043f6f5dfb1b",
-            "rarity": "UNCOMMON",
-            "is_secret": False,
-            "sample_rating": {"comfort": 1, "quietness": 1, "accessibility": 4, "vibe_check": 3, "danger": 1}
-        },
-        {
-            "id": "the-bobafueled-snooze",
-            "location": "JCIT Milk Tea Shop",
-            "name": "The Boba-Fueled Snooze Booth",
-            "description": "Fall asleep to the scent of milk tea, wake up at the round table. I will strategically choose the 'off-peak hours'!",
-            "icon": "bed-double",
-            "model_id": "6c59d214f3224a6b9fa9f135937ff3ff",
-            "rarity": "RARE",
-            "is_secret": False,
-            "sample_rating": {"comfort": 3, "quietness": 2, "accessibility": 3, "vibe_check": 3, "danger": 1}
-        },
-        {
-            "id": "the-stairwell-stealth",
-            "location": "JCIT Stairwell",
-            "name": "The Stairwell Stealth Suite",
-            "description": "The stench is your barrier, the emptiness is your dojo. No people, right? That's called 'Stealth Skill Activated'!",
-            "icon": "zap",
-            "model_id": "f0ca0a25820646bf9575d7e075aefae2",
-            "rarity": "EPIC",
-            "is_secret": False,
-            "sample_rating": {"comfort": 1, "quietness": 1, "accessibility": 2, "vibe_check": 3, "danger": 1}
-        },
-        {
-            "id": "the-curtaincall-nap",
-            "location": "JCIT Study Room Partition Area",
-            "name": "The Curtain-Call Nap Studio",
-            "description": "Curtain drawn, reclining on the small chair, game console on standby~ The people around are just the audience of your sleep livestream!",
-            "icon": "sofa",
-            "model_id": "b1c28102ab3a4a7193e7b89a2130a19f",
-            "rarity": "LEGENDARY",
-            "is_secret": False,
-            "sample_rating": {"comfort": 3, "quietness": 3, "accessibility": 4, "vibe_check": 3, "danger": 1}
-        },
+# Compiled from the location spreadsheet by ingest_locations.py
+LOCATION_CATALOG: LocationCatalog = load_location_catalog()
+LOCATIONS: tuple[Location, ...] = tuple(LOCATION_CATALOG["locations"])
+
+RARITY_COLORS: Mapping[str, str] = MappingProxyType(
+    {
+        "LEGENDARY": "#ffd700",
+        "EPIC": "#bd00ff",
+        "RARE": "#00d4ff",
+        "UNCOMMON": "#00ff9f",
+        "MYTHICAL": "#ff0055",
+    }
+)
+
+# Lookup indexes over the catalog, built once at import
+LOCATIONS_BY_ID: Mapping[str, Location] = MappingProxyType(
+    {loc["id"]: loc for loc in LOCATIONS}
+)
+
+
+def _group_ids(key: str) -> Mapping[str, frozenset[str]]:
+    groups: dict[str, set[str]] = {}
+    for loc in LOCATIONS:
+        groups.setdefault(loc[key], set()).add(loc["id"])
+    return MappingProxyType({value: frozenset(ids) for value, ids in groups.items()})
+
+
+LOCATION_IDS_BY_RARITY: Mapping[str, frozenset[str]] = _group_ids("rarity")
+LOCATION_IDS_BY_BUILDING: Mapping[str, frozenset[str]] = _group_ids("building")
+SECRET_LOCATION_IDS: frozenset[str] = frozenset(
+    loc["id"] for loc in LOCATIONS if loc["is_secret"]
+)
+
+# Map markers per (building, floor), joined with the catalog once at import
+FLOOR_SPOTS: Mapping[FloorKey, list[FloorSpot]] = MappingProxyType({
+    floor: [
         {
-            "id": "the-modular-dream",
-            "location": "JCIT Study Room Sofa",
-            "name": "The Modular Dream Fort",
-            "description": "Modular sofas for you to arrange, the view outside for you to enjoy~ Just love the 'shared sleep experience'!",
-            "icon": "sofa",
-            "model_id": "85aa52c8637b42d18d7fb082bd11d265",
-            "rarity": "LEGENDARY",
-            "is_secret": False,
-            "sample_rating": {"comfort": 4, "quietness": 5, "accessibility": 5, "vibe_check": 3, "danger": 1}
-        },
+            "id": spot_id,
+            "location": LOCATIONS_BY_ID[spot_id]["location"],
+            "name": LOCATIONS_BY_ID[spot_id]["name"],
+            "icon_type": SPOT_GEOMETRY[spot_id]["icon"],
+            "x": SPOT_GEOMETRY[spot_id]["x"],
+            "y": SPOT_GEOMETRY[spot_id]["y"],
+        }
+        for spot_id in spot_ids
     ]
-    ratings: dict[str, list[Rating]] = {}
-    selected_location_id: str | None = None
-    new_rating: Rating = {
-        "comfort": 3,
-        "quietness": 3,
-        "accessibility": 3,
-        "vibe_check": 3,
-        "danger": 3,
+    for floor, spot_ids in SPOT_IDS_BY_FLOOR.items()
+})
+
+# Shown for spots nobody has rated yet
+SAMPLE_AVERAGES: Mapping[str, dict[str, float]] = MappingProxyType({
+    loc["id"]: {
+        **{dimension: float(value) for dimension, value in loc["sample_rating"].items()},
+        "overall": round(sum(loc["sample_rating"].values()) / len(loc["sample_rating"]), 1),
     }
+    for loc in LOCATIONS
+})
 
-    is_hovering_location_title: bool = False
 
-    @rx.event
-    def set_hovering_location_title(self, hover: bool):
-        self.is_hovering_location_title = hover
+def histogram_averages(histograms: FrozenHistograms) -> dict[str, float]:
+    dimension_avgs = {
+        dimension: histogram_mean(histogram)
+        for dimension, histogram in zip(RATING_DIMENSIONS, histograms)
+    }
+    overall = sum(dimension_avgs.values()) / len(dimension_avgs)
+    averages = {dimension: round(avg, 1) for dimension, avg in dimension_avgs.items()}
+    averages["overall"] = round(overall, 1)
+    return averages
+
+
+ACHIEVEMENT_RULES = compile_achievement_rules(
+    ACHIEVEMENTS,
+    location_ids_by_building=LOCATION_IDS_BY_BUILDING,
+    location_ids_by_rarity=LOCATION_IDS_BY_RARITY,
+    secret_location_ids=SECRET_LOCATION_IDS,
+    all_location_ids=frozenset(LOCATIONS_BY_ID),
+)
+
+
+class LocationState(rx.State):
+    checked_in_locations: set[str] = set()
+    
+    # Anonymous id that ties this browser to its ratings and check-ins in the store
+    player_id: str = rx.LocalStorage(name="polyunap_player_id")
+    # Shared across all players: location_id -> per-dimension counts of 1..5 star ratings.
+    # The values are tuples, so reads never go through the change-tracking proxy
+    _rating_histograms: dict[str, FrozenHistograms] = {}
+    # This player's own rating counters
+    _rating_counts: dict[str, int] = {}
+    _favorite_location_id: str = ""
+    _total_ratings: int = 0
+    _total_rating_points: int = 0
+    _s_rank_total: int = 0
+    _player_loaded: bool = False
+    selected_location_id: str | None = None
 
     @rx.var
     def selected_location_map_image(self) -> str:
-        if not self.selected_location_id:
-            return ""
-        
-        # Hardcoded mapping to avoid circular imports with MapState
-        # Library G
-        if self.selected_location_id in ["cloud-nine-credit", "the-spynap-alley", "the-public-isolation"]:
-            return "/map images/Pao Yue-kong Library G Floor.png"
-        # JCIT P
-        elif self.selected_location_id in ["the-bobafueled-snooze"]:
-            return "/map images/Jockey Club Innovation Tower P.png"
-        # JCIT 11
-        elif self.selected_location_id in ["the-stairwell-stealth", "the-curtaincall-nap", "the-modular-dream"]:
-            return "/map images/Jockey Club Innovation Tower 11F.png"
-        # Outdoor
-        elif self.selected_location_id in ["the-urban-zen", "the-shade-throne", "the-stonecold-zen"]:
-            return "/map images/POLYU MAP.png"
-        
-        return ""
+        return spot_map_image(self.selected_location_id)
+
+    @rx.var
+    def selected_location_map_sources(self) -> ImageSources:
+        return image_sources(self.selected_location_map_image)
+
+    @rx.var
+    def selected_location_preview_sources(self) -> ImageSources:
+        return image_sources(spot_preview_image(self.selected_location_id))
 
     @rx.var
     def selected_location_coords(self) -> dict[str, str]:
-        if not self.selected_location_id:
-            return {"x": "0%", "y": "0%"}
-            
-        # Hardcoded coordinates matching interactive_map.py
-        coords = {
-            "cloud-nine-credit": {"x": "30%", "y": "9%"},
-            "the-spynap-alley": {"x": "7%", "y": "9%"},
-            "the-public-isolation": {"x": "43%", "y": "65%"},
-            "the-urban-zen": {"x": "60%", "y": "59%"},
-            "the-shade-throne": {"x": "58%", "y": "51%"},
-            "the-stonecold-zen": {"x": "57%", "y": "62%"},
-            "the-bobafueled-snooze": {"x": "72%", "y": "28%"},
-            "the-stairwell-stealth": {"x": "48%", "y": "35%"},
-            "the-curtaincall-nap": {"x": "60%", "y": "45%"},
-            "the-modular-dream": {"x": "53%", "y": "60%"},
-        }
-        return coords.get(self.selected_location_id, {"x": "50%", "y": "50%"})
+        spot = SPOT_GEOMETRY.get(self.selected_location_id)
+        if spot is None:
+            return {"x": "50%", "y": "50%"}
+        return {"x": spot["x"], "y": spot["y"]}
+
+    def _ensure_player_id(self) -> str:
+        if not self.player_id:
+            self.player_id = uuid.uuid4().hex
+        return self.player_id
 
     @rx.event
-    async def check_in_location(self, location_id: str):
+    async def load_player(self):
+        """Restore this player's history once per tab; follow live ratings on the pages showing them"""
+        from app.states.user_state import UserState
+
+        get_rating_broadcaster().watch(
+            self.router.session.client_token, routes.shows_ratings(self.router.url.path)
+        )
+        if self._player_loaded:
+            return
+        store = get_ratings_store()
+        # The reads flush first, which can wait on another worker's write
+        self.checked_in_locations = await asyncio.to_thread(store.player_check_ins, self._ensure_player_id())
+        user_state = await self.get_state(UserState)
+        user_state._player_id = self.player_id
+        # A new tab of a returning player picks up where the last one left off
+        gamertag, xp, achievements = await asyncio.to_thread(store.player_profile, self.player_id)
+        user_state.gamertag = user_state.gamertag or gamertag
+        user_state.xp = max(user_state.xp, xp)
+        user_state.unlocked_achievements = user_state.unlocked_achievements | achievements
+
+        self._rating_counts = {}
+        self._favorite_location_id = ""
+        self._total_ratings = 0
+        self._total_rating_points = 0
+        self._s_rank_total = 0
+        for location_id, rating in await asyncio.to_thread(store.player_ratings, self.player_id):
+            self._count_player_rating(location_id, rating)
+        self._rating_histograms = await asyncio.to_thread(store.location_aggregates)
+        self._player_loaded = True
+
+    async def _check_in(self, location_id: str, stored: bool = False):
+        """Check in and award XP; ``stored`` when the store already has the check-in"""
         from app.states.user_state import UserState
         
         if location_id not in self.checked_in_locations:
             self.checked_in_locations.add(location_id)
+            if not stored:
+                get_ratings_store().record_check_in(self._ensure_player_id(), location_id)
             user_state = await self.get_state(UserState)
             
             # Find location details
-            location = next((loc for loc in self.locations if loc["id"] == location_id), None)
+            location = LOCATIONS_BY_ID.get(location_id)
             
             if location:
                 # XP based on rarity
@@ -218,14 +215,8 @@ class LocationState(rx.State):
                     "UNCOMMON": 50,
                 }.get(location["rarity"], 50)
                 
-                # Add XP directly
-                old_level = user_state.level
-                user_state.xp += xp_gain
-                new_level = user_state.level
-                
-                # Check for level up
-                if new_level > old_level:
-                    yield user_state.level_up_notification(new_level)
+                for event in user_state._gain_xp(xp_gain):
+                    yield event
                 
                 yield rx.toast.success(
                     f"✅ CHECK-IN COMPLETE\n{location['name']}\n+{xp_gain} XP",
@@ -233,36 +224,19 @@ class LocationState(rx.State):
                     position="bottom-right"
                 )
                 
-                if location["is_secret"]:
-                    yield user_state.unlock_achievement("secret-spot-explorer")
-                    yield user_state.unlock_achievement("secret-boss-defeated")
-                
-                # Check for location collection achievements
-                checked_in_list = list(self.checked_in_locations)
-                
-                # Library Legend - all library locations
-                library_locs = ["cloud-nine-credit", "the-spynap-alley", "the-public-isolation"]
-                if all(loc in checked_in_list for loc in library_locs):
-                    yield user_state.unlock_achievement("library-legend")
-                
-                # Outdoor Enthusiast - all outdoor locations
-                outdoor_locs = ["the-urban-zen", "the-shade-throne", "the-stonecold-zen"]
-                if all(loc in checked_in_list for loc in outdoor_locs):
-                    yield user_state.unlock_achievement("outdoor-enthusiast")
-                
-                # JCIT Master - all JCIT locations
-                jcit_locs = ["the-bobafueled-snooze", "the-stairwell-stealth", "the-curtaincall-nap", "the-modular-dream"]
-                if all(loc in checked_in_list for loc in jcit_locs):
-                    yield user_state.unlock_achievement("jcit-master")
-                
-                # Comfort Seeker - all LEGENDARY locations
-                legendary_locs = [loc["id"] for loc in self.locations if loc["rarity"] == "LEGENDARY"]
-                if all(loc in checked_in_list for loc in legendary_locs):
-                    yield user_state.unlock_achievement("comfort-seeker")
+                # Secret spot and location collection achievements
+                earned = evaluate_achievements(
+                    ACHIEVEMENT_RULES,
+                    CHECK_IN_EVENT,
+                    {"location_id": location_id, "checked_in": self.checked_in_locations},
+                    user_state.unlocked_achievements,
+                )
+                for event in user_state._grant_achievements(earned):
+                    yield event
 
     @rx.var
     def missions_count(self) -> int:
-        return len(self.ratings)
+        return len(self._rating_counts)
 
     @rx.var
     def explored_count(self) -> int:
@@ -270,338 +244,205 @@ class LocationState(rx.State):
 
     @rx.var
     def s_rank_count(self) -> int:
-        count = 0
-        for ratings in self.ratings.values():
-            for r in ratings:
-                if all(v == 5 for v in r.values()):
-                    count += 1
-        return count
+        return self._s_rank_total
 
     @rx.var
     def secrets_found_count(self) -> int:
-        count = 0
-        for loc_id in self.checked_in_locations:
-            loc = next((l for l in self.locations if l["id"] == loc_id), None)
-            if loc and loc["is_secret"]:
-                count += 1
-        return count
+        return len(SECRET_LOCATION_IDS.intersection(self.checked_in_locations))
+
+    @rx.event
+    def open_location(self):
+        """on_load of the detail page: select the location named in the URL"""
+        location_id = routes.location_id_from_path(self.router.url.path)
+        if location_id not in LOCATIONS_BY_ID:
+            return rx.redirect(routes.LOCATIONS, replace=True)
+        # Reassigning the same id would still resend every dependent var
+        if location_id != self.selected_location_id:
+            self.selected_location_id = location_id
 
     @rx.event
-    async def select_location(self, location_id: str):
+    async def sync_offline_actions(self, actions: list[dict]):
+        """Apply check-ins and ratings from the browser outbox, then acknowledge them"""
+        batch = actions[:MAX_BATCH]
+        parsed = [action for action in map(parse_offline_action, batch) if action is not None]
+        acked = [id_ for id_ in map(action_id, batch) if id_ is not None]
+        # Malformed entries are acknowledged too, so they do not block the outbox
+        if dropped := len(acked) - len(parsed):
+            yield rx.toast.error(
+                f"Discarded {dropped} offline action(s) that could not be read.",
+                position="bottom-right",
+            )
+        # Written to the store in the transaction that claims them, before
+        # anything is acknowledged; spots no longer in the catalog are only claimed
+        writes = [
+            (action["id"], action["location_id"] if action["location_id"] in LOCATIONS_BY_ID else "", action["rating"])
+            for action in parsed
+        ]
+        claimed = await asyncio.to_thread(get_ratings_store().claim_actions, self._ensure_player_id(), writes)
+        for action in parsed:
+            # Already applied by an earlier batch, or a spot no longer in the catalog
+            if action["id"] not in claimed or action["location_id"] not in LOCATIONS_BY_ID:
+                continue
+            if action["kind"] == "check_in":
+                events = self._check_in(action["location_id"], stored=True)
+            else:
+                events = self._rate(action["location_id"], action["rating"], stored=True)
+            async for event in events:
+                yield event
+        yield rx.call_script(ack_script(acked))
+
+    async def _rate(self, location_id: str, rating: Rating, stored: bool = False):
+        """Record a rating and award XP; ``stored`` when the store already has the rating"""
+        from app.states.user_state import UserState
         from app.states.quiz_state import QuizState
 
-        self.selected_location_id = location_id
+        user_state = await self.get_state(UserState)
+        
+        # First time rating this location bonus
+        is_first_rating = location_id not in self._rating_counts
+        
+        await self._record_rating(location_id, rating, stored)
+        
+        # Calculate XP based on rating
+        avg = sum(rating.values()) / len(rating)
+        stars = int(avg)
+        
+        # Base XP for rating
+        base_xp = 30
+        # Bonus for first rating
+        first_rating_bonus = 70 if is_first_rating else 0
+        # Bonus for thoroughness (max ratings)
+        thoroughness_bonus = 20 if all(v == 5 for v in rating.values()) else 0
+        
+        total_xp = base_xp + first_rating_bonus + thoroughness_bonus
+        
+        location = LOCATIONS_BY_ID.get(location_id)
+        location_name = location["name"] if location else "Location"
+        
+        for event in user_state._gain_xp(total_xp):
+            yield event
+        
+        # Achievement checks
         quiz_state = await self.get_state(QuizState)
-        quiz_state.current_page = "location_detail"
+        earned = evaluate_achievements(
+            ACHIEVEMENT_RULES,
+            RATING_EVENT,
+            {
+                "rating": rating,
+                "rated_location_ids": self._rated_location_ids(),
+                "quiz_finished": quiz_state.quiz_finished,
+            },
+            user_state.unlocked_achievements,
+        )
+        for event in user_state._grant_achievements(earned):
+            yield event
+        
+        # Show mission complete notification
+        stars_display = "⭐" * stars
+        yield rx.toast.success(
+            f"🎯 MISSION COMPLETE\n{location_name}\nRating: {stars_display} ({avg:.1f}/5)\n+{total_xp} XP",
+            duration=4000,
+            position="bottom-right"
+        )
 
-    @rx.event
-    def set_new_rating_value(self, category: str, value: str):
-        self.new_rating[category] = int(value)
+    def _rated_location_ids(self) -> AbstractSet[str]:
+        return self._rating_counts.keys()
 
-    @rx.event
-    async def submit_rating(self):
-        if self.selected_location_id:
-            from app.states.user_state import UserState
-            from app.states.quiz_state import QuizState
+    async def _record_rating(self, location_id: str, rating: Rating, stored: bool = False):
+        """Persist one rating and refresh the shared aggregate for its location"""
+        self._count_player_rating(location_id, rating)
+        store = get_ratings_store()
+        if not stored:
+            store.record_rating(self._ensure_player_id(), location_id, rating)
+        self._rating_histograms[location_id] = await asyncio.to_thread(store.location_aggregate, location_id)
+        get_rating_broadcaster().publish(location_id)
 
-            if self.selected_location_id not in self.ratings:
-                self.ratings[self.selected_location_id] = []
-            
-            user_state = await self.get_state(UserState)
-            
-            # First time rating this location bonus
-            is_first_rating = len(self.ratings[self.selected_location_id]) == 0
-            
-            self.ratings[self.selected_location_id].append(self.new_rating.copy())
-            
-            # Calculate XP based on rating
-            avg = sum(self.new_rating.values()) / len(self.new_rating)
-            stars = int(avg)
-            
-            # Base XP for rating
-            base_xp = 30
-            # Bonus for first rating
-            first_rating_bonus = 70 if is_first_rating else 0
-            # Bonus for thoroughness (max ratings)
-            thoroughness_bonus = 20 if all(v == 5 for v in self.new_rating.values()) else 0
-            
-            total_xp = base_xp + first_rating_bonus + thoroughness_bonus
-            
-            location_name = next(
-                (loc["name"] for loc in self.locations if loc["id"] == self.selected_location_id),
-                "Location"
-            )
-            
-            # Add XP directly
-            old_level = user_state.level
-            user_state.xp += total_xp
-            new_level = user_state.level
-            
-            # Check for level up
-            if new_level > old_level:
-                yield user_state.level_up_notification(new_level)
-            
-            # Achievement checks
-            if all((v == 5 for v in self.new_rating.values())):
-                old_level_check = user_state.level
-                user_state.xp += 200
-                if user_state.level > old_level_check:
-                    yield user_state.level_up_notification(user_state.level)
-                if "5-star-sleeper" not in user_state.unlocked_achievements:
-                    user_state.unlocked_achievements.add("5-star-sleeper")
-                    achievement = user_state.achievements["5-star-sleeper"]
-                    yield rx.toast.warning(
-                        rx.el.div(
-                            rx.icon(achievement["icon"], class_name="mr-2"),
-                            f"🏆 Achievement Unlocked: {achievement['title']} (+200 XP)",
-                            class_name="flex items-center",
-                        ),
-                        duration=5000,
-                        position="top-center"
-                    )
-            
-            # New Achievements Logic
-            if self.new_rating["danger"] == 5:
-                if "living-on-the-edge" not in user_state.unlocked_achievements:
-                    old_level_check = user_state.level
-                    user_state.xp += 200
-                    if user_state.level > old_level_check:
-                        yield user_state.level_up_notification(user_state.level)
-                    user_state.unlocked_achievements.add("living-on-the-edge")
-                    achievement = user_state.achievements["living-on-the-edge"]
-                    yield rx.toast.warning(
-                        rx.el.div(
-                            rx.icon(achievement["icon"], class_name="mr-2"),
-                            f"🏆 Achievement Unlocked: {achievement['title']} (+200 XP)",
-                            class_name="flex items-center",
-                        ),
-                        duration=5000,
-                        position="top-center"
-                    )
-            
-            if self.new_rating["quietness"] == 5:
-                if "zen-master" not in user_state.unlocked_achievements:
-                    old_level_check = user_state.level
-                    user_state.xp += 200
-                    if user_state.level > old_level_check:
-                        yield user_state.level_up_notification(user_state.level)
-                    user_state.unlocked_achievements.add("zen-master")
-                    achievement = user_state.achievements["zen-master"]
-                    yield rx.toast.warning(
-                        rx.el.div(
-                            rx.icon(achievement["icon"], class_name="mr-2"),
-                            f"🏆 Achievement Unlocked: {achievement['title']} (+200 XP)",
-                            class_name="flex items-center",
-                        ),
-                        duration=5000,
-                        position="top-center"
-                    )
-            
-            if self.new_rating["quietness"] == 1 and self.new_rating["vibe_check"] == 5:
-                if "social-sleeper" not in user_state.unlocked_achievements:
-                    old_level_check = user_state.level
-                    user_state.xp += 200
-                    if user_state.level > old_level_check:
-                        yield user_state.level_up_notification(user_state.level)
-                    user_state.unlocked_achievements.add("social-sleeper")
-                    achievement = user_state.achievements["social-sleeper"]
-                    yield rx.toast.warning(
-                        rx.el.div(
-                            rx.icon(achievement["icon"], class_name="mr-2"),
-                            f"🏆 Achievement Unlocked: {achievement['title']} (+200 XP)",
-                            class_name="flex items-center",
-                        ),
-                        duration=5000,
-                        position="top-center"
-                    )
-
-            if len(self.ratings) >= 3:
-                if "secret-spot-explorer" not in user_state.unlocked_achievements:
-                    old_level_check = user_state.level
-                    user_state.xp += 200
-                    if user_state.level > old_level_check:
-                        yield user_state.level_up_notification(user_state.level)
-                    user_state.unlocked_achievements.add("secret-spot-explorer")
-                    achievement = user_state.achievements["secret-spot-explorer"]
-                    yield rx.toast.warning(
-                        rx.el.div(
-                            rx.icon(achievement["icon"], class_name="mr-2"),
-                            f"🏆 Achievement Unlocked: {achievement['title']} (+200 XP)",
-                            class_name="flex items-center",
-                        ),
-                        duration=5000,
-                        position="top-center"
-                    )
-            
-            if len(self.ratings) == len(self.locations):
-                quiz_state = await self.get_state(QuizState)
-                if "all-area-conqueror" not in user_state.unlocked_achievements:
-                    old_level_check = user_state.level
-                    user_state.xp += 200
-                    if user_state.level > old_level_check:
-                        yield user_state.level_up_notification(user_state.level)
-                    user_state.unlocked_achievements.add("all-area-conqueror")
-                    achievement = user_state.achievements["all-area-conqueror"]
-                    yield rx.toast.warning(
-                        rx.el.div(
-                            rx.icon(achievement["icon"], class_name="mr-2"),
-                            f"🏆 Achievement Unlocked: {achievement['title']} (+200 XP)",
-                            class_name="flex items-center",
-                        ),
-                        duration=5000,
-                        position="top-center"
-                    )
-                
-                if quiz_state.quiz_finished and "nap-legend" not in user_state.unlocked_achievements:
-                    old_level_check = user_state.level
-                    user_state.xp += 200
-                    if user_state.level > old_level_check:
-                        yield user_state.level_up_notification(user_state.level)
-                    user_state.unlocked_achievements.add("nap-legend")
-                    achievement = user_state.achievements["nap-legend"]
-                    yield rx.toast.warning(
-                        rx.el.div(
-                            rx.icon(achievement["icon"], class_name="mr-2"),
-                            f"🏆 Achievement Unlocked: {achievement['title']} (+200 XP)",
-                            class_name="flex items-center",
-                        ),
-                        duration=5000,
-                        position="top-center"
-                    )
-            
-            # Show mission complete notification
-            stars_display = "⭐" * stars
-            yield rx.toast.success(
-                f"🎯 MISSION COMPLETE\n{location_name}\nRating: {stars_display} ({avg:.1f}/5)\n+{total_xp} XP",
-                duration=4000,
-                position="bottom-right"
-            )
-            
-            self.new_rating = {
-                "comfort": 3,
-                "quietness": 3,
-                "accessibility": 3,
-                "vibe_check": 3,
-                "danger": 3,
-            }
-            return
+    def _apply_rating_aggregates(self, delta: dict[str, FrozenHistograms]):
+        """Fold a batch of other players' aggregate updates into this session"""
+        self._rating_histograms.update(delta)
+
+    def _count_player_rating(self, location_id: str, rating: Rating):
+        """Fold one rating into this player's counters in O(1)"""
+        count = self._rating_counts.get(location_id, 0) + 1
+        self._rating_counts[location_id] = count
+        if count > self._rating_counts.get(self._favorite_location_id, 0):
+            self._favorite_location_id = location_id
+
+        self._total_ratings += 1
+        self._total_rating_points += sum(rating[dimension] for dimension in RATING_DIMENSIONS)
+        if is_s_rank(rating):
+            self._s_rank_total += 1
 
     @rx.var
     def selected_location(self) -> Location | None:
         if self.selected_location_id:
-            return next(
-                (
-                    loc
-                    for loc in self.locations
-                    if loc["id"] == self.selected_location_id
-                ),
-                None,
-            )
+            return LOCATIONS_BY_ID.get(self.selected_location_id)
         return None
 
-    def _generate_qr_code(self, data: str) -> str:
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_L,
-            box_size=8,
-            border=2,
-        )
-        qr.add_data(data)
-        qr.make(fit=True)
-        img = qr.make_image(fill_color="#00ff9f", back_color="#0a0a0f")
-        buffered = io.BytesIO()
-        img.save(buffered, format="PNG")
-        img_str = base64.b64encode(buffered.getvalue()).decode()
-        return f"data:image/png;base64,{img_str}"
-
-    @rx.var
+    # Vars with explicit deps recompute only when a listed input changes
+    @rx.var(deps=["selected_location_id"], auto_deps=False)
     def selected_location_qr_code(self) -> str:
-        if self.selected_location:
-            qr_data = f"sleep-scan-repeat://location/{self.selected_location['id']}"
-            return self._generate_qr_code(qr_data)
-        return self._generate_qr_code("error")
-
-    def _calculate_average(self, ratings: list[int]) -> float:
-        if not ratings:
-            return 0.0
-        return sum(ratings) / len(ratings)
+        """Upload-dir path of the cached QR image; pair with rx.get_upload_url"""
+        location_id = self.selected_location_id
+        if location_id in LOCATIONS_BY_ID:
+            return get_qr_cache().relative_path(location_qr_payload(location_id))
+        return ""
 
-    @rx.var
+    @rx.var(deps=["_rating_histograms"], auto_deps=False)
     def average_ratings(self) -> dict[str, dict[str, float]]:
+        histograms_by_location = self._rating_histograms
         avg_ratings = {}
-        
-        # Process all locations, including those without user ratings
-        for location in self.locations:
-            loc_id = location["id"]
-            rating_list = self.ratings.get(loc_id, [])
-            
-            if not rating_list:
-                # Use sample rating when no user ratings exist
-                sample = location["sample_rating"]
-                avg_ratings[loc_id] = {
-                    "comfort": float(sample["comfort"]),
-                    "quietness": float(sample["quietness"]),
-                    "accessibility": float(sample["accessibility"]),
-                    "vibe_check": float(sample["vibe_check"]),
-                    "danger": float(sample["danger"]),
-                    "overall": round(sum(sample.values()) / len(sample), 1),
-                }
-                continue
-            
-            # Calculate averages from user ratings
-            comfort_avg = self._calculate_average([r["comfort"] for r in rating_list])
-            quietness_avg = self._calculate_average(
-                [r["quietness"] for r in rating_list]
-            )
-            accessibility_avg = self._calculate_average(
-                [r["accessibility"] for r in rating_list]
-            )
-            vibe_avg = self._calculate_average([r["vibe_check"] for r in rating_list])
-            danger_avg = self._calculate_average([r["danger"] for r in rating_list])
-            overall = self._calculate_average(
-                [comfort_avg, quietness_avg, accessibility_avg, vibe_avg, danger_avg]
-            )
-            avg_ratings[loc_id] = {
-                "comfort": round(comfort_avg, 1),
-                "quietness": round(quietness_avg, 1),
-                "accessibility": round(accessibility_avg, 1),
-                "vibe_check": round(vibe_avg, 1),
-                "danger": round(danger_avg, 1),
-                "overall": round(overall, 1),
-            }
+        # Every catalog spot gets an entry; unrated ones fall back to the sample rating
+        for loc_id, sample_averages in SAMPLE_AVERAGES.items():
+            histograms = histograms_by_location.get(loc_id)
+            avg_ratings[loc_id] = histogram_averages(histograms) if histograms else sample_averages
         return avg_ratings
 
+    @rx.var
+    def selected_location_rated(self) -> bool:
+        return self.selected_location_id in self._rating_counts
+
+    @rx.var(deps=["_rating_histograms", "selected_location_id"], auto_deps=False)
+    def selected_location_rating_count(self) -> int:
+        histograms = self._rating_histograms.get(self.selected_location_id or "")
+        if not histograms:
+            return 0
+        return sum(histograms[0])
+
+    @rx.var(deps=["_rating_histograms", "selected_location_id"], auto_deps=False)
+    def selected_location_distribution(self) -> dict[str, list[int]]:
+        """Percentage of 1-5 star ratings per dimension for the selected location"""
+        histograms = self._rating_histograms.get(self.selected_location_id or "")
+        if not histograms:
+            return {dimension: [0, 0, 0, 0, 0] for dimension in RATING_DIMENSIONS}
+        return {
+            dimension: histogram_percentages(histogram)
+            for dimension, histogram in zip(RATING_DIMENSIONS, histograms)
+        }
+
     @rx.var
     def total_ratings_submitted(self) -> int:
-        return sum((len(r) for r in self.ratings.values()))
+        return self._total_ratings
 
     @rx.var
     def favorite_location(self) -> str:
-        if not self.ratings:
+        if not self._favorite_location_id:
             return "Not enough data"
-        loc_counts = {loc_id: len(ratings) for loc_id, ratings in self.ratings.items()}
-        if not loc_counts:
-            return "Not enough data"
-        most_rated_id = max(loc_counts, key=loc_counts.get)
-        fav_location = next(
-            (loc for loc in self.locations if loc["id"] == most_rated_id), None
-        )
+        fav_location = LOCATIONS_BY_ID.get(self._favorite_location_id)
         return fav_location["name"] if fav_location else "Unknown"
 
     @rx.var
     def average_rating_given(self) -> float:
-        all_user_ratings = []
-        for rating_list in self.ratings.values():
-            for rating in rating_list:
-                all_user_ratings.extend(rating.values())
-        if not all_user_ratings:
+        if not self._total_ratings:
             return 0.0
-        return round(sum(all_user_ratings) / len(all_user_ratings), 1)
+        return round(
+            self._total_rating_points / (self._total_ratings * len(RATING_DIMENSIONS)), 1
+        )
 
     @rx.var
     def completion_percentage(self) -> int:
-        rated_count = len(self.ratings)
-        total_locations = len(self.locations)
+        rated_count = len(self._rating_counts)
+        total_locations = len(LOCATIONS)
         if total_locations == 0:
             return 0
-        return int(rated_count / total_locations * 100)
\ No newline at end of file
+        return int(rated_count / total_locations * 100)
@@ -0,0 +1,65 @@
+"""Outbox for check-ins and ratings made without a connection.
+
+Campus dead spots drop the websocket, and events sent meanwhile used to be
+lost. Check-in and rating buttons therefore go through ``assets/offline.js``,
+which stores each action in the browser's localStorage under a random id
+before anything is sent. Whenever the browser is online it hands all pending
+actions to ``LocationState.sync_offline_actions`` in one event: right after
+a click, when the connection comes back, and on the next page load if the
+tab was closed. The handler applies each action once (ids are claimed in the
+ratings store) and acknowledges the batch, which removes it from the outbox.
+
+``assets/sw.js`` is the matching service worker. It keeps the pages, map
+images, icons and styles available offline, see ``build_offline_cache.py``.
+"""
+
+import json
+import os
+from typing import Any, Literal, TypedDict, cast
+
+from app.states.location_catalog import Rating
+from app.states.rating_stats import parse_rating
+
+# Browser global installed by assets/offline.js
+OFFLINE_JS = "window.polyunapOffline"
+# Hidden element offline.js clicks to send the outbox (see components/offline.py)
+SYNC_TRIGGER_ID = "polyunap-offline-sync"
+PRECACHE_NAME = "precache.json"
+# Actions applied per sync; the rest go in the next one
+MAX_BATCH = 50
+MAX_ACTION_ID_LENGTH = 64
+
+
+class OfflineAction(TypedDict):
+    id: str
+    kind: Literal["check_in", "rating"]
+    location_id: str
+    rating: Rating | None
+
+
+def service_worker_enabled() -> bool:
+    """Whether pages register the service worker; ``POLYUNAP_OFFLINE=0`` turns it off."""
+    return os.environ.get("POLYUNAP_OFFLINE", "") != "0"
+
+
+def action_id(raw: Any) -> str | None:
+    if isinstance(raw, dict) and isinstance(raw.get("id"), str) and 0 < len(raw["id"]) <= MAX_ACTION_ID_LENGTH:
+        return raw["id"]
+    return None
+
+
+def parse_offline_action(raw: Any) -> OfflineAction | None:
+    """The action sent by offline.js, or None if it is malformed."""
+    if (id_ := action_id(raw)) is None or not isinstance(raw.get("location_id"), str):
+        return None
+    if raw.get("kind") == "check_in":
+        return {"id": id_, "kind": "check_in", "location_id": raw["location_id"], "rating": None}
+    rating = parse_rating(raw.get("rating"))
+    if raw.get("kind") != "rating" or rating is None:
+        return None
+    return {"id": id_, "kind": "rating", "location_id": raw["location_id"], "rating": cast(Rating, rating)}
+
+
+def ack_script(action_ids: list[str]) -> str:
+    """Browser code that drops acknowledged actions from the outbox."""
+    return f"{OFFLINE_JS}.ack({json.dumps(action_ids)})"
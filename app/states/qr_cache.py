@@ -0,0 +1,101 @@
+"""Content-addressed cache of rendered QR codes.
+
+Each payload is rendered once to ``<upload dir>/qr/<sha256>.png`` by the
+startup warm-up and served by the backend's static upload route, so state
+only carries the short relative path and the backend never holds the bytes.
+That route replaces the in-memory LRU of encoded images: nothing has to
+stay in memory once the file is on disk.
+"""
+
+import asyncio
+import functools
+import hashlib
+import io
+import os
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import reflex as rx
+
+if TYPE_CHECKING:
+    import qrcode
+
+QR_SUBDIR = "qr"
+QR_FILL_COLOR = "#00ff9f"
+QR_BACK_COLOR = "#0a0a0f"
+
+
+def location_qr_payload(location_id: str) -> str:
+    return f"sleep-scan-repeat://location/{location_id}"
+
+
+def make_qr(data: str, box_size: int = 8) -> "qrcode.QRCode":
+    # Deferred: qrcode pulls in PIL, which only the first render needs
+    import qrcode
+
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=qrcode.constants.ERROR_CORRECT_L,
+        box_size=box_size,
+        border=2,
+    )
+    qr.add_data(data)
+    qr.make(fit=True)
+    return qr
+
+
+def render_qr_png(data: str, box_size: int = 8) -> bytes:
+    img = make_qr(data, box_size).make_image(fill_color=QR_FILL_COLOR, back_color=QR_BACK_COLOR)
+    buffered = io.BytesIO()
+    img.save(buffered, format="PNG")
+    return buffered.getvalue()
+
+
+class QRCodeCache:
+    """Payload-keyed QR PNG files on disk."""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def filename(payload: str) -> str:
+        # Colors are part of the key so a restyle never serves stale images
+        key = f"{QR_FILL_COLOR}|{QR_BACK_COLOR}|{payload}"
+        return hashlib.sha256(key.encode()).hexdigest()[:32] + ".png"
+
+    def relative_path(self, payload: str) -> str:
+        """Path under the upload dir; the PNG is rendered by ``warm``, never here."""
+        return f"{QR_SUBDIR}/{self.filename(payload)}"
+
+    def ensure_png(self, payload: str) -> Path:
+        """Render the PNG to disk unless it is already there."""
+        path = self.directory / self.filename(payload)
+        if not path.exists():
+            # Written under a unique name and renamed, so concurrent renders never expose a partial file
+            tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(render_qr_png(payload))
+            os.replace(tmp_path, path)
+        return path
+
+    def warm(self, payloads) -> int:
+        """Render the PNGs missing on disk; returns how many payloads were checked."""
+        count = 0
+        for payload in payloads:
+            self.ensure_png(payload)
+            count += 1
+        return count
+
+
+@functools.lru_cache(maxsize=None)
+def get_qr_cache() -> QRCodeCache:
+    return QRCodeCache(rx.get_upload_dir() / QR_SUBDIR)
+
+
+async def warm_location_qr_codes():
+    """Render missing location QR codes in a thread, off the startup path."""
+    from app.states.location_state import LOCATIONS
+
+    payloads = [location_qr_payload(loc["id"]) for loc in LOCATIONS]
+    await asyncio.to_thread(get_qr_cache().warm, payloads)
@@ -1,7 +1,11 @@
 import reflex as rx
-from typing import TypedDict, Literal, cast
+from types import MappingProxyType
+from typing import Mapping, TypedDict
 from app.states.user_state import UserState
-from app.states.location_state import LocationState
+from app.states.location_state import ACHIEVEMENT_RULES, LocationState
+from app.states.answer_stats import get_answer_stats
+from app.states.achievement_rules import QUIZ_DONE_EVENT, evaluate_achievements
+from app.states import routes
 import operator
 
 # --- TYPED DICTS (No Changes Needed Here) ---
@@ -27,194 +31,178 @@ class Personality(TypedDict):
     spots: list[str]
 
 
-class QuizState(rx.State):
-    current_page: Literal[
-        "home", "quiz", "results", "locations", "location_detail", "profile", "achievements", "visited_locations"
-    ] = "home"
-    mobile_menu_open: bool = False
-    current_question_index: int = 0
-    answers: list[str] = []
-    # Initialize scores with the four new dimensions
-    scores: dict[str, int] = {"S": 0, "C": 0, "R": 0, "A": 0}
-    quiz_finished: bool = False
-    # The list now contains only 6 questions, all with 4 choices, mixing old and new.
-    questions: list[Question] = [
-        {
-            "id": "q1",
-            "part": "The Nap Environment",
-            "text": "What level of noise is perfect for your nap?",
-            "layout": "grid",
-            "choices": {
-                "A": {
-                    "title": "Silent as a tomb (Noise is the enemy)",
-                    "emoji": "🤫",
-                    "points": {"R": 2},
-                },
-                "B": {
-                    "title": "A low, constant hum (Background chatter is calming)",
-                    "emoji": "☕",
-                    "points": {"S": 2},
-                },
-                "C": {
-                    "title": "Anything goes (I can tune out a marching band)",
-                    "emoji": "🎧",
-                    "points": {"A": 2},
-                },
-                "D": {
-                    "title": "Quiet, but I prefer natural white noise (Rain, fan)",
-                    "emoji": "🍃",
-                    "points": {"C": 1, "R": 1},
-                },
+# The list now contains only 6 questions, all with 4 choices, mixing old and new.
+QUESTIONS: tuple[Question, ...] = (
+    {
+        "id": "q1",
+        "part": "The Nap Environment",
+        "text": "What level of noise is perfect for your nap?",
+        "layout": "grid",
+        "choices": {
+            "A": {
+                "title": "Silent as a tomb (Noise is the enemy)",
+                "emoji": "🤫",
+                "points": {"R": 2},
+            },
+            "B": {
+                "title": "A low, constant hum (Background chatter is calming)",
+                "emoji": "☕",
+                "points": {"S": 2},
+            },
+            "C": {
+                "title": "Anything goes (I can tune out a marching band)",
+                "emoji": "🎧",
+                "points": {"A": 2},
+            },
+            "D": {
+                "title": "Quiet, but I prefer natural white noise (Rain, fan)",
+                "emoji": "🍃",
+                "points": {"C": 1, "R": 1},
             },
         },
-        {
-            "id": "q2",
-            "part": "The Nap Environment",
-            "text": "How do you feel about napping in public view?",
-            "layout": "grid",
-            "choices": {
-                "A": {
-                    "title": "Anxiety-inducing. I need total privacy.",
-                    "emoji": "🥷",
-                    "points": {"C": 2},
-                },
-                "B": {
-                    "title": "Slightly thrilling. The risk is part of the fun.",
-                    "emoji": "😎",
-                    "points": {"S": 2},
-                },
-                "C": {
-                    "title": "It's fine, as long as I'm in a designated spot.",
-                    "emoji": "📜",
-                    "points": {"R": 2},
-                },
-                "D": {
-                    "title": "Don't care. I'll nap right in the middle of a crowd.",
-                    "emoji": "🏙️",
-                    "points": {"A": 2},
-                },
+    },
+    {
+        "id": "q2",
+        "part": "The Nap Environment",
+        "text": "How do you feel about napping in public view?",
+        "layout": "grid",
+        "choices": {
+            "A": {
+                "title": "Anxiety-inducing. I need total privacy.",
+                "emoji": "🥷",
+                "points": {"C": 2},
+            },
+            "B": {
+                "title": "Slightly thrilling. The risk is part of the fun.",
+                "emoji": "😎",
+                "points": {"S": 2},
+            },
+            "C": {
+                "title": "It's fine, as long as I'm in a designated spot.",
+                "emoji": "📜",
+                "points": {"R": 2},
+            },
+            "D": {
+                "title": "Don't care. I'll nap right in the middle of a crowd.",
+                "emoji": "🏙️",
+                "points": {"A": 2},
             },
         },
-        {
-            "id": "q3",
-            "part": "The Nap Surface",
-            "text": "Your ideal nap surface is...",
-            "layout": "grid",
-            "choices": {
-                "A": {
-                    "title": "A plush cloud I can sink into (Ultimate softness)",
-                    "emoji": "☁️",
-                    "points": {"C": 2},
-                },
-                "B": {
-                    "title": "Firm and supportive (Good for posture, not too squishy)",
-                    "emoji": "🪵",
-                    "points": {"R": 1, "A": 1},
-                },
-                "C": {
-                    "title": "Whatever's closest (Back of a chair, desk, floor, etc.)",
-                    "emoji": "🪨",
-                    "points": {"A": 2},
-                },
-                "D": {
-                    "title": "A high vantage point (I like to survey my kingdom)",
-                    "emoji": "🏰",
-                    "points": {"S": 2},
-                },
+    },
+    {
+        "id": "q3",
+        "part": "The Nap Surface",
+        "text": "Your ideal nap surface is...",
+        "layout": "grid",
+        "choices": {
+            "A": {
+                "title": "A plush cloud I can sink into (Ultimate softness)",
+                "emoji": "☁️",
+                "points": {"C": 2},
+            },
+            "B": {
+                "title": "Firm and supportive (Good for posture, not too squishy)",
+                "emoji": "🪵",
+                "points": {"R": 1, "A": 1},
+            },
+            "C": {
+                "title": "Whatever's closest (Back of a chair, desk, floor, etc.)",
+                "emoji": "🪨",
+                "points": {"A": 2},
+            },
+            "D": {
+                "title": "A high vantage point (I like to survey my kingdom)",
+                "emoji": "🏰",
+                "points": {"S": 2},
             },
         },
-        {
-            "id": "q4",
-            "part": "The Nap Surface",
-            "text": "How much 'gear' do you bring to a nap?",
-            "choices": {
-                "A": {
-                    "title": "Everything: Mask, pillow, special blanket, earplugs.",
-                    "emoji": "🎒",
-                    "points": {"C": 1, "R": 2},
-                },
-                "B": {
-                    "title": "Maybe a hoodie/bag for a makeshift pillow.",
-                    "emoji": "🧣",
-                    "points": {"S": 2},
-                },
-                "C": {
-                    "title": "Nothing. I use what's available.",
-                    "emoji": "🤷",
-                    "points": {"A": 2},
-                },
-                "D": {
-                    "title": "Just headphones (Music is my blanket)",
-                    "emoji": "🎧",
-                    "points": {"C": 1, "S": 1},
-                },
+    },
+    {
+        "id": "q4",
+        "part": "The Nap Surface",
+        "text": "How much 'gear' do you bring to a nap?",
+        "choices": {
+            "A": {
+                "title": "Everything: Mask, pillow, special blanket, earplugs.",
+                "emoji": "🎒",
+                "points": {"C": 1, "R": 2},
+            },
+            "B": {
+                "title": "Maybe a hoodie/bag for a makeshift pillow.",
+                "emoji": "🧣",
+                "points": {"S": 2},
+            },
+            "C": {
+                "title": "Nothing. I use what's available.",
+                "emoji": "🤷",
+                "points": {"A": 2},
+            },
+            "D": {
+                "title": "Just headphones (Music is my blanket)",
+                "emoji": "🎧",
+                "points": {"C": 1, "S": 1},
             },
         },
-        {
-            "id": "q5",
-            "part": "The Nap Schedule",
-            "text": "A good nap happens when...",
-            "choices": {
-                "A": {
-                    "title": "It's exactly 2:00 PM (Precision timing is key).",
-                    "emoji": "⏰",
-                    "points": {"R": 2},
-                },
-                "B": {
-                    "title": "I'm suddenly tired and have an unexpected opportunity.",
-                    "emoji": "⚡",
-                    "points": {"S": 2, "A": 1},
-                },
-                "C": {
-                    "title": "I've carved out a comfortable block of at least 60-90 minutes.",
-                    "emoji": "🛌",
-                    "points": {"C": 2},
-                },
-                "D": {
-                    "title": "Whenever I blink for too long (Accidental nap)",
-                    "emoji": "😑",
-                    "points": {"A": 2},
-                },
+    },
+    {
+        "id": "q5",
+        "part": "The Nap Schedule",
+        "text": "A good nap happens when...",
+        "choices": {
+            "A": {
+                "title": "It's exactly 2:00 PM (Precision timing is key).",
+                "emoji": "⏰",
+                "points": {"R": 2},
+            },
+            "B": {
+                "title": "I'm suddenly tired and have an unexpected opportunity.",
+                "emoji": "⚡",
+                "points": {"S": 2, "A": 1},
+            },
+            "C": {
+                "title": "I've carved out a comfortable block of at least 60-90 minutes.",
+                "emoji": "🛌",
+                "points": {"C": 2},
+            },
+            "D": {
+                "title": "Whenever I blink for too long (Accidental nap)",
+                "emoji": "😑",
+                "points": {"A": 2},
             },
         },
-        {
-            "id": "q6",
-            "part": "The Nap Schedule",
-            "text": "If your favorite spot is taken, you...",
-            "layout": "grid",
-            "choices": {
-                "A": {
-                    "title": "Get mad and refuse to nap until tomorrow (Only the best will do).",
-                    "emoji": "😠",
-                    "points": {"R": 2},
-                },
-                "B": {
-                    "title": "Explore until I find a new, novel, or fun place to try.",
-                    "emoji": "🗺️",
-                    "points": {"A": 2, "S": 1},
-                },
-                "C": {
-                    "title": "Find the *next* most comfortable place immediately.",
-                    "emoji": "🛋️",
-                    "points": {"C": 2},
-                },
-                "D": {
-                    "title": "Ask if they want to share (Nap party)",
-                    "emoji": "👯",
-                    "points": {"S": 2},
-                },
+    },
+    {
+        "id": "q6",
+        "part": "The Nap Schedule",
+        "text": "If your favorite spot is taken, you...",
+        "layout": "grid",
+        "choices": {
+            "A": {
+                "title": "Get mad and refuse to nap until tomorrow (Only the best will do).",
+                "emoji": "😠",
+                "points": {"R": 2},
+            },
+            "B": {
+                "title": "Explore until I find a new, novel, or fun place to try.",
+                "emoji": "🗺️",
+                "points": {"A": 2, "S": 1},
+            },
+            "C": {
+                "title": "Find the *next* most comfortable place immediately.",
+                "emoji": "🛋️",
+                "points": {"C": 2},
+            },
+            "D": {
+                "title": "Ask if they want to share (Nap party)",
+                "emoji": "👯",
+                "points": {"S": 2},
             },
         },
-    ]
-    answer_stats: dict[str, dict[str, int]] = {
-        "q1": {"A": 25, "B": 25, "C": 25, "D": 25},
-        "q2": {"A": 25, "B": 25, "C": 25, "D": 25},
-        "q3": {"A": 25, "B": 25, "C": 25, "D": 25},
-        "q4": {"A": 25, "B": 25, "C": 25, "D": 25},
-        "q5": {"A": 25, "B": 25, "C": 25, "D": 25},
-        "q6": {"A": 25, "B": 25, "C": 25, "D": 25},
-    }
-    personalities: dict[str, Personality] = {
+    },
+)
+
+PERSONALITIES: Mapping[str, Personality] = MappingProxyType(
+    {
         "S": {
             "title": "The Thrill Napper",
             "description": "You thrive on the buzz of activity. A low hum of noise, people moving, and the slight risk of being noticed actually helps you drift off. **Your nap is a covert mission.**",
@@ -252,60 +240,60 @@ class QuizState(rx.State):
             "spots": ["Please wait..."],
         },
     }
+)
 
-    @rx.event
-    def set_page(self, page_name: str):
-        self.current_page = cast(
-            Literal[
-                "home", "quiz", "results", "locations", "location_detail", "profile", "achievements", "visited_locations"
-            ],
-            page_name,
-        )
-        self.mobile_menu_open = False
-        if page_name == "quiz":
-            yield QuizState.reset_quiz
+
+class QuizState(rx.State):
+    current_question_index: int = 0
+    answers: list[str] = []
+    # Initialize scores with the four new dimensions
+    scores: dict[str, int] = {"S": 0, "C": 0, "R": 0, "A": 0}
+    quiz_finished: bool = False
 
     @rx.event
     async def handle_answer(self, question_index: int, answer: str):
-        from app.states.user_state import UserState
-        from app.states.location_state import LocationState
-        
+        # Only the question on screen can be answered: a stale or repeated
+        # click, or a choice that does not exist, changes nothing
+        if self.quiz_finished or question_index != self.current_question_index:
+            return
+        question = QUESTIONS[self.current_question_index]
+        if answer not in question["choices"]:
+            return
         self.answers.append(answer)
-        question = self.questions[question_index]
+        get_answer_stats().record(question["id"], answer)
         points_to_add = question["choices"][answer]["points"]
         for dimension, value in points_to_add.items():
             self.scores[dimension] += value
-        if self.current_question_index < len(self.questions) - 1:
+        if self.current_question_index < len(QUESTIONS) - 1:
             self.current_question_index += 1
         else:
             self.quiz_finished = True
             user_state = await self.get_state(UserState)
             location_state = await self.get_state(LocationState)
-            
+
             # Award XP for completing quiz
-            old_level = user_state.level
-            user_state.xp += 250
-            new_level = user_state.level
-            
-            # Check for level up
-            if new_level > old_level:
-                yield user_state.level_up_notification(new_level)
-            
+            for event in user_state._gain_xp(250):
+                yield event
+
             yield rx.toast.success(
                 "🎉 Quiz Complete! +250 XP",
                 duration=3000,
                 position="bottom-right"
             )
-            
-            # Check for nap legend achievement
-            rated_all = len(location_state.ratings) == len(location_state.locations)
-            if rated_all:
-                yield user_state.unlock_achievement("nap-legend")
-            yield QuizState.set_page("results")
 
-    @rx.event
-    def toggle_mobile_menu(self):
-        self.mobile_menu_open = not self.mobile_menu_open
+            # Achievements that complete with the quiz
+            earned = evaluate_achievements(
+                ACHIEVEMENT_RULES,
+                QUIZ_DONE_EVENT,
+                {
+                    "rated_location_ids": location_state._rated_location_ids(),
+                    "quiz_finished": True,
+                },
+                user_state.unlocked_achievements,
+            )
+            for event in user_state._grant_achievements(earned):
+                yield event
+            yield rx.redirect(routes.RESULTS)
 
     @rx.event
     def reset_quiz(self):
@@ -314,20 +302,25 @@ class QuizState(rx.State):
         # Ensure scores are reset for all four dimensions
         self.scores = {"S": 0, "C": 0, "R": 0, "A": 0}
         self.quiz_finished = False
-        self.current_page = "quiz"
+
+    @rx.event
+    def require_finished_quiz(self):
+        """Send players who open the results page early to the quiz"""
+        if not self.quiz_finished:
+            return rx.redirect(routes.QUIZ, replace=True)
 
     @rx.var
     def current_question(self) -> Question | None:
-        if self.current_question_index < len(self.questions):
-            return self.questions[self.current_question_index]
+        if self.current_question_index < len(QUESTIONS):
+            return QUESTIONS[self.current_question_index]
         return None
 
     @rx.var
     def progress_percent(self) -> str:
         # Progress is calculated based on the reduced 6 questions
-        if not self.questions:
+        if not QUESTIONS:
              return "0%"
-        progress = (self.current_question_index / len(self.questions)) * 100
+        progress = (self.current_question_index / len(QUESTIONS)) * 100
         return f"{progress:.0f}%"
 
     @rx.var
@@ -357,8 +350,8 @@ class QuizState(rx.State):
 
     @rx.var
     def personality_details(self) -> Personality:
-        return self.personalities.get(
-            self.personality_type, self.personalities["Default"]
+        return PERSONALITIES.get(
+            self.personality_type, PERSONALITIES["Default"]
         )
 
     @rx.var
@@ -366,13 +359,15 @@ class QuizState(rx.State):
         stats = {}
         if not self.answers:
             return {}
-        for i, question in enumerate(self.questions):
+        snapshot = get_answer_stats().snapshot()
+        for i, question in enumerate(QUESTIONS):
             if i < len(self.answers):
                 user_answer = self.answers[i]
                 question_id = question["id"]
-                # Need to safely access keys for new questions
-                if question_id in self.answer_stats and user_answer in self.answer_stats[question_id]:
-                    stats[question_id] = self.answer_stats[question_id][user_answer]
+                # Crowd percentages from the last flushed snapshot
+                question_stats = snapshot.get(question_id, {})
+                if user_answer in question_stats:
+                    stats[question_id] = question_stats[user_answer]
                 else:
                     # Fallback for questions without detailed stats
                     stats[question_id] = 50 # Default to 50% percentile
@@ -0,0 +1,107 @@
+"""Coalesced push of shared rating aggregates to every watching session.
+
+Rating handlers only mark the rated location dirty. A single lifespan task
+waits for the first mark, keeps collecting for ``window`` seconds, then reads
+each dirty aggregate once and applies the whole batch to every session that
+is looking at the locations or detail pages. A lunchtime burst of ratings
+therefore costs one delta per watching client per window.
+
+Ratings submitted on other backend workers reach this process through the
+shared store: every ``poll_interval`` the task asks the store to reload
+aggregates that another worker has committed, and the changed ones join the
+next batch.
+"""
+
+import asyncio
+import contextlib
+import functools
+
+import reflex as rx
+from reflex.utils import console
+
+from app.states.rating_stats import FrozenHistograms
+from app.states.ratings_store import get_ratings_store
+
+AggregateDelta = dict[str, FrozenHistograms]
+
+
+class RatingBroadcaster:
+    """Process-wide set of watching client tokens and dirty location ids."""
+
+    def __init__(self, window: float = 0.5, poll_interval: float = 1.0):
+        self.window = window
+        self.poll_interval = poll_interval
+        self._watchers: set[str] = set()
+        self._dirty: set[str] = set()
+        self._wake: asyncio.Event | None = None
+
+    def watch(self, client_token: str, watching: bool = True):
+        if watching:
+            self._watchers.add(client_token)
+        else:
+            self._watchers.discard(client_token)
+
+    def publish(self, location_id: str):
+        """Mark a location's aggregate as changed; it goes out with the next batch."""
+        self._dirty.add(location_id)
+        if self._wake is not None:
+            self._wake.set()
+
+    def take_delta(self) -> AggregateDelta:
+        dirty, self._dirty = self._dirty, set()
+        store = get_ratings_store()
+        delta = {location_id: store.location_aggregate(location_id) for location_id in dirty}
+        return {location_id: histograms for location_id, histograms in delta.items() if histograms}
+
+    async def run(self, reflex_app: rx.App):
+        self._wake = asyncio.Event()
+        store = get_ratings_store()
+        while True:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+            if self._wake.is_set():
+                await asyncio.sleep(self.window)
+                self._wake.clear()
+            try:
+                await asyncio.to_thread(store.refresh)
+                self._dirty |= store.take_changed()
+                delta = self.take_delta()
+                if delta:
+                    await self.broadcast(reflex_app, delta)
+            except Exception as error:
+                # One bad round must not stop live updates for every session
+                console.error(f"Rating broadcast failed: {error!r}")
+
+    async def broadcast(self, reflex_app: rx.App, delta: AggregateDelta):
+        from app.states.location_state import LocationState
+
+        # Forget tabs that have disconnected since they started watching
+        connected = reflex_app.event_namespace.token_to_sid if reflex_app.event_namespace else {}
+        self._watchers.intersection_update(connected)
+
+        async def push(client_token: str):
+            async with reflex_app.modify_state(
+                f"{client_token}_{LocationState.get_full_name()}"
+            ) as root_state:
+                location_state = await root_state.get_state(LocationState)
+                location_state._apply_rating_aggregates(delta)
+
+        tokens = tuple(self._watchers)
+        results = await asyncio.gather(*(push(token) for token in tokens), return_exceptions=True)
+        failed = {token: result for token, result in zip(tokens, results) if isinstance(result, Exception)}
+        if failed:
+            # Such a tab is picked up again by its next on_load
+            self._watchers.difference_update(failed)
+            console.error(
+                f"Rating broadcast failed for {len(failed)} of {len(tokens)} sessions: {next(iter(failed.values()))!r}"
+            )
+
+
+@functools.lru_cache(maxsize=None)
+def get_rating_broadcaster() -> RatingBroadcaster:
+    return RatingBroadcaster()
+
+
+async def broadcast_rating_aggregates(reflex_app: rx.App):
+    """Lifespan task pushing batched aggregate deltas to watching sessions."""
+    await get_rating_broadcaster().run(reflex_app)
@@ -0,0 +1,83 @@
+"""Helpers for 1-5 star rating histograms.
+
+A histogram is a list of five counters where index ``i`` holds how many
+ratings gave ``i + 1`` stars, so every statistic below is O(1) in the number
+of ratings submitted.
+"""
+
+from typing import Any
+
+RATING_DIMENSIONS: tuple[str, ...] = (
+    "comfort",
+    "quietness",
+    "accessibility",
+    "vibe_check",
+    "danger",
+)
+
+STAR_VALUES: tuple[int, ...] = (1, 2, 3, 4, 5)
+# Where every slider starts on a new rating
+DEFAULT_STARS = 3
+
+# Read-only per-dimension histograms, in RATING_DIMENSIONS order
+FrozenHistograms = tuple[tuple[int, ...], ...]
+
+
+def parse_rating(raw: Any) -> dict[str, int] | None:
+    """A rating sent by the browser, or None unless every dimension has 1-5 stars."""
+    if not isinstance(raw, dict):
+        return None
+    values = [raw.get(dimension) for dimension in RATING_DIMENSIONS]
+    # bool is an int subclass, but never a star count
+    if not all(type(value) is int and 1 <= value <= 5 for value in values):
+        return None
+    return dict(zip(RATING_DIMENSIONS, values))
+
+
+def empty_histogram() -> list[int]:
+    """Return a fresh histogram with no ratings."""
+    return [0, 0, 0, 0, 0]
+
+
+def empty_histograms() -> dict[str, list[int]]:
+    """Return one empty histogram per rating dimension."""
+    return {dimension: empty_histogram() for dimension in RATING_DIMENSIONS}
+
+
+def add_to_histograms(histograms: dict[str, list[int]], rating: dict[str, int]) -> None:
+    """Count a single rating into per-dimension histograms in place."""
+    for dimension in RATING_DIMENSIONS:
+        stars = min(max(int(rating[dimension]), 1), 5)
+        histograms[dimension][stars - 1] += 1
+
+
+def freeze_histograms(histograms: dict[str, list[int]]) -> FrozenHistograms:
+    """Immutable snapshot of per-dimension histograms, safe to share between sessions."""
+    return tuple(tuple(histograms[dimension]) for dimension in RATING_DIMENSIONS)
+
+
+def merge_histograms(histograms: dict[str, list[int]], delta: dict[str, list[int]]) -> dict[str, list[int]]:
+    """Per-dimension sum of two sets of histograms."""
+    return {
+        dimension: [count + added for count, added in zip(histograms[dimension], delta[dimension])]
+        for dimension in RATING_DIMENSIONS
+    }
+
+
+def histogram_mean(histogram: list[int]) -> float:
+    total = sum(histogram)
+    if not total:
+        return 0.0
+    return sum(stars * count for stars, count in zip(STAR_VALUES, histogram)) / total
+
+
+def histogram_percentages(histogram: list[int]) -> list[int]:
+    """Share of ratings per star value, as whole percentages for bar widths."""
+    total = sum(histogram)
+    if not total:
+        return [0, 0, 0, 0, 0]
+    return [round(count * 100 / total) for count in histogram]
+
+
+def is_s_rank(rating: dict[str, int]) -> bool:
+    return all(rating[dimension] == 5 for dimension in RATING_DIMENSIONS)
@@ -0,0 +1,453 @@
+"""Durable ratings, check-in and quiz answer store shared by every session.
+
+Ratings and check-ins are written to SQLite (WAL mode) in batches by a
+background flusher. Alongside the raw rows the store maintains one
+``location_aggregates`` row per spot holding its star histograms, so readers
+never replay rating history.
+
+Several backend workers can share one database file. Each flush is a
+``BEGIN IMMEDIATE`` transaction, and ``refresh`` reloads the aggregates when
+``PRAGMA data_version`` shows that another process has committed.
+"""
+
+import atexit
+import functools
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from reflex.utils import console
+
+from app.states.rating_stats import (
+    RATING_DIMENSIONS,
+    FrozenHistograms,
+    add_to_histograms,
+    empty_histograms,
+    freeze_histograms,
+    merge_histograms,
+)
+
+DEFAULT_DB_PATH = "polyunap.db"
+# Seconds to wait for another worker's write transaction to finish
+BUSY_TIMEOUT = 10.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ratings (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    player_id TEXT NOT NULL,
+    location_id TEXT NOT NULL,
+    comfort INTEGER NOT NULL,
+    quietness INTEGER NOT NULL,
+    accessibility INTEGER NOT NULL,
+    vibe_check INTEGER NOT NULL,
+    danger INTEGER NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ratings_by_player ON ratings (player_id);
+CREATE TABLE IF NOT EXISTS check_ins (
+    player_id TEXT NOT NULL,
+    location_id TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (player_id, location_id)
+);
+CREATE TABLE IF NOT EXISTS location_aggregates (
+    location_id TEXT PRIMARY KEY,
+    rating_count INTEGER NOT NULL,
+    histograms TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS quiz_answer_counts (
+    question_id TEXT NOT NULL,
+    choice TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (question_id, choice)
+);
+CREATE TABLE IF NOT EXISTS players (
+    player_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    xp INTEGER NOT NULL,
+    updated_seq INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS players_by_seq ON players (updated_seq);
+CREATE TABLE IF NOT EXISTS player_achievements (
+    player_id TEXT NOT NULL,
+    achievement_id TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (player_id, achievement_id)
+);
+CREATE TABLE IF NOT EXISTS synced_actions (
+    player_id TEXT NOT NULL,
+    action_id TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (player_id, action_id)
+);
+"""
+
+
+class RatingsStore:
+    """SQLite-backed store with an in-memory copy of the per-location aggregates."""
+
+    def __init__(self, path: str, flush_interval: float = 0.5, batch_size: int = 64):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+
+        self._conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._db_lock = threading.Lock()
+
+        self._lock = threading.Lock()
+        self._pending_ratings: list[tuple] = []
+        self._pending_check_ins: list[tuple] = []
+        self._pending_aggregates: dict[str, dict[str, list[int]]] = {}
+        self._pending_players: dict[str, tuple[str, int]] = {}
+        self._pending_achievements: list[tuple] = []
+        # Locations whose aggregate was changed by another process, see take_changed
+        self._changed: set[str] = set()
+        with self._db_lock:
+            self._data_version = self._read_data_version()
+            self._aggregates = self._load_aggregates()
+
+        self._wake = threading.Event()
+        self._flusher: threading.Thread | None = None
+
+    def _read_data_version(self) -> int:
+        # Changes whenever another connection commits; our own commits leave it alone
+        return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _load_aggregates(self) -> dict[str, dict[str, list[int]]]:
+        rows = self._conn.execute(
+            "SELECT location_id, histograms FROM location_aggregates"
+        ).fetchall()
+        return {location_id: json.loads(histograms) for location_id, histograms in rows}
+
+    def _reload_aggregates(self):
+        """Stored aggregates plus this process's unflushed deltas; caller holds ``_db_lock``."""
+        stored = self._load_aggregates()
+        with self._lock:
+            for location_id, delta in self._pending_aggregates.items():
+                stored[location_id] = merge_histograms(stored.get(location_id, empty_histograms()), delta)
+            self._changed.update(
+                location_id
+                for location_id in stored.keys() | self._aggregates.keys()
+                if stored.get(location_id) != self._aggregates.get(location_id)
+            )
+            self._aggregates = stored
+
+    def _ensure_flusher(self):
+        if self._flusher is not None:
+            return
+        # Two threads queueing the first write must not both start a flusher
+        with self._lock:
+            if self._flusher is None:
+                self._flusher = threading.Thread(
+                    target=self._flush_loop, name="ratings-store-flusher", daemon=True
+                )
+                self._flusher.start()
+
+    def _flush_loop(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as error:
+                # The batch is back in the queue; keep the thread for the next attempt
+                console.error(f"Ratings store flush failed, retrying: {error!r}")
+
+    def record_rating(self, player_id: str, location_id: str, rating: dict[str, int]):
+        """Queue a rating and fold it into the in-memory aggregates immediately."""
+        row = (
+            player_id,
+            location_id,
+            *(int(rating[dimension]) for dimension in RATING_DIMENSIONS),
+            time.time(),
+        )
+        with self._lock:
+            self._pending_ratings.append(row)
+            for histograms in (self._aggregates, self._pending_aggregates):
+                if location_id not in histograms:
+                    histograms[location_id] = empty_histograms()
+                add_to_histograms(histograms[location_id], rating)
+            queued = len(self._pending_ratings) + len(self._pending_check_ins)
+        self._ensure_flusher()
+        if queued >= self.batch_size:
+            self._wake.set()
+
+    def record_check_in(self, player_id: str, location_id: str):
+        with self._lock:
+            self._pending_check_ins.append((player_id, location_id, time.time()))
+            queued = len(self._pending_ratings) + len(self._pending_check_ins)
+        self._ensure_flusher()
+        if queued >= self.batch_size:
+            self._wake.set()
+
+    def record_player(self, player_id: str, name: str, xp: int):
+        """Queue a leaderboard entry; XP only ever goes up, an empty name keeps the old one."""
+        with self._lock:
+            if player_id in self._pending_players:
+                pending_name, pending_xp = self._pending_players[player_id]
+                name, xp = name or pending_name, max(xp, pending_xp)
+            self._pending_players[player_id] = (name, xp)
+        self._ensure_flusher()
+
+    def record_achievements(self, player_id: str, achievement_ids: list[str]):
+        created_at = time.time()
+        with self._lock:
+            self._pending_achievements.extend(
+                (player_id, achievement_id, created_at) for achievement_id in achievement_ids
+            )
+        self._ensure_flusher()
+
+    def claim_actions(
+        self, player_id: str, actions: list[tuple[str, str, dict[str, int] | None]]
+    ) -> set[str]:
+        """Apply offline actions that were not synced before; returns their ids.
+
+        Each action is ``(action_id, location_id, rating)``, with no rating for
+        a check-in and no location for one that only needs acknowledging. The
+        rows are written in the transaction that marks the ids as synced, so an
+        acknowledged action is never lost, and two tabs or workers replaying
+        the same batch cannot both apply it.
+        """
+        if not actions:
+            return set()
+        created_at = time.time()
+        with self._db_lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            claimed = [
+                (action_id, location_id, rating)
+                for action_id, location_id, rating in actions
+                if self._conn.execute(
+                    "INSERT OR IGNORE INTO synced_actions (player_id, action_id, created_at) VALUES (?, ?, ?)",
+                    (player_id, action_id, created_at),
+                ).rowcount
+            ]
+            ratings = []
+            check_ins = []
+            deltas: dict[str, dict[str, list[int]]] = {}
+            for _, location_id, rating in claimed:
+                if not location_id:
+                    continue
+                if rating is None:
+                    check_ins.append((player_id, location_id, created_at))
+                    continue
+                ratings.append(
+                    (player_id, location_id, *(int(rating[dimension]) for dimension in RATING_DIMENSIONS), created_at)
+                )
+                add_to_histograms(deltas.setdefault(location_id, empty_histograms()), rating)
+            self._write(ratings, check_ins, deltas, {}, [])
+        return {action_id for action_id, _, _ in claimed}
+
+    def flush(self):
+        """Write every queued row and aggregate delta in a single transaction.
+
+        If the transaction fails, the batch goes back in the queue and the
+        error is raised.
+        """
+        with self._db_lock:
+            # Taken under the database lock, so a refresh always finds the
+            # batch either in the queue or in the database
+            with self._lock:
+                ratings, self._pending_ratings = self._pending_ratings, []
+                check_ins, self._pending_check_ins = self._pending_check_ins, []
+                deltas, self._pending_aggregates = self._pending_aggregates, {}
+                players, self._pending_players = self._pending_players, {}
+                achievements, self._pending_achievements = self._pending_achievements, []
+            if not (ratings or check_ins or players or achievements):
+                return
+            try:
+                with self._conn:
+                    # Take the write lock up front so the aggregate read-modify-write
+                    # cannot interleave with another worker's flush
+                    self._conn.execute("BEGIN IMMEDIATE")
+                    self._write(ratings, check_ins, deltas, players, achievements)
+            except Exception:
+                self._requeue(ratings, check_ins, deltas, players, achievements)
+                raise
+
+    def _write(
+        self,
+        ratings: list[tuple],
+        check_ins: list[tuple],
+        deltas: dict[str, dict[str, list[int]]],
+        players: dict[str, tuple[str, int]],
+        achievements: list[tuple],
+    ):
+        """Write one batch inside a ``BEGIN IMMEDIATE`` transaction; caller holds ``_db_lock`` and commits."""
+        self._conn.executemany(
+            "INSERT INTO ratings (player_id, location_id, comfort, quietness, "
+            "accessibility, vibe_check, danger, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            ratings,
+        )
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO check_ins (player_id, location_id, created_at) "
+            "VALUES (?, ?, ?)",
+            check_ins,
+        )
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO player_achievements (player_id, achievement_id, created_at) "
+            "VALUES (?, ?, ?)",
+            achievements,
+        )
+        for location_id, delta in deltas.items():
+            row = self._conn.execute(
+                "SELECT histograms FROM location_aggregates WHERE location_id = ?",
+                (location_id,),
+            ).fetchone()
+            histograms = merge_histograms(json.loads(row[0]) if row else empty_histograms(), delta)
+            self._conn.execute(
+                "INSERT INTO location_aggregates (location_id, rating_count, histograms) "
+                "VALUES (?, ?, ?) ON CONFLICT (location_id) DO UPDATE SET "
+                "rating_count = excluded.rating_count, histograms = excluded.histograms",
+                (location_id, sum(histograms[RATING_DIMENSIONS[0]]), json.dumps(histograms)),
+            )
+        if players:
+            # One sequence number per flush, so readers can ask for rows since the last one they saw
+            (seq,) = self._conn.execute("SELECT COALESCE(MAX(updated_seq), 0) + 1 FROM players").fetchone()
+            self._conn.executemany(
+                "INSERT INTO players (player_id, name, xp, updated_seq) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (player_id) DO UPDATE SET "
+                "name = COALESCE(NULLIF(excluded.name, ''), players.name), "
+                "xp = MAX(players.xp, excluded.xp), updated_seq = excluded.updated_seq",
+                [(player_id, name, xp, seq) for player_id, (name, xp) in players.items()],
+            )
+        if deltas:
+            # Nobody else can commit inside this transaction, so the
+            # reload and the version read see the same database
+            self._data_version = self._read_data_version()
+            self._reload_aggregates()
+
+    def _requeue(
+        self,
+        ratings: list[tuple],
+        check_ins: list[tuple],
+        deltas: dict[str, dict[str, list[int]]],
+        players: dict[str, tuple[str, int]],
+        achievements: list[tuple],
+    ):
+        """Put a batch that failed to commit back in front of what was queued since."""
+        with self._lock:
+            self._pending_ratings[:0] = ratings
+            self._pending_check_ins[:0] = check_ins
+            self._pending_achievements[:0] = achievements
+            for location_id, delta in deltas.items():
+                queued = self._pending_aggregates.get(location_id)
+                self._pending_aggregates[location_id] = merge_histograms(delta, queued) if queued else delta
+            for player_id, (name, xp) in players.items():
+                if player_id in self._pending_players:
+                    queued_name, queued_xp = self._pending_players[player_id]
+                    name, xp = queued_name or name, max(xp, queued_xp)
+                self._pending_players[player_id] = (name, xp)
+
+    def refresh(self):
+        """Reload the aggregates if another process has committed since the last look."""
+        with self._db_lock:
+            version = self._read_data_version()
+            if version == self._data_version:
+                return
+            self._data_version = version
+            self._reload_aggregates()
+
+    def take_changed(self) -> set[str]:
+        """Locations whose aggregate another process changed since the last call."""
+        with self._lock:
+            changed, self._changed = self._changed, set()
+        return changed
+
+    def data_version(self) -> int:
+        with self._db_lock:
+            return self._read_data_version()
+
+    def location_aggregates(self) -> dict[str, FrozenHistograms]:
+        """Snapshot of the star histograms for every rated location."""
+        with self._lock:
+            return {
+                location_id: freeze_histograms(histograms)
+                for location_id, histograms in self._aggregates.items()
+            }
+
+    def location_aggregate(self, location_id: str) -> FrozenHistograms | None:
+        with self._lock:
+            histograms = self._aggregates.get(location_id)
+            if histograms is None:
+                return None
+            return freeze_histograms(histograms)
+
+    def player_ratings(self, player_id: str) -> list[tuple[str, dict[str, int]]]:
+        """All ratings submitted by one player, oldest first."""
+        self.flush()
+        with self._db_lock:
+            rows = self._conn.execute(
+                "SELECT location_id, comfort, quietness, accessibility, vibe_check, danger "
+                "FROM ratings WHERE player_id = ? ORDER BY id",
+                (player_id,),
+            ).fetchall()
+        return [(row[0], dict(zip(RATING_DIMENSIONS, row[1:]))) for row in rows]
+
+    def player_check_ins(self, player_id: str) -> set[str]:
+        self.flush()
+        with self._db_lock:
+            rows = self._conn.execute(
+                "SELECT location_id FROM check_ins WHERE player_id = ?", (player_id,)
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def player_profile(self, player_id: str) -> tuple[str, int, set[str]]:
+        """Gamertag, XP and unlocked achievements of one player; empty for a new player."""
+        self.flush()
+        with self._db_lock:
+            row = self._conn.execute("SELECT name, xp FROM players WHERE player_id = ?", (player_id,)).fetchone()
+            achievements = self._conn.execute(
+                "SELECT achievement_id FROM player_achievements WHERE player_id = ?", (player_id,)
+            ).fetchall()
+        name, xp = row or ("", 0)
+        return name, xp, {achievement[0] for achievement in achievements}
+
+    def add_answer_counts(self, counts: dict[tuple[str, str], int]):
+        """Add a batch of quiz answer tallies in a single transaction."""
+        if not counts:
+            return
+        with self._db_lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO quiz_answer_counts (question_id, choice, count) VALUES (?, ?, ?) "
+                "ON CONFLICT (question_id, choice) DO UPDATE SET count = count + excluded.count",
+                [(question_id, choice, count) for (question_id, choice), count in counts.items()],
+            )
+
+    def players_since(self, seq: int) -> tuple[list[tuple[str, str, int]], int]:
+        """(player_id, name, xp) rows written after sequence ``seq``, and the latest sequence."""
+        with self._db_lock:
+            rows = self._conn.execute(
+                "SELECT player_id, name, xp, updated_seq FROM players "
+                "WHERE updated_seq > ? ORDER BY updated_seq",
+                (seq,),
+            ).fetchall()
+        return [row[:3] for row in rows], (rows[-1][3] if rows else seq)
+
+    def answer_counts(self) -> dict[str, dict[str, int]]:
+        with self._db_lock:
+            rows = self._conn.execute(
+                "SELECT question_id, choice, count FROM quiz_answer_counts"
+            ).fetchall()
+        counts: dict[str, dict[str, int]] = {}
+        for question_id, choice, count in rows:
+            counts.setdefault(question_id, {})[choice] = count
+        return counts
+
+    def close(self):
+        self.flush()
+        with self._db_lock:
+            self._conn.close()
+
+
+@functools.lru_cache(maxsize=None)
+def get_ratings_store() -> RatingsStore:
+    """Process-wide store, opened on first use at ``$POLYUNAP_DB``."""
+    store = RatingsStore(os.environ.get("POLYUNAP_DB", DEFAULT_DB_PATH))
+    atexit.register(store.flush)
+    return store
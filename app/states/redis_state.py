@@ -0,0 +1,141 @@
+"""Redis-backed state manager, for running the backend with shared state.
+
+The mode is chosen by ``polyunap_redis_url`` in ``rxconfig.py``, which reads
+``POLYUNAP_REDIS_URL`` (Reflex's own ``REFLEX_REDIS_URL`` also works). With a
+URL set, every session's LocationState, QuizState, UserState and MapState is
+kept in Redis instead of process memory, so it survives restarts and can be
+shared by several backend workers. ``memory://`` uses an in-process fake
+that speaks the same protocol, for local runs without a redis-server. It
+needs the optional ``fakeredis`` package, which is not in requirements.txt.
+
+Each backend worker is a separate process, so running more than one
+(``GRANIAN_WORKERS``) requires a real Redis server. Reflex takes one lock per
+client token for the whole event, covering every substate a handler reaches
+with ``get_state``, so cross-state handlers stay serialized per tab whichever
+worker runs them.
+
+Compared to Reflex's stock ``StateManagerRedis``, connections come from a
+bounded blocking pool, and ``set_state`` writes all touched substates in a
+single pipeline after one lock check, instead of one lock check and one SET
+round trip per substate. Reads were already pipelined upstream.
+"""
+
+import os
+
+import reflex as rx
+from redis.asyncio import BlockingConnectionPool, Redis
+from redis.exceptions import RedisError
+from reflex.config import get_config
+from reflex.istate.manager.redis import StateManagerRedis
+from reflex.state import BaseState, _split_substate_key, _substate_key
+from reflex.utils import console, prerequisites
+from reflex.utils.exceptions import LockExpiredError
+
+FAKE_REDIS_URL = "memory://"
+DEFAULT_MAX_CONNECTIONS = 50
+# Seconds an event waits for a free pooled connection before failing
+DEFAULT_POOL_TIMEOUT = 20.0
+
+
+def backend_workers() -> int:
+    """Worker processes the production backend runs, as passed to granian."""
+    return int(os.environ.get("GRANIAN_WORKERS", "1"))
+
+
+def redis_url() -> str | None:
+    """The Redis URL to keep state in, or None to keep it in memory."""
+    return getattr(get_config(), "polyunap_redis_url", "") or prerequisites.parse_redis_url()
+
+
+def create_redis_client(url: str) -> Redis:
+    if url == FAKE_REDIS_URL:
+        # Optional dev dependency, only needed for the in-process stand-in
+        try:
+            from fakeredis import FakeAsyncRedis
+        except ImportError:
+            raise ImportError(f"{FAKE_REDIS_URL} state needs fakeredis: pip install fakeredis") from None
+
+        return FakeAsyncRedis()
+    pool = BlockingConnectionPool.from_url(
+        url,
+        max_connections=int(os.environ.get("POLYUNAP_REDIS_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS)),
+        timeout=DEFAULT_POOL_TIMEOUT,
+        retry_on_error=[RedisError],
+    )
+    return Redis(connection_pool=pool)
+
+
+def _touched_states(state: BaseState) -> list[BaseState]:
+    touched = [state] if state._get_was_touched() else []
+    for substate in state.substates.values():
+        touched += _touched_states(substate)
+    return touched
+
+
+class PipelinedStateManagerRedis(StateManagerRedis):
+    async def _check_lock(self, token: str, lock_id: bytes, event_name: str | None):
+        lock_key = self._lock_key(token)
+        async with self.redis.pipeline(transaction=False) as pipe:
+            holder, ttl = await pipe.get(lock_key).ttl(lock_key).execute()
+        suffix = f" Happened in event: {event_name}" if event_name else ""
+        if holder != lock_id:
+            raise LockExpiredError(
+                f"Lock expired for token {token} while processing. Consider increasing "
+                f"REFLEX_REDIS_LOCK_EXPIRATION (currently {self.lock_expiration} ms) "
+                "or use `@rx.event(background=True)` for long-running tasks." + suffix
+            )
+        time_taken = self.lock_expiration / 1000 - ttl
+        if time_taken > self.lock_warning_threshold / 1000:
+            console.warn(
+                f"Lock for token {token} was held too long {time_taken=}s, "
+                "use `@rx.event(background=True)` for long-running tasks." + suffix,
+                dedupe=True,
+            )
+
+    async def set_state(self, token: str, state: BaseState, *, lock_id: bytes | None = None, **context):
+        """Write every touched substate of ``state`` in one pipeline."""
+        client_token, substate_name = _split_substate_key(token)
+        if state.parent_state is not None and state.get_full_name() != substate_name:
+            raise RuntimeError(
+                f"Cannot `set_state` with mismatching token {token} and substate {state.get_full_name()}."
+            )
+        if lock_id is not None:
+            event = context.get("event")
+            await self._check_lock(token, lock_id, event.name if event is not None else None)
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for substate in _touched_states(state):
+                # Parents and substates are excluded from each pickle
+                if pickled := substate._serialize():
+                    pipe.set(_substate_key(client_token, substate), pickled, ex=self.token_expiration)
+            if len(pipe):
+                await pipe.execute()
+
+
+def create_state_manager(state: type[BaseState]) -> PipelinedStateManagerRedis | None:
+    """A Redis state manager for ``state`` when a Redis URL is configured."""
+    url = redis_url()
+    if (workers := backend_workers()) > 1 and url in (None, FAKE_REDIS_URL):
+        raise ValueError(
+            f"{workers} backend workers cannot share in-process state; "
+            "set POLYUNAP_REDIS_URL to a redis:// URL or run a single worker"
+        )
+    if url is None:
+        return None
+    config = get_config()
+    return PipelinedStateManagerRedis(
+        state=state,
+        redis=create_redis_client(url),
+        token_expiration=config.redis_token_expiration,
+        lock_expiration=config.redis_lock_expiration,
+        lock_warning_threshold=config.redis_lock_warning_threshold,
+    )
+
+
+def install_state_manager(app: rx.App):
+    """Replace the app's stock state manager when a Redis URL is configured."""
+    if (state_manager := create_state_manager(app._state)) is not None:
+        # Reflex has no public hook for a custom state manager. App._state and
+        # App._state_manager were checked against reflex 0.8.17 (pinned in
+        # requirements.txt); recheck them when upgrading.
+        app._state_manager = state_manager
@@ -0,0 +1,35 @@
+"""URL of every page.
+
+Each page is its own route, so moving between pages is a client-side
+navigation (``rx.redirect``); the work a page needs on the server runs in its
+``on_load`` handlers, registered in ``app/app.py``.
+"""
+
+import reflex as rx
+
+HOME = "/"
+QUIZ = "/quiz"
+RESULTS = "/results"
+LOCATIONS = "/locations"
+LOCATION_DETAIL = f"{LOCATIONS}/[location_id]"
+PROFILE = "/profile"
+ACHIEVEMENTS = "/achievements"
+VISITED_LOCATIONS = "/visited"
+LEADERBOARD = "/leaderboard"
+
+
+def location_route(location_id: str | rx.Var) -> str:
+    """Detail page URL of a location; works on plain ids and on vars."""
+    return f"{LOCATIONS}/{location_id}"
+
+
+def location_id_from_path(path: str) -> str:
+    """``/locations/the-shade-throne`` -> ``the-shade-throne``; "" for other paths."""
+    prefix, _, location_id = path.rstrip("/").rpartition("/")
+    return location_id if prefix == LOCATIONS else ""
+
+
+def shows_ratings(path: str) -> bool:
+    """Whether the page at ``path`` shows shared rating aggregates."""
+    path = path.rstrip("/")
+    return path == LOCATIONS or path.startswith(f"{LOCATIONS}/")
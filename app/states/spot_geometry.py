@@ -0,0 +1,105 @@
+"""Single registry of where every nap spot sits on the maps.
+
+Positions are percentages of the map image the spot is drawn on: the floor
+plan of its building and floor, or the campus map for outdoor spots. Every
+index below is built once at import, so map and detail-page lookups are
+constant time. ``SPOT_PREVIEWS`` holds the local photo of each spot, shown
+on the detail page in place of its 3D scan until the scan is requested.
+"""
+
+from types import MappingProxyType
+from typing import Mapping, TypedDict
+
+CAMPUS_MAP_IMAGE = "/map images/POLYU MAP.png"
+OUTDOOR = "outdoor"
+FloorKey = tuple[str, str]
+
+
+class Building(TypedDict):
+    name: str
+    floors: tuple[str, ...]
+    # Position of the building icon on the campus map
+    x: str
+    y: str
+
+
+class FloorMap(TypedDict):
+    name: str
+    image: str
+
+
+class SpotGeometry(TypedDict):
+    building: str
+    floor: str
+    icon: str
+    x: str
+    y: str
+
+
+BUILDINGS: Mapping[str, Building] = MappingProxyType({
+    "library": {"name": "Pao Yue-kong Library", "floors": ("G",), "x": "47%", "y": "76%"},
+    "jcit": {"name": "Jockey Club Innovation Tower", "floors": ("11", "P"), "x": "48%", "y": "28%"},
+})
+
+FLOOR_MAPS: Mapping[FloorKey, FloorMap] = MappingProxyType({
+    ("library", "G"): {"name": "Ground Floor", "image": "/map images/Pao Yue-kong Library G Floor.png"},
+    ("library", "1"): {"name": "1st Floor", "image": "/map images/Pao Yue-kong Library floor 1.png"},
+    ("jcit", "P"): {"name": "P Floor", "image": "/map images/Jockey Club Innovation Tower P.png"},
+    ("jcit", "11"): {"name": "11th Floor", "image": "/map images/Jockey Club Innovation Tower 11F.png"},
+    (OUTDOOR, OUTDOOR): {"name": "Campus", "image": CAMPUS_MAP_IMAGE},
+})
+
+SPOT_GEOMETRY: Mapping[str, SpotGeometry] = MappingProxyType({
+    "cloud-nine-credit": {"building": "library", "floor": "G", "icon": "far", "x": "30%", "y": "18%"},
+    "the-spynap-alley": {"building": "library", "floor": "G", "icon": "middle", "x": "7%", "y": "18%"},
+    "the-public-isolation": {"building": "library", "floor": "G", "icon": "close", "x": "42%", "y": "64%"},
+    "the-urban-zen": {"building": OUTDOOR, "floor": OUTDOOR, "icon": "middle", "x": "60%", "y": "59%"},
+    "the-shade-throne": {"building": OUTDOOR, "floor": OUTDOOR, "icon": "close", "x": "58%", "y": "51%"},
+    "the-stonecold-zen": {"building": OUTDOOR, "floor": OUTDOOR, "icon": "far", "x": "57%", "y": "62%"},
+    "the-bobafueled-snooze": {"building": "jcit", "floor": "P", "icon": "close", "x": "68%", "y": "33%"},
+    "the-stairwell-stealth": {"building": "jcit", "floor": "11", "icon": "far", "x": "43%", "y": "35%"},
+    "the-curtaincall-nap": {"building": "jcit", "floor": "11", "icon": "middle", "x": "63%", "y": "55%"},
+    "the-modular-dream": {"building": "jcit", "floor": "11", "icon": "middle", "x": "54%", "y": "75%"},
+})
+
+
+SPOT_PREVIEWS: Mapping[str, str] = MappingProxyType({
+    "cloud-nine-credit": "/map images/Library/Study space on the G floor of the library-Cloud Nine Credit Charge.png",
+    "the-spynap-alley": "/map images/Library/The corridor of bookshelves on the G floor of the library-The Spy-Nap Alley.png",
+    "the-public-isolation": "/map images/Library/Sofa on the G floor of the library-The Public Isolation Island.png",
+    "the-urban-zen": "/map images/Main map/Outdoor wooden chair-The Urban Zen Bench.png",
+    "the-shade-throne": "/map images/Main map/Outdoor dining chair-The Shade Throne.png",
+    "the-stonecold-zen": "/map images/Main map/Outdoor stone chair-The Stone-Cold Zen Zone.png",
+    "the-bobafueled-snooze": "/map images/Design building/Jockey Club Innovation Tower-milktea.png",
+    "the-stairwell-stealth": "/map images/Design building/JCIT Stairwell-The Stairwell Stealth Suite.png",
+    "the-curtaincall-nap": "/map images/Design building/JCIT Study Room Partition Area-The Curtain-Call Nap Studio.png",
+    "the-modular-dream": "/map images/Design building/JCIT Study Room Sofa-The Modular Dream Fort.png",
+})
+
+
+def _spot_ids_by_floor() -> Mapping[FloorKey, tuple[str, ...]]:
+    floors: dict[FloorKey, list[str]] = {}
+    for spot_id, spot in SPOT_GEOMETRY.items():
+        floors.setdefault((spot["building"], spot["floor"]), []).append(spot_id)
+    return MappingProxyType({key: tuple(ids) for key, ids in floors.items()})
+
+
+SPOT_IDS_BY_FLOOR: Mapping[FloorKey, tuple[str, ...]] = _spot_ids_by_floor()
+
+
+def building_floors(building: str) -> tuple[str, ...]:
+    entry = BUILDINGS.get(building)
+    return entry["floors"] if entry else ()
+
+
+def spot_map_image(spot_id: str) -> str:
+    """Image of the map the spot is drawn on, or "" for unknown spots."""
+    spot = SPOT_GEOMETRY.get(spot_id)
+    if spot is None:
+        return ""
+    return FLOOR_MAPS[(spot["building"], spot["floor"])]["image"]
+
+
+def spot_preview_image(spot_id: str) -> str:
+    """Photo of the spot, else the map it is drawn on."""
+    return SPOT_PREVIEWS.get(spot_id) or spot_map_image(spot_id)
@@ -1,6 +1,9 @@
 import reflex as rx
-from typing import TypedDict, Literal, cast
+from types import MappingProxyType
+from typing import Mapping, TypedDict, Literal, cast
 import random
+from app.states.leaderboard import get_leaderboard
+from app.states.ratings_store import get_ratings_store
 
 
 class Achievement(TypedDict):
@@ -8,104 +11,155 @@ class Achievement(TypedDict):
     title: str
     description: str
     icon: str
+    # Trigger event -> conditions that must all hold, see achievement_rules.py
+    rules: dict[str, dict]
 
 
-class UserState(rx.State):
-    achievements: dict[str, Achievement] = {
+ACHIEVEMENTS: Mapping[str, Achievement] = MappingProxyType(
+    {
         "5-star-sleeper": {
             "id": "5-star-sleeper",
             "title": "5-Star Sleeper",
             "description": "Rate a single location with a perfect 5-star score in all categories.",
             "icon": "star",
+            "rules": {"rating": {"rating_all": 5}},
         },
         "secret-spot-explorer": {
             "id": "secret-spot-explorer",
             "title": "Secret Spot Explorer",
             "description": "Submit ratings for at least 3 different nap spots.",
             "icon": "map-pin",
+            "rules": {
+                "rating": {"min_rated_locations": 3},
+                "check_in": {"checked_in_secret": True},
+            },
         },
         "all-area-conqueror": {
             "id": "all-area-conqueror",
             "title": "All-Area Conqueror",
             "description": "Leave your mark by rating all available nap locations.",
             "icon": "crown",
+            "rules": {"rating": {"rated_all_locations": True}},
         },
         "nap-legend": {
             "id": "nap-legend",
             "title": "Nap Legend",
             "description": "Complete the personality quiz and rate every single location. A true master of rest.",
             "icon": "shield-check",
+            "rules": {
+                "rating": {"rated_all_locations": True, "quiz_finished": True},
+                "quiz_done": {"rated_all_locations": True},
+            },
         },
         "living-on-the-edge": {
             "id": "living-on-the-edge",
             "title": "Living on the Edge",
             "description": "Rate a location with maximum Danger level. You laugh in the face of peril.",
             "icon": "skull",
+            "rules": {"rating": {"rating_equals": {"danger": 5}}},
         },
         "zen-master": {
             "id": "zen-master",
             "title": "Zen Master",
             "description": "Find a spot with perfect Quietness. Inner peace achieved.",
             "icon": "flower",
+            "rules": {"rating": {"rating_equals": {"quietness": 5}}},
         },
         "social-sleeper": {
             "id": "social-sleeper",
             "title": "Social Sleeper",
             "description": "Rate a spot that is loud but has immaculate vibes. Who needs quiet?",
             "icon": "users",
+            "rules": {"rating": {"rating_equals": {"quietness": 1, "vibe_check": 5}}},
         },
         "night-owl": {
             "id": "night-owl",
             "title": "The Night Owl",
             "description": "Access the app during the witching hours (Late Night).",
             "icon": "moon",
+            "rules": {},
         },
         "secret-boss-defeated": {
             "id": "secret-boss-defeated",
             "title": "Secret Boss Defeated",
             "description": "Discover the hidden nap spot. You found the easter egg.",
             "icon": "ghost",
+            "rules": {"check_in": {"checked_in_secret": True}},
         },
         "library-legend": {
             "id": "library-legend",
             "title": "Library Legend",
             "description": "Check in at all library locations (G floor study room, bookshelf corridor, and sofa).",
             "icon": "book-open",
+            "rules": {"check_in": {"checked_in_building": "library"}},
         },
         "outdoor-enthusiast": {
             "id": "outdoor-enthusiast",
             "title": "Outdoor Enthusiast",
             "description": "Check in at all outdoor seating areas (wooden, dining, and stone chairs).",
             "icon": "sun",
+            "rules": {"check_in": {"checked_in_building": "outdoor"}},
         },
         "jcit-master": {
             "id": "jcit-master",
             "title": "JCIT Master",
             "description": "Check in at all JCIT locations (Milk Tea Shop, Stairwell, Study Room areas).",
             "icon": "building",
+            "rules": {"check_in": {"checked_in_building": "jcit"}},
         },
         "comfort-seeker": {
             "id": "comfort-seeker",
             "title": "Comfort Seeker",
             "description": "Check in at all LEGENDARY rarity locations.",
             "icon": "sofa",
+            "rules": {"check_in": {"checked_in_rarity": "LEGENDARY"}},
         },
         "speed-napper": {
             "id": "speed-napper",
             "title": "Speed Napper",
             "description": "Complete a quiz in under 2 minutes.",
             "icon": "zap",
+            "rules": {},
         },
     }
+)
+
+QUOTES: tuple[str, ...] = (
+    "To sleep, perchance to dream... ay, there's the rub... for in that sleep of death what dreams may come? Or, y'know, just drool on your textbook.",
+    "The best bridge between despair and hope is a good night's sleep. Or a really, really good nap in the library.",
+    "I think, therefore I am... tired.",
+    "I have a dream... that one day I will get 8 full hours of sleep.",
+    "Is it a crime to be this tired? Asking for a friend.",
+    "My bed is a magical place where I suddenly remember everything I was supposed to do.",
+    "They say 'go big or go home' as if going home to nap isn't a big win.",
+    "I'm not a morning person or a night owl. I'm some form of permanently exhausted pigeon.",
+    "If you love someone, let them sleep.",
+    "Sleep is the best meditation. Also, it's a great way to avoid responsibilities.",
+    "I've reached that age where my train of thought often leaves the station without me.",
+    "Why fall in love when you can fall asleep?",
+    "The only thing getting lit this weekend are my scented candles for a pre-nap vibe.",
+    "A day without a nap is like... just kidding, I have no idea.",
+    "I'm not lazy, I'm on energy-saving mode.",
+    "Reality is a construct, and I'm constructing a nap.",
+)
+
+
+def level_for_xp(xp: int) -> int:
+    return (xp // 500) + 1
+
+
+class UserState(rx.State):
     unlocked_achievements: set[str] = set()
     gamertag: str = ""
     xp: int = 0
     titles: list[str] = ["Sleepy Newbie"]  # Unlocked titles
     current_title: str = "Sleepy Newbie"  # Currently equipped title
+    # Stable player id from LocationState.load_player, used as leaderboard key
+    _player_id: str = ""
 
     @rx.var
     def level(self) -> int:
-        return (self.xp // 500) + 1
+        return level_for_xp(self.xp)
 
     @rx.var
     def xp_to_next_level(self) -> int:
@@ -133,24 +187,60 @@ class UserState(rx.State):
         else:
             return "SLEEPY NEWBIE"
 
-    @rx.event
-    async def add_xp(self, amount: int, reason: str = ""):
-        """Add XP and check for level up"""
+    def _gain_xp(self, amount: int) -> list:
+        """Add XP and return the level-up notification, if any"""
         old_level = self.level
         self.xp += amount
         new_level = self.level
+        if self._player_id:
+            get_leaderboard().update(self._player_id, self.xp, self.gamertag)
+        
+        # Check if leveled up
+        if new_level > old_level:
+            return [self.level_up_notification(new_level)]
+        return []
+
+    def _grant_achievements(self, achievement_ids: list[str]) -> list:
+        """Unlock achievements, award their XP and return the notifications"""
+        events = []
+        for achievement_id in achievement_ids:
+            if achievement_id in self.unlocked_achievements:
+                continue
+            self.unlocked_achievements.add(achievement_id)
+            if self._player_id:
+                get_ratings_store().record_achievements(self._player_id, [achievement_id])
+            achievement = ACHIEVEMENTS[achievement_id]
+            
+            # Give XP for achievement
+            events.extend(self._gain_xp(200))
+            events.append(
+                rx.toast.warning(
+                    rx.el.div(
+                        rx.icon(achievement["icon"], class_name="mr-2"),
+                        f"🏆 Achievement Unlocked: {achievement['title']} (+200 XP)",
+                        class_name="flex items-center",
+                    ),
+                    duration=5000,
+                    position="top-center"
+                )
+            )
+        return events
+
+    @rx.event
+    def add_xp(self, amount: int, reason: str = ""):
+        """Add XP and check for level up"""
+        events = []
         
         # Show XP gain notification
         if reason:
-            yield rx.toast.info(
-                f"+{amount} XP - {reason}",
-                duration=3000,
-                position="bottom-right"
+            events.append(
+                rx.toast.info(
+                    f"+{amount} XP - {reason}",
+                    duration=3000,
+                    position="bottom-right"
+                )
             )
-        
-        # Check if leveled up
-        if new_level > old_level:
-            yield self.level_up_notification(new_level)
+        return events + self._gain_xp(amount)
     
     @rx.event
     def level_up_notification(self, new_level: int):
@@ -173,59 +263,22 @@ class UserState(rx.State):
 
     @rx.event
     def save_gamertag(self):
+        if self._player_id:
+            get_leaderboard().rename(self._player_id, self.gamertag)
         return rx.toast(f"Gamertag saved: {self.gamertag}", duration=3000)
 
-    quotes: list[str] = [
-        "To sleep, perchance to dream... ay, there's the rub... for in that sleep of death what dreams may come? Or, y'know, just drool on your textbook.",
-        "The best bridge between despair and hope is a good night's sleep. Or a really, really good nap in the library.",
-        "I think, therefore I am... tired.",
-        "I have a dream... that one day I will get 8 full hours of sleep.",
-        "Is it a crime to be this tired? Asking for a friend.",
-        "My bed is a magical place where I suddenly remember everything I was supposed to do.",
-        "They say 'go big or go home' as if going home to nap isn't a big win.",
-        "I'm not a morning person or a night owl. I'm some form of permanently exhausted pigeon.",
-        "If you love someone, let them sleep.",
-        "Sleep is the best meditation. Also, it's a great way to avoid responsibilities.",
-        "I've reached that age where my train of thought often leaves the station without me.",
-        "Why fall in love when you can fall asleep?",
-        "The only thing getting lit this weekend are my scented candles for a pre-nap vibe.",
-        "A day without a nap is like... just kidding, I have no idea.",
-        "I'm not lazy, I'm on energy-saving mode.",
-        "Reality is a construct, and I'm constructing a nap.",
-    ]
-
     @rx.event
-    async def unlock_achievement(self, achievement_id: str):
-        if achievement_id not in self.unlocked_achievements:
-            self.unlocked_achievements.add(achievement_id)
-            achievement = self.achievements[achievement_id]
-            
-            # Give XP for achievement
-            old_level = self.level
-            self.xp += 200
-            new_level = self.level
-            
-            # Check for level up
-            if new_level > old_level:
-                yield self.level_up_notification(new_level)
-            
-            yield rx.toast.warning(
-                rx.el.div(
-                    rx.icon(achievement["icon"], class_name="mr-2"),
-                    f"🏆 Achievement Unlocked: {achievement['title']} (+200 XP)",
-                    class_name="flex items-center",
-                ),
-                duration=5000,
-                position="top-center"
-            )
+    def unlock_achievement(self, achievement_id: str):
+        return self._grant_achievements([achievement_id])
 
-    @rx.var
+    # No inputs: picked once per session instead of on every recompute pass
+    @rx.var(deps=[], auto_deps=False)
     def random_quote(self) -> str:
-        return random.choice(self.quotes)
+        return random.choice(QUOTES)
 
     @rx.var
     def total_achievements_count(self) -> int:
-        return len(self.achievements)
+        return len(ACHIEVEMENTS)
 
     @rx.var
     def unlocked_achievements_count(self) -> int:
@@ -233,14 +286,14 @@ class UserState(rx.State):
 
     @rx.var
     def completion_percentage(self) -> int:
-        if not self.achievements:
+        if not ACHIEVEMENTS:
             return 0
-        return int((len(self.unlocked_achievements) / len(self.achievements)) * 100)
+        return int((len(self.unlocked_achievements) / len(ACHIEVEMENTS)) * 100)
 
     @rx.var
     def remaining_achievements_count(self) -> int:
-        return len(self.achievements) - len(self.unlocked_achievements)
+        return len(ACHIEVEMENTS) - len(self.unlocked_achievements)
 
     @rx.var
     def unlocked_achievements_list(self) -> list[Achievement]:
-        return [self.achievements[id] for id in self.unlocked_achievements]
\ No newline at end of file
+        return [ACHIEVEMENTS[id] for id in self.unlocked_achievements]
\ No newline at end of file
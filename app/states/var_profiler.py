@@ -0,0 +1,166 @@
+"""Recompute profiler for computed vars.
+
+Enabled with ``POLYUNAP_PROFILE_VARS=1``. Every computed var getter is wrapped
+to count its recomputes and their wall time, attributed to the event handler
+being processed. Recomputes outside a handler (hydrate, broadcaster pushes)
+are filed under ``(no handler)``. The numbers are served as JSON on
+``/metrics/computed-vars`` and logged alongside the
+delta size summary.
+"""
+
+import asyncio
+import contextvars
+import functools
+import inspect
+import os
+import threading
+import time
+
+import reflex as rx
+from reflex.middleware import Middleware
+from reflex.utils import console
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+from app.states.delta_metrics import (
+    DEFAULT_LOG_INTERVAL,
+    handler_name,
+    short_state_name,
+)
+
+NO_HANDLER = "(no handler)"
+
+_current_handler: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "current_handler", default=NO_HANDLER
+)
+
+
+def profiling_enabled() -> bool:
+    return os.environ.get("POLYUNAP_PROFILE_VARS", "") not in ("", "0")
+
+
+class TimingStats:
+    __slots__ = ("count", "total_seconds", "max_seconds")
+
+    def __init__(self):
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def add(self, seconds: float):
+        self.count += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+
+    def as_dict(self) -> dict[str, float]:
+        return {
+            "recomputes": self.count,
+            "total_ms": round(self.total_seconds * 1000, 3),
+            "max_ms": round(self.max_seconds * 1000, 3),
+        }
+
+
+class VarProfile:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_var: dict[str, TimingStats] = {}
+        self._by_handler: dict[str, TimingStats] = {}
+        self._vars_by_handler: dict[str, dict[str, int]] = {}
+
+    def record(self, var_name: str, seconds: float):
+        handler = _current_handler.get()
+        with self._lock:
+            self._by_var.setdefault(var_name, TimingStats()).add(seconds)
+            self._by_handler.setdefault(handler, TimingStats()).add(seconds)
+            counts = self._vars_by_handler.setdefault(handler, {})
+            counts[var_name] = counts.get(var_name, 0) + 1
+
+    def snapshot(self) -> dict[str, dict]:
+        with self._lock:
+            return {
+                "vars": {name: stats.as_dict() for name, stats in self._by_var.items()},
+                "handlers": {
+                    name: {**stats.as_dict(), "vars": dict(self._vars_by_handler[name])}
+                    for name, stats in self._by_handler.items()
+                },
+            }
+
+    def summary(self, top: int = 5) -> str:
+        snapshot = self.snapshot()
+        lines = ["Computed var recomputes (count, total time):"]
+        for section in ("vars", "handlers"):
+            ranked = sorted(
+                snapshot[section].items(), key=lambda item: item[1]["total_ms"], reverse=True
+            )
+            lines.append(f"  top {section}:")
+            lines += [
+                f"    {name}: {stats['recomputes']}x, {stats['total_ms']:.2f} ms"
+                for name, stats in ranked[:top]
+            ]
+        return "\n".join(lines)
+
+
+@functools.lru_cache(maxsize=None)
+def get_var_profile() -> VarProfile:
+    return VarProfile()
+
+
+def _timed_getter(var_name: str, fget):
+    profile = get_var_profile()
+
+    @functools.wraps(fget)
+    def timed(state):
+        start = time.perf_counter()
+        try:
+            return fget(state)
+        finally:
+            profile.record(var_name, time.perf_counter() - start)
+
+    return timed
+
+
+def _state_classes(state_cls: type[rx.State]):
+    yield state_cls
+    for substate_cls in state_cls.class_subclasses:
+        yield from _state_classes(substate_cls)
+
+
+def profile_computed_vars(root: type[rx.State] = rx.State):
+    """Wrap the getter of every computed var under ``root`` with a timer.
+
+    The dependencies found by inspecting the original getter are pinned first,
+    so wrapping does not change when a var is recomputed.
+    """
+    for state_cls in _state_classes(root):
+        for name, cvar in state_cls.computed_vars.items():
+            if name in state_cls.inherited_vars or inspect.iscoroutinefunction(cvar._fget):
+                continue
+            deps = cvar._deps(objclass=state_cls)
+            var_name = f"{short_state_name(state_cls.get_full_name())}.{name}"
+            timed = _timed_getter(var_name, cvar._fget)
+            # The class attribute is a copy of the entry in computed_vars
+            for var in {id(v): v for v in (cvar, state_cls.__dict__.get(name, cvar))}.values():
+                object.__setattr__(var, "_static_deps", deps)
+                object.__setattr__(var, "_auto_deps", False)
+                object.__setattr__(var, "_fget", timed)
+
+
+class VarProfileMiddleware(Middleware):
+    async def preprocess(self, app, state, event):
+        _current_handler.set(handler_name(event.name))
+        return None
+
+    async def postprocess(self, app, state, event, update):
+        return update
+
+
+async def var_profile_endpoint(request: Request) -> JSONResponse:
+    return JSONResponse(get_var_profile().snapshot())
+
+
+async def log_var_profile_summary():
+    """Lifespan task writing the recompute summary to the backend log."""
+    interval = float(os.environ.get("POLYUNAP_METRICS_LOG_INTERVAL", DEFAULT_LOG_INTERVAL))
+    while True:
+        await asyncio.sleep(interval)
+        console.info(get_var_profile().summary())
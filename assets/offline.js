@@ -0,0 +1,105 @@
+// Outbox for check-ins and ratings, and service worker registration.
+//
+// Elements with a data-offline-action attribute (see app/components/offline.py)
+// are recorded here on click, before React sees the click, so an action taken
+// while the websocket is down is kept in localStorage instead of waiting in
+// Reflex's in-memory event queue. Whenever the browser is online, the whole
+// outbox goes to the backend in one sync_offline_actions event, sent by
+// clicking the hidden #polyunap-offline-sync button. The backend applies each
+// action once and acknowledges the batch through ack().
+(() => {
+  const STORAGE_KEY = "polyunap_offline_actions";
+  const SYNC_TRIGGER_ID = "polyunap-offline-sync";
+  // A sync not acknowledged after this long is sent again; the backend skips
+  // actions it has already applied
+  const RETRY_MS = 15000;
+  const POLL_MS = 5000;
+
+  let syncStartedAt = 0;
+
+  const load = () => {
+    try {
+      return JSON.parse(localStorage.getItem(STORAGE_KEY)) || [];
+    } catch {
+      return [];
+    }
+  };
+
+  const save = (actions) => localStorage.setItem(STORAGE_KEY, JSON.stringify(actions));
+
+  const newId = () =>
+    crypto.randomUUID
+      ? crypto.randomUUID()
+      : `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`;
+
+  const sync = () => {
+    if (!navigator.onLine || !load().length || Date.now() - syncStartedAt < RETRY_MS) {
+      return;
+    }
+    const trigger = document.getElementById(SYNC_TRIGGER_ID);
+    if (trigger) {
+      syncStartedAt = Date.now();
+      trigger.click();
+    }
+  };
+
+  const record = (action) => {
+    save([...load(), { ...action, id: newId() }]);
+    setTimeout(sync, 0);
+  };
+
+  window.polyunapOffline = {
+    pending: () => load(),
+    ack: (ids) => {
+      const done = new Set(ids);
+      save(load().filter((action) => !done.has(action.id)));
+      syncStartedAt = 0;
+      setTimeout(sync, 0);
+    },
+  };
+
+  document.addEventListener(
+    "click",
+    (event) => {
+      const element = event.target.closest?.("[data-offline-action]");
+      if (element && !element.disabled) {
+        record(JSON.parse(element.dataset.offlineAction));
+      }
+    },
+    true,
+  );
+  window.addEventListener("online", sync);
+  // Also picks up actions left over from a closed tab once the page has rendered
+  setInterval(sync, POLL_MS);
+
+  const script = document.querySelector("script[data-service-worker]");
+  if ("serviceWorker" in navigator && script) {
+    const workerUrl = script.dataset.serviceWorker;
+    if (!workerUrl) {
+      // Offline mode turned off: remove a worker installed earlier
+      navigator.serviceWorker
+        .getRegistrations()
+        .then((registrations) => registrations.forEach((registration) => registration.unregister()));
+    } else {
+      const register = async () => {
+        // The precache version is part of the worker URL, so rebuilt assets install a new worker
+        let version = "";
+        try {
+          const response = await fetch("/precache.json", { cache: "no-cache" });
+          if (response.ok) {
+            version = (await response.json()).version;
+          }
+        } catch {
+          // Offline: keep the worker that is already installed
+          return;
+        }
+        navigator.serviceWorker.register(`${workerUrl}?v=${encodeURIComponent(version)}`);
+      };
+      if (document.readyState === "complete") {
+        register();
+      } else {
+        window.addEventListener("load", register);
+      }
+    }
+  }
+})();
@@ -0,0 +1,151 @@
+// Service worker: keeps Poly U Nap usable without a connection.
+//
+// On install it precaches what /precache.json lists (the pages, map images,
+// icons, styles and image manifests; see build_offline_cache.py) together with
+// the scripts and stylesheets those pages load. Registered as /sw.js?v=<version>
+// by offline.js, so every rebuild of the list installs a fresh cache.
+//
+// Images, fonts and hashed bundles are served cache first. Pages and other
+// files are fetched from the network first, falling back to the cache after
+// NETWORK_TIMEOUT_MS on flaky Wi-Fi. The websocket and backend endpoints are
+// never cached; check-ins and ratings are queued by offline.js instead.
+const VERSION = new URL(self.location.href).searchParams.get("v") || "dev";
+const PRECACHE = `polyunap-precache-${VERSION}`;
+const RUNTIME = "polyunap-runtime";
+const NETWORK_TIMEOUT_MS = 4000;
+const CACHED_ORIGINS = new Set([
+  self.location.origin,
+  "https://fonts.googleapis.com",
+  "https://fonts.gstatic.com",
+]);
+const UNCACHED_PATHS = ["/_event", "/_upload", "/ping", "/_health", "/metrics/", "/precache.json"];
+const CACHE_FIRST_DESTINATIONS = new Set(["image", "font"]);
+// Bundles under /assets/ carry a content hash in their name
+const BUNDLE_PREFIX = "/assets/";
+
+const isPage = (url) => !url.split("?")[0].split("/").pop().includes(".");
+
+async function linkedFiles(pageUrl, cache) {
+  const response = await cache.match(pageUrl);
+  if (!response) {
+    return [];
+  }
+  const html = await response.text();
+  const urls = [...html.matchAll(/(?:src|href)="(\/[^"]+)"/g)].map((match) => match[1]);
+  return urls.filter((url) => url.startsWith(BUNDLE_PREFIX));
+}
+
+async function precache() {
+  const response = await fetch("/precache.json", { cache: "no-cache" });
+  if (!response.ok) {
+    // The list has not been built; pages still get cached as they are visited
+    return;
+  }
+  const { urls } = await response.json();
+  const cache = await caches.open(PRECACHE);
+  // One missing file must not fail the whole install
+  const add = (url) => cache.add(new Request(url, { cache: "reload" })).catch(() => undefined);
+  await Promise.all(urls.map(add));
+  const linked = await Promise.all(urls.filter(isPage).map((url) => linkedFiles(url, cache)));
+  await Promise.all([...new Set(linked.flat())].map(add));
+}
+
+self.addEventListener("install", (event) => {
+  event.waitUntil(precache().then(() => self.skipWaiting()));
+});
+
+self.addEventListener("activate", (event) => {
+  event.waitUntil(
+    caches
+      .keys()
+      .then((names) =>
+        Promise.all(
+          names
+            .filter((name) => name.startsWith("polyunap-precache-") && name !== PRECACHE)
+            .map((name) => caches.delete(name)),
+        ),
+      )
+      .then(() => self.clients.claim()),
+  );
+});
+
+async function remember(request, response) {
+  // Opaque cross-origin responses (status 0) are fonts and stylesheets from Google Fonts
+  if (response.ok || response.type === "opaque") {
+    const cache = await caches.open(RUNTIME);
+    await cache.put(request, response.clone());
+  }
+  return response;
+}
+
+// optimize_map_images.py names variants <image>-<width>w-<hash>.<format>
+const VARIANT_NAME = /^(.*)-\d+w-[0-9a-f]+(\.\w+)$/;
+
+async function cachedVariant(url) {
+  // The browser picks a width from srcset; offline, any cached width of the same image will do
+  const match = url.pathname.match(VARIANT_NAME);
+  if (!match) {
+    return undefined;
+  }
+  for (const name of [PRECACHE, RUNTIME]) {
+    const cache = await caches.open(name);
+    const sibling = (await cache.keys()).find((request) => {
+      const other = new URL(request.url).pathname.match(VARIANT_NAME);
+      return other && other[1] === match[1] && other[2] === match[2];
+    });
+    if (sibling) {
+      return cache.match(sibling);
+    }
+  }
+  return undefined;
+}
+
+async function cacheFirst(request) {
+  const cached = await caches.match(request);
+  if (cached) {
+    return cached;
+  }
+  try {
+    return await remember(request, await fetch(request));
+  } catch (error) {
+    const variant = await cachedVariant(new URL(request.url));
+    if (variant) {
+      return variant;
+    }
+    throw error;
+  }
+}
+
+async function networkFirst(request) {
+  const network = fetch(request).then((response) => remember(request, response));
+  const timeout = new Promise((resolve) => setTimeout(resolve, NETWORK_TIMEOUT_MS));
+  try {
+    const response = await Promise.race([network, timeout]);
+    if (response) {
+      return response;
+    }
+  } catch {
+    // Offline: fall through to the cache
+  }
+  const cached =
+    (await caches.match(request, { ignoreSearch: request.mode === "navigate" })) ||
+    // Pages are rendered in the browser, so any cached page can start the app
+    (request.mode === "navigate" && (await caches.match("/")));
+  return cached || network;
+}
+
+self.addEventListener("fetch", (event) => {
+  const { request } = event;
+  const url = new URL(request.url);
+  if (
+    request.method !== "GET" ||
+    !CACHED_ORIGINS.has(url.origin) ||
+    UNCACHED_PATHS.some((path) => url.pathname.startsWith(path))
+  ) {
+    return;
+  }
+  const cacheFirstRequest =
+    CACHE_FIRST_DESTINATIONS.has(request.destination) ||
+    (url.origin === self.location.origin && url.pathname.startsWith(BUNDLE_PREFIX));
+  event.respondWith(cacheFirstRequest ? cacheFirst(request) : networkFirst(request));
+});
@@ -0,0 +1,152 @@
+"""Cut the campus and floor maps into deep-zoom tile pyramids.
+
+Usage:
+    python build_map_tiles.py --tile-size 256 --workers 8
+
+Each PNG directly under ``assets/map images/`` gets a pyramid in
+``assets/tiles/<name>-<source hash>/<level>/<col>_<row>.webp``. Level 0 fits
+in a single tile and serves as the placeholder; every following level doubles
+the resolution up to the original size. ``manifest.json`` maps each original
+public path to its pyramid so the map only requests the tiles of the zoom
+level and viewport being shown. Unchanged maps are skipped and pyramids of
+old sources are removed.
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import re
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from PIL import Image
+
+from app.states.image_manifest import MANIFEST_NAME, TILES_SUBDIR
+
+ASSETS_DIR = Path("assets")
+SOURCE_DIR = ASSETS_DIR / "map images"
+OUTPUT_DIR = ASSETS_DIR / TILES_SUBDIR
+DEFAULT_TILE_SIZE = 256
+WEBP_OPTIONS = {"quality": 80, "method": 4}
+
+
+def _slug(path: Path) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", path.stem.lower()).strip("-")
+
+
+def _public_path(path: Path) -> str:
+    return "/" + path.relative_to(ASSETS_DIR).as_posix()
+
+
+def _source_hash(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def _pyramid_dir(path: Path, source_hash: str) -> str:
+    return f"{_slug(path)}-{source_hash[:12]}"
+
+
+def build_pyramid(source: str, tile_size: int) -> tuple[str, dict]:
+    """Write every tile of one map; returns its public path and manifest entry."""
+    path = Path(source)
+    source_hash = _source_hash(path)
+    pyramid_dir = _pyramid_dir(path, source_hash)
+    with Image.open(path) as original:
+        original.load()
+        image = original.convert("RGBA" if "A" in original.getbands() else "RGB")
+
+    max_level = max(0, math.ceil(math.log2(max(image.size) / tile_size)))
+    levels = []
+    for level in range(max_level + 1):
+        scale = 2 ** (max_level - level)
+        width = max(1, math.ceil(image.width / scale))
+        height = max(1, math.ceil(image.height / scale))
+        scaled = image if scale == 1 else image.resize((width, height), Image.LANCZOS)
+        cols = math.ceil(width / tile_size)
+        rows = math.ceil(height / tile_size)
+
+        level_dir = OUTPUT_DIR / pyramid_dir / str(level)
+        level_dir.mkdir(parents=True, exist_ok=True)
+        for row in range(rows):
+            for col in range(cols):
+                box = (
+                    col * tile_size,
+                    row * tile_size,
+                    min((col + 1) * tile_size, width),
+                    min((row + 1) * tile_size, height),
+                )
+                scaled.crop(box).save(level_dir / f"{col}_{row}.webp", format="WEBP", **WEBP_OPTIONS)
+        levels.append({"width": width, "height": height, "cols": cols, "rows": rows})
+
+    entry = {
+        "width": image.width,
+        "height": image.height,
+        "tile_size": tile_size,
+        "source_hash": source_hash,
+        "path": f"/{TILES_SUBDIR}/{pyramid_dir}",
+        "levels": levels,
+    }
+    return _public_path(path), entry
+
+
+def build_manifest(tile_size: int, workers: int | None = None) -> dict[str, dict]:
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    manifest_path = OUTPUT_DIR / MANIFEST_NAME
+    previous = json.loads(manifest_path.read_text(encoding="utf-8")) if manifest_path.exists() else {}
+
+    manifest = {}
+    stale_sources = []
+    for path in sorted(SOURCE_DIR.glob("*.png")):
+        entry = previous.get(_public_path(path))
+        source_hash = _source_hash(path)
+        if (
+            entry
+            and entry["source_hash"] == source_hash
+            and entry["tile_size"] == tile_size
+            and (OUTPUT_DIR / _pyramid_dir(path, source_hash)).is_dir()
+        ):
+            manifest[_public_path(path)] = entry
+        else:
+            stale_sources.append(str(path))
+
+    # A rebuilt pyramid may reuse its directory, so clear it before writing
+    for source in stale_sources:
+        path = Path(source)
+        shutil.rmtree(OUTPUT_DIR / _pyramid_dir(path, _source_hash(path)), ignore_errors=True)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        manifest.update(pool.map(build_pyramid, stale_sources, [tile_size] * len(stale_sources)))
+    manifest = dict(sorted(manifest.items()))
+
+    built = {entry["path"].rsplit("/", 1)[-1] for entry in manifest.values()}
+    for stale in OUTPUT_DIR.iterdir():
+        if stale.is_dir() and stale.name not in built:
+            shutil.rmtree(stale)
+
+    manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cut the map images into deep-zoom tiles.")
+    parser.add_argument(
+        "--tile-size", type=int, default=DEFAULT_TILE_SIZE, help="Tile edge in pixels"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count(), help="Number of worker processes"
+    )
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    manifest = build_manifest(args.tile_size, args.workers)
+    elapsed = time.perf_counter() - start
+    tiles = sum(level["cols"] * level["rows"] for entry in manifest.values() for level in entry["levels"])
+    print(f"Built {tiles} tiles for {len(manifest)} maps into {OUTPUT_DIR}/ in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
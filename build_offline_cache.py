@@ -0,0 +1,114 @@
+"""List the files the service worker precaches for offline use.
+
+Usage:
+    python build_offline_cache.py --width 960
+
+Writes ``assets/precache.json``: every page route, the styles, favicon and
+web app manifest, the image manifests, and one copy of every map image and
+icon. Images with optimized variants contribute, per format, the widest
+variant no wider than ``--width``; tiled maps contribute the tiles shown at
+the default zoom.
+The service worker (``assets/sw.js``) caches all of them on install, plus the
+scripts the pages load. The list carries a version hashed from the listed
+files, the offline scripts and the location catalog version, so the browser
+installs a fresh cache when any of them change. Re-run it after rebuilding
+images or the catalog.
+"""
+
+import argparse
+import hashlib
+import json
+from pathlib import Path
+from urllib.parse import quote, unquote
+
+from app.states import routes
+from app.states.image_manifest import (
+    IMAGE_FORMATS,
+    MANIFEST_PATH,
+    TILES_MANIFEST_PATH,
+    load_image_manifest,
+    load_tile_manifest,
+    tile_layout,
+    tile_sources,
+)
+from app.states.location_catalog import load_location_catalog
+from app.states.offline_queue import PRECACHE_NAME
+
+ASSETS_DIR = Path("assets")
+SOURCE_DIR = ASSETS_DIR / "map images"
+DEFAULT_WIDTH = 960
+PAGES = (
+    routes.HOME,
+    routes.QUIZ,
+    routes.RESULTS,
+    routes.LOCATIONS,
+    routes.PROFILE,
+    routes.ACHIEVEMENTS,
+    routes.VISITED_LOCATIONS,
+    routes.LEADERBOARD,
+)
+SHELL_FILES = ("styles.css", "favicon.ico", "manifest.webmanifest", "offline.js")
+# Hashed into the version, so a changed worker is installed, but not precached
+WORKER_FILES = ("sw.js",)
+
+
+def _public_path(path: Path) -> str:
+    return "/" + path.relative_to(ASSETS_DIR).as_posix()
+
+
+def _asset_file(public_path: str) -> Path:
+    return ASSETS_DIR / public_path.lstrip("/")
+
+
+def _image_paths(src: str, width: int) -> list[str]:
+    """What the app may load for one map image, at most ``width`` pixels wide."""
+    if src in load_tile_manifest():
+        layout = tile_layout(src)
+        return [layout["thumbnail"], *tile_sources(layout)]
+    entry = load_image_manifest().get(src)
+    if entry is None:
+        return [src]
+    paths = []
+    for image_format in IMAGE_FORMATS:
+        variants = entry["variants"].get(image_format, [])
+        fitting = [variant for variant in variants if variant["width"] <= width] or variants[:1]
+        paths += [fitting[-1]["src"]] if fitting else []
+    return paths or [src]
+
+
+def build_precache(width: int) -> dict:
+    files = [f"/{name}" for name in SHELL_FILES]
+    files += [_public_path(path) for path in (MANIFEST_PATH, TILES_MANIFEST_PATH) if path.exists()]
+    for source in sorted(SOURCE_DIR.rglob("*.png")):
+        files += _image_paths(_public_path(source), width)
+    files = list(dict.fromkeys(files))
+
+    digest = hashlib.sha256()
+    digest.update(f"catalog {load_location_catalog()['version']}\n".encode())
+    for public_path in [*files, *(f"/{name}" for name in WORKER_FILES)]:
+        digest.update(public_path.encode() + b"\n" + hashlib.sha256(_asset_file(public_path).read_bytes()).digest())
+    return {
+        "version": digest.hexdigest()[:16],
+        "urls": [*PAGES, *(quote(public_path) for public_path in files)],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List the files the service worker precaches.")
+    parser.add_argument(
+        "--width", type=int, default=DEFAULT_WIDTH, help="Widest image variant to precache, in pixels"
+    )
+    args = parser.parse_args()
+
+    precache = build_precache(args.width)
+    output = ASSETS_DIR / PRECACHE_NAME
+    output.write_text(json.dumps(precache, indent=2), encoding="utf-8")
+    size = sum(_asset_file(unquote(url)).stat().st_size for url in precache["urls"] if url not in PAGES)
+    print(
+        f"Listed {len(precache['urls'])} URLs ({size / 1e6:.1f} MB of assets) in {output}, "
+        f"version {precache['version']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
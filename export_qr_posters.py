@@ -0,0 +1,135 @@
+"""Export printable QR posters for every nap spot in the catalog.
+
+Usage:
+    python export_qr_posters.py --out qr_posters --workers 8
+
+Writes ``<id>.png`` and ``<id>.svg`` per location plus ``all_posters.pdf``,
+a combined sheet with one poster per page. Posters are rendered in parallel
+across a process pool.
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from PIL import Image, ImageDraw, ImageFont
+
+from app.states.location_state import LOCATIONS, RARITY_COLORS, Location
+from app.states.qr_cache import QR_BACK_COLOR, QR_FILL_COLOR, location_qr_payload, make_qr
+
+# A4 portrait at 150 dpi
+POSTER_WIDTH = 1240
+POSTER_HEIGHT = 1754
+QR_BOX_SIZE = 24
+SHEET_NAME = "all_posters.pdf"
+
+
+def _font(size: int) -> ImageFont.ImageFont:
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:
+        # Pillow < 10.1 has a single fixed-size bitmap font
+        return ImageFont.load_default()
+
+
+def _draw_centered(draw: ImageDraw.ImageDraw, y: int, text: str, font, fill: str) -> int:
+    left, top, right, bottom = draw.textbbox((0, 0), text, font=font)
+    draw.text(((POSTER_WIDTH - (right - left)) / 2, y), text, font=font, fill=fill)
+    return y + (bottom - top)
+
+
+def render_png_poster(location: Location) -> Image.Image:
+    rarity_color = RARITY_COLORS.get(location["rarity"], "#9ca3af")
+    poster = Image.new("RGB", (POSTER_WIDTH, POSTER_HEIGHT), QR_BACK_COLOR)
+    draw = ImageDraw.Draw(poster)
+    draw.rectangle((20, 20, POSTER_WIDTH - 21, POSTER_HEIGHT - 21), outline=rarity_color, width=12)
+
+    y = _draw_centered(draw, 110, "POLY U NAP", _font(56), QR_FILL_COLOR) + 70
+    y = _draw_centered(draw, y, location["name"].upper(), _font(48), rarity_color) + 30
+    y = _draw_centered(draw, y, f"[ {location['rarity']} ]", _font(40), rarity_color) + 80
+
+    qr_image = make_qr(location_qr_payload(location["id"]), QR_BOX_SIZE).make_image(
+        fill_color=QR_FILL_COLOR, back_color=QR_BACK_COLOR
+    ).convert("RGB")
+    poster.paste(qr_image, ((POSTER_WIDTH - qr_image.width) // 2, y))
+    y += qr_image.height + 80
+
+    y = _draw_centered(draw, y, location["location"], _font(32), "#9ca3af") + 40
+    _draw_centered(draw, y, "SCAN. RATE. NAP. REPEAT.", _font(36), "#ff00ff")
+    return poster
+
+
+def render_svg_poster(location: Location) -> str:
+    rarity_color = RARITY_COLORS.get(location["rarity"], "#9ca3af")
+    matrix = make_qr(location_qr_payload(location["id"])).get_matrix()
+    module = 24
+    qr_size = len(matrix) * module
+    qr_x = (POSTER_WIDTH - qr_size) // 2
+    qr_y = 480
+    modules = "".join(
+        f"M{qr_x + x * module} {qr_y + y * module}h{module}v{module}h-{module}z"
+        for y, row in enumerate(matrix)
+        for x, dark in enumerate(row)
+        if dark
+    )
+    center = POSTER_WIDTH // 2
+    text_y = qr_y + qr_size + 100
+    return f"""<svg xmlns="http://www.w3.org/2000/svg" width="{POSTER_WIDTH}" height="{POSTER_HEIGHT}" viewBox="0 0 {POSTER_WIDTH} {POSTER_HEIGHT}" font-family="monospace" text-anchor="middle">
+  <rect width="100%" height="100%" fill="{QR_BACK_COLOR}"/>
+  <rect x="26" y="26" width="{POSTER_WIDTH - 52}" height="{POSTER_HEIGHT - 52}" fill="none" stroke="{rarity_color}" stroke-width="12"/>
+  <text x="{center}" y="170" font-size="56" fill="{QR_FILL_COLOR}">POLY U NAP</text>
+  <text x="{center}" y="300" font-size="48" fill="{rarity_color}">{escape(location["name"].upper())}</text>
+  <text x="{center}" y="380" font-size="40" fill="{rarity_color}">[ {escape(location["rarity"])} ]</text>
+  <path d="{modules}" fill="{QR_FILL_COLOR}"/>
+  <text x="{center}" y="{text_y}" font-size="32" fill="#9ca3af">{escape(location["location"])}</text>
+  <text x="{center}" y="{text_y + 80}" font-size="36" fill="#ff00ff">SCAN. RATE. NAP. REPEAT.</text>
+</svg>
+"""
+
+
+def export_location(location: Location, out_dir: str) -> str:
+    """Write the PNG and SVG posters for one location; returns the PNG path."""
+    png_path = Path(out_dir) / f"{location['id']}.png"
+    render_png_poster(location).save(png_path, format="PNG", dpi=(150, 150))
+    (Path(out_dir) / f"{location['id']}.svg").write_text(
+        render_svg_poster(location), encoding="utf-8"
+    )
+    return str(png_path)
+
+
+def export_all(out_dir: str, workers: int | None = None) -> list[str]:
+    Path(out_dir).mkdir(parents=True, exist_ok=True)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        png_paths = list(pool.map(export_location, LOCATIONS, [out_dir] * len(LOCATIONS)))
+
+    pages = [Image.open(path).convert("RGB") for path in png_paths]
+    if pages:
+        pages[0].save(
+            Path(out_dir) / SHEET_NAME,
+            format="PDF",
+            save_all=True,
+            append_images=pages[1:],
+            resolution=150.0,
+        )
+    return png_paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export QR posters for every nap spot.")
+    parser.add_argument("--out", default="qr_posters", help="Output directory")
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count(), help="Number of worker processes"
+    )
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    png_paths = export_all(args.out, args.workers)
+    elapsed = time.perf_counter() - start
+    print(f"Exported {len(png_paths)} posters to {args.out}/ ({SHEET_NAME}) in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""Compile the location spreadsheet into the app's nap spot catalog.
+
+Usage:
+    python ingest_locations.py --sheet assets/location_data.xlsx
+
+Each spreadsheet row is parsed into a catalog entry: the id is slugged from
+the name, star ratings are counted in the "Other" column, the Sketchfab id is
+pulled from the embed HTML, and the rarity and icon come from the sleep
+personality. Entries are validated and written to
+``app/data/location_catalog.json``, which the app loads at startup.
+
+Every source row is hashed together with ``PARSER_VERSION``. Rows whose hash
+is already in the catalog keep their compiled entry, so only edited or new
+rows are re-parsed and re-validated. The catalog version is bumped only when
+the compiled locations change. Requires ``pandas`` and ``openpyxl``.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+from app.states.location_catalog import (
+    CATALOG_FORMAT,
+    CATALOG_PATH,
+    Location,
+    LocationCatalog,
+    Rating,
+    load_location_catalog,
+    validate_location,
+)
+from app.states.spot_geometry import OUTDOOR, SPOT_GEOMETRY
+
+DEFAULT_SHEET = Path("assets") / "location_data.xlsx"
+# Bump when the parsing rules below change, so every row is re-parsed
+PARSER_VERSION = 1
+
+NAME_COLUMN = "name"
+LOCATION_COLUMN = "location"
+DESCRIPTION_COLUMN = " Copy"  # Note the leading space
+PERSONALITY_COLUMN = "Primary Dimension - Sleep Personality"
+RATINGS_COLUMN = "Other"
+LINK_COLUMN = "link"
+SECRET_COLUMN = "secret"  # Optional
+SOURCE_COLUMNS: tuple[str, ...] = (
+    NAME_COLUMN,
+    LOCATION_COLUMN,
+    DESCRIPTION_COLUMN,
+    PERSONALITY_COLUMN,
+    RATINGS_COLUMN,
+    LINK_COLUMN,
+    SECRET_COLUMN,
+)
+
+SKETCHFAB_ID = re.compile(r"models/([a-f0-9]+)/")
+DEFAULT_RATING: Rating = {
+    "comfort": 3,
+    "quietness": 3,
+    "accessibility": 3,
+    "vibe_check": 3,
+    "danger": 1,
+}
+BUILDING_KEYWORDS: tuple[tuple[str, str], ...] = (
+    ("library", "library"),
+    ("jcit", "jcit"),
+    ("innovation tower", "jcit"),
+    ("outdoor", OUTDOOR),
+)
+
+
+def row_hash(row: dict[str, str]) -> str:
+    payload = json.dumps([PARSER_VERSION, row], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def location_id(name: str) -> str:
+    """First three words of the name as a slug"""
+    clean = re.sub(r"[^a-zA-Z0-9\s]", "", name)
+    return "-".join(clean.lower().split()[:3])
+
+
+def sketchfab_id(embed_html: str) -> str:
+    match = SKETCHFAB_ID.search(embed_html)
+    return match.group(1) if match else ""
+
+
+def sample_rating(ratings_text: str) -> Rating:
+    """Count the stars on each line of the "Other" column"""
+    rating = dict(DEFAULT_RATING)
+    for line in ratings_text.split("\n"):
+        stars = line.count("★")
+        if not stars:
+            continue
+        if "💤" in line or "Nap Level" in line:
+            rating["comfort"] = stars
+        elif "🔍" in line or "Discovery" in line or "Difficulty" in line:
+            # Harder to discover means less accessible
+            rating["accessibility"] = 6 - stars
+        elif "☁️" in line or "Comfort" in line:
+            rating["quietness"] = stars
+        elif "🕐" in line or "Time" in line:
+            rating["vibe_check"] = stars
+    return rating
+
+
+def rarity(personality: str) -> str:
+    p = personality.upper()
+    if "C (COMFORT)" in p or "SOFA DAYDREAMER" in p:
+        return "LEGENDARY"
+    if "S (STIMULATION)" in p or "LECTURE PHANTOM" in p:
+        return "EPIC"
+    if "R (RITUAL)" in p or "EFFICIENT NAPPER" in p:
+        return "RARE"
+    return "UNCOMMON"
+
+
+def icon(name: str, location: str, personality: str) -> str:
+    name, location, personality = name.lower(), location.lower(), personality.upper()
+    if "sofa" in name or "SOFA DAYDREAMER" in personality:
+        return "sofa"
+    if "outdoor" in location or "EASYGOING" in personality:
+        return "compass"
+    if "stair" in name or "LECTURE PHANTOM" in personality:
+        return "zap"
+    if "tea" in name:
+        return "clock"
+    return "bed-double"
+
+
+def building(spot_id: str, location: str) -> str:
+    """The spot's building in the map registry, else guessed from its location text"""
+    if spot_id in SPOT_GEOMETRY:
+        return SPOT_GEOMETRY[spot_id]["building"]
+    location = location.lower()
+    for keyword, building_id in BUILDING_KEYWORDS:
+        if keyword in location:
+            return building_id
+    return ""
+
+
+def parse_row(row: dict[str, str]) -> Location:
+    name = row[NAME_COLUMN].strip().strip('"').strip()
+    spot_id = location_id(name)
+    personality = row[PERSONALITY_COLUMN]
+    return {
+        "id": spot_id,
+        "location": row[LOCATION_COLUMN].strip(),
+        "building": building(spot_id, row[LOCATION_COLUMN]),
+        "name": name,
+        "description": " ".join(row[DESCRIPTION_COLUMN].split()),
+        "icon": icon(name, row[LOCATION_COLUMN], personality),
+        "model_id": sketchfab_id(row[LINK_COLUMN]),
+        "rarity": rarity(personality),
+        "is_secret": row[SECRET_COLUMN].strip().lower() in ("y", "yes", "true", "1"),
+        "sample_rating": sample_rating(row[RATINGS_COLUMN]),
+    }
+
+
+def read_sheet(path: Path) -> list[dict[str, str]]:
+    # Deferred so --help and the catalog helpers work without pandas installed
+    import pandas as pd
+
+    frame = pd.read_excel(path, dtype=str).fillna("")
+    return [
+        {column: record.get(column, "") for column in SOURCE_COLUMNS}
+        for record in frame.to_dict("records")
+        if record.get(NAME_COLUMN, "").strip()
+    ]
+
+
+def _previous_catalog(path: Path) -> LocationCatalog | None:
+    try:
+        return load_location_catalog(path)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def ingest(sheet: Path, catalog_path: Path, force: bool) -> int:
+    previous = _previous_catalog(catalog_path)
+    previous_by_hash: dict[str, Location] = {}
+    if previous and not force:
+        previous_by_id = {loc["id"]: loc for loc in previous["locations"]}
+        previous_by_hash = {
+            digest: previous_by_id[spot_id]
+            for digest, spot_id in previous["row_hashes"].items()
+            if spot_id in previous_by_id
+        }
+
+    locations: list[Location] = []
+    row_hashes: dict[str, str] = {}
+    errors: list[str] = []
+    parsed = 0
+    # Row numbers as shown in the spreadsheet, below the header row
+    for line, row in enumerate(read_sheet(sheet), start=2):
+        digest = row_hash(row)
+        location = previous_by_hash.get(digest)
+        if location is None:
+            location = parse_row(row)
+            parsed += 1
+            errors += [f"row {line} ({location['id']}): {error}" for error in validate_location(location)]
+        locations.append(location)
+        row_hashes[digest] = location["id"]
+
+    ids = [loc["id"] for loc in locations]
+    errors += [f"duplicate id {spot_id!r}" for spot_id in sorted({i for i in ids if ids.count(i) > 1})]
+    if errors:
+        print(f"{len(errors)} problem(s) in {sheet}; catalog not written:", file=sys.stderr)
+        for error in errors:
+            print(f"  {error}", file=sys.stderr)
+        return 1
+    for spot_id in sorted(set(SPOT_GEOMETRY) - set(ids)):
+        print(f"warning: {spot_id!r} is in SPOT_GEOMETRY but not in the sheet", file=sys.stderr)
+    for spot_id in sorted(set(ids) - set(SPOT_GEOMETRY)):
+        print(f"warning: {spot_id!r} has no map position; add it to SPOT_GEOMETRY", file=sys.stderr)
+
+    reused = len(locations) - parsed
+    # Only the compiled locations decide the version clients cache by; a change
+    # to columns the catalog does not use only refreshes the row hashes
+    content_changed = previous is None or previous["locations"] != locations
+    if not content_changed and previous["row_hashes"] == row_hashes:
+        print(f"{len(locations)} rows, {parsed} re-parsed, {reused} unchanged; catalog v{previous['version']} is current")
+        return 0
+
+    if previous is None:
+        version = 1
+    else:
+        version = previous["version"] + 1 if content_changed else previous["version"]
+    catalog: LocationCatalog = {
+        "format": CATALOG_FORMAT,
+        "version": version,
+        "source": sheet.as_posix(),
+        "row_hashes": row_hashes,
+        "locations": locations,
+    }
+    catalog_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = catalog_path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(catalog, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    os.replace(tmp_path, catalog_path)
+    print(
+        f"{len(locations)} rows, {parsed} re-parsed, {reused} unchanged; "
+        f"wrote catalog v{catalog['version']} to {catalog_path}"
+        + ("" if content_changed else " (locations unchanged, version kept)")
+    )
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile the location spreadsheet into the nap spot catalog.")
+    parser.add_argument("--sheet", type=Path, default=DEFAULT_SHEET, help="Location spreadsheet (.xlsx)")
+    parser.add_argument("--catalog", type=Path, default=CATALOG_PATH, help="Catalog file to update")
+    parser.add_argument("--force", action="store_true", help="Re-parse every row")
+    args = parser.parse_args()
+    sys.exit(ingest(args.sheet, args.catalog, args.force))
+
+
+if __name__ == "__main__":
+    main()
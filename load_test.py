@@ -0,0 +1,232 @@
+"""Websocket load test for the quiz, check-in and rating flows.
+
+Usage:
+    reflex run --env prod --backend-only &
+    python load_test.py --url http://localhost:8000 --sessions 200 --ramp 10
+
+Each simulated student opens its own Reflex websocket session, hydrates like
+the browser does, then plays a realistic flow: open the quiz, answer all six
+questions, see the results, browse the locations, open a spot's page, check
+in, and submit a five-dimension rating. Each page visit sends the page's
+``on_load`` event with its path, as client-side navigation does; check-ins
+and ratings are synced from the browser outbox like the frontend sends them. Events are sent one at a time per session, as the
+frontend does, and backend events returned in an update are sent back as
+follow-ups. The report covers throughput, p50/p95/p99 event latency (send
+to final update) and delta sizes.
+
+Requires the asyncio Socket.IO client: ``pip install "python-socketio[asyncio_client]"``.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+import uuid
+from collections import defaultdict
+
+import socketio
+from reflex import constants
+
+from app.states import routes
+from app.states.location_state import LOCATIONS, LocationState
+from app.states.quiz_state import QUESTIONS, QuizState
+from app.states.rating_stats import RATING_DIMENSIONS
+
+ROOT_STATE = "reflex___state____state"
+EVENT_NAMESPACE = str(constants.Endpoint.EVENT)
+
+
+def _handler(state_cls, name: str) -> str:
+    return f"{state_cls.get_full_name()}.{name}"
+
+
+def _visit(path: str) -> tuple[str, str, dict]:
+    # Client-side navigation to a page runs its on_load handlers
+    return (path, f"{ROOT_STATE}.{constants.CompileVars.ON_LOAD_INTERNAL}", {})
+
+
+def _action(kind: str, location_id: str, rating: dict | None = None) -> dict:
+    # What assets/offline.js puts in the outbox for a check-in or rating click
+    return {"id": str(uuid.uuid4()), "kind": kind, "location_id": location_id, "rating": rating}
+
+
+def student_flow() -> list[tuple[str, str, dict]]:
+    """(page path, event, payload) one student sends, in order."""
+    location_id = random.choice(LOCATIONS)["id"]
+    detail = routes.location_route(location_id)
+    rating = {dimension: random.randint(1, 5) for dimension in RATING_DIMENSIONS}
+    flow = [
+        (routes.HOME, f"{ROOT_STATE}.{constants.CompileVars.HYDRATE}", {}),
+        _visit(routes.HOME),
+        _visit(routes.QUIZ),
+    ]
+    flow += [
+        (
+            routes.QUIZ,
+            _handler(QuizState, "handle_answer"),
+            {"question_index": index, "answer": random.choice(tuple(question["choices"]))},
+        )
+        for index, question in enumerate(QUESTIONS)
+    ]
+    flow += [
+        _visit(routes.RESULTS),
+        _visit(routes.LOCATIONS),
+        _visit(detail),
+        (detail, _handler(LocationState, "sync_offline_actions"), {"actions": [_action("check_in", location_id)]}),
+    ]
+    # The sliders only change client state; the finished rating is one event
+    flow.append(
+        (detail, _handler(LocationState, "sync_offline_actions"), {"actions": [_action("rating", location_id, rating)]})
+    )
+    return flow
+
+
+class Results:
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.delta_bytes: list[int] = []
+        self.errors = 0
+        self.last_error = ""
+        self.timeouts = 0
+
+    def all_latencies(self) -> list[float]:
+        return [latency for latencies in self.latencies.values() for latency in latencies]
+
+
+class StudentSession:
+    """One browser tab: a websocket plus a single in-flight event."""
+
+    def __init__(self, url: str, results: Results, timeout: float):
+        self.url = url
+        self.results = results
+        self.timeout = timeout
+        self.token = str(uuid.uuid4())
+        self.client = socketio.AsyncClient(reconnection=False)
+        self._final: asyncio.Future | None = None
+        self._follow_ups: list[dict] = []
+        self.client.on("event", self._on_update, namespace=EVENT_NAMESPACE)
+
+    async def _on_update(self, update):
+        if isinstance(update, str):
+            update = json.loads(update)
+        if update.get("delta"):
+            self.results.delta_bytes.append(
+                len(json.dumps(update["delta"], separators=(",", ":")).encode())
+            )
+        # Events starting with "_" run in the browser (toasts, scripts)
+        self._follow_ups += [
+            event for event in update.get("events", []) if not event["name"].startswith("_")
+        ]
+        if update.get("final", True) and self._final is not None and not self._final.done():
+            self._final.set_result(None)
+
+    async def connect(self):
+        await self.client.connect(
+            f"{self.url}?token={self.token}",
+            socketio_path=str(constants.Endpoint.EVENT),
+            namespaces=[EVENT_NAMESPACE],
+            transports=["websocket"],
+        )
+
+    async def send(self, name: str, payload: dict, path: str = routes.HOME):
+        self._final = asyncio.get_running_loop().create_future()
+        event = {
+            "token": self.token,
+            "name": name,
+            "payload": payload,
+            "router_data": {"pathname": path, "query": {}, "asPath": path},
+        }
+        start = time.perf_counter()
+        await self.client.emit("event", event, namespace=EVENT_NAMESPACE)
+        try:
+            await asyncio.wait_for(self._final, self.timeout)
+        except asyncio.TimeoutError:
+            self.results.timeouts += 1
+            return
+        self.results.latencies[name.rsplit(".", 1)[-1]].append(time.perf_counter() - start)
+
+    async def run(self, flow: list[tuple[str, str, dict]], think_time: float):
+        try:
+            await self.connect()
+            for path, name, payload in flow:
+                await self.send(name, payload, path)
+                while self._follow_ups:
+                    follow_up = self._follow_ups.pop(0)
+                    await self.send(follow_up["name"], follow_up.get("payload", {}), path)
+                if think_time:
+                    await asyncio.sleep(random.uniform(0, think_time))
+        except Exception as exc:
+            self.results.errors += 1
+            self.results.last_error = repr(exc)
+        finally:
+            await self.client.disconnect()
+
+
+def percentile(values: list[float], percent: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[percent - 1]
+
+
+def report(results: Results, sessions: int, elapsed: float):
+    latencies = results.all_latencies()
+    print(f"Sessions:     {sessions} ({results.errors} failed, {results.timeouts} timed-out events)")
+    if results.last_error:
+        print(f"Last error:   {results.last_error}")
+    print(f"Events:       {len(latencies)} in {elapsed:.2f}s = {len(latencies) / elapsed:.1f} events/s")
+    print(
+        "Latency:      "
+        f"p50 {percentile(latencies, 50) * 1000:.1f} ms, "
+        f"p95 {percentile(latencies, 95) * 1000:.1f} ms, "
+        f"p99 {percentile(latencies, 99) * 1000:.1f} ms"
+    )
+    if results.delta_bytes:
+        print(
+            f"Delta size:   mean {statistics.fmean(results.delta_bytes):.0f} B, "
+            f"p95 {percentile(results.delta_bytes, 95):.0f} B, "
+            f"max {max(results.delta_bytes)} B over {len(results.delta_bytes)} deltas"
+        )
+    print("Per event (p50 / p95 ms):")
+    for name, values in sorted(results.latencies.items()):
+        print(
+            f"  {name:<24} {len(values):>6}  "
+            f"{percentile(values, 50) * 1000:8.1f} / {percentile(values, 95) * 1000:8.1f}"
+        )
+
+
+async def run_load_test(
+    url: str, sessions: int, ramp: float, think_time: float, timeout: float
+) -> tuple[Results, float]:
+    """Play ``sessions`` student flows; returns the results and the elapsed seconds."""
+    results = Results()
+    students = [StudentSession(url, results, timeout) for _ in range(sessions)]
+
+    async def start(index: int, student: StudentSession):
+        await asyncio.sleep(ramp * index / max(sessions, 1))
+        await student.run(student_flow(), think_time)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(start(index, student) for index, student in enumerate(students)))
+    return results, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the Poly U Nap backend over websockets.")
+    parser.add_argument("--url", default="http://localhost:8000", help="Backend URL")
+    parser.add_argument("--sessions", type=int, default=50, help="Concurrent student sessions")
+    parser.add_argument("--ramp", type=float, default=5.0, help="Seconds over which sessions start")
+    parser.add_argument(
+        "--think-time", type=float, default=0.0, help="Max random pause between events (s)"
+    )
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-event timeout (s)")
+    args = parser.parse_args()
+    results, elapsed = asyncio.run(
+        run_load_test(args.url, args.sessions, args.ramp, args.think_time, args.timeout)
+    )
+    report(results, args.sessions, elapsed)
+
+
+if __name__ == "__main__":
+    main()
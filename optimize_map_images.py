@@ -0,0 +1,150 @@
+"""Build responsive WebP/AVIF variants of the map images.
+
+Usage:
+    python optimize_map_images.py --widths 480 960 1600 2400 --workers 8
+
+Every PNG under ``assets/map images/`` is resized to each requested width
+that is not larger than the original and encoded as AVIF and WebP. Output
+files are named ``<name>-<width>w-<content hash>.<format>`` under
+``assets/optimized/`` so they can be cached forever, and ``manifest.json``
+maps each original public path (e.g. ``/map images/POLYU MAP.png``) to its
+variants. Images whose source hash and widths are unchanged since the last
+build are skipped; files left over from previous builds are removed.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from PIL import Image
+
+from app.states.image_manifest import IMAGE_FORMATS, MANIFEST_NAME, OPTIMIZED_SUBDIR
+
+ASSETS_DIR = Path("assets")
+SOURCE_DIR = ASSETS_DIR / "map images"
+OUTPUT_DIR = ASSETS_DIR / OPTIMIZED_SUBDIR
+DEFAULT_WIDTHS = (480, 960, 1600, 2400)
+ENCODE_OPTIONS = {
+    "avif": {"quality": 55, "speed": 6},
+    "webp": {"quality": 80, "method": 6},
+}
+
+
+def _slug(path: Path) -> str:
+    name = path.relative_to(SOURCE_DIR).with_suffix("").as_posix()
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+
+
+def _public_path(path: Path) -> str:
+    return "/" + path.relative_to(ASSETS_DIR).as_posix()
+
+
+def _source_hash(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def _is_current(entry: dict | None, source_hash: str, widths: tuple[int, ...]) -> bool:
+    if not entry or entry.get("source_hash") != source_hash or entry.get("widths") != list(widths):
+        return False
+    return all(
+        (OUTPUT_DIR / variant["src"].rsplit("/", 1)[-1]).exists()
+        for variants in entry["variants"].values()
+        for variant in variants
+    )
+
+
+def optimize_image(source: str, widths: tuple[int, ...]) -> tuple[str, dict]:
+    """Encode every variant of one image; returns its public path and manifest entry."""
+    path = Path(source)
+    with Image.open(path) as original:
+        original.load()
+        image = original.convert("RGBA" if "A" in original.getbands() else "RGB")
+
+    targets = sorted({width for width in widths if width < image.width} | {image.width})
+    variants: dict[str, list[dict]] = {fmt: [] for fmt in IMAGE_FORMATS}
+    for width in targets:
+        height = round(image.height * width / image.width)
+        resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+        for fmt in IMAGE_FORMATS:
+            tmp_path = OUTPUT_DIR / f"{_slug(path)}-{width}w.{os.getpid()}.tmp"
+            resized.save(tmp_path, format=fmt.upper(), **ENCODE_OPTIONS[fmt])
+            digest = hashlib.sha256(tmp_path.read_bytes()).hexdigest()[:12]
+            filename = f"{_slug(path)}-{width}w-{digest}.{fmt}"
+            os.replace(tmp_path, OUTPUT_DIR / filename)
+            variants[fmt].append({"width": width, "src": f"/{OPTIMIZED_SUBDIR}/{filename}"})
+
+    entry = {
+        "width": image.width,
+        "height": image.height,
+        "source_hash": _source_hash(path),
+        "widths": list(widths),
+        "variants": variants,
+    }
+    return _public_path(path), entry
+
+
+def build_manifest(widths: tuple[int, ...], workers: int | None = None) -> dict[str, dict]:
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    manifest_path = OUTPUT_DIR / MANIFEST_NAME
+    previous = json.loads(manifest_path.read_text(encoding="utf-8")) if manifest_path.exists() else {}
+
+    manifest = {}
+    stale_sources = []
+    for path in sorted(SOURCE_DIR.rglob("*.png")):
+        entry = previous.get(_public_path(path))
+        if _is_current(entry, _source_hash(path), widths):
+            manifest[_public_path(path)] = entry
+        else:
+            stale_sources.append(str(path))
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        manifest.update(pool.map(optimize_image, stale_sources, [widths] * len(stale_sources)))
+    manifest = dict(sorted(manifest.items()))
+
+    built = {
+        variant["src"].rsplit("/", 1)[-1]
+        for entry in manifest.values()
+        for variants in entry["variants"].values()
+        for variant in variants
+    }
+    for stale in OUTPUT_DIR.iterdir():
+        if stale.name not in built and stale.name != MANIFEST_NAME:
+            stale.unlink()
+
+    manifest_path.write_text(
+        json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8"
+    )
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build responsive WebP/AVIF map images.")
+    parser.add_argument(
+        "--widths", type=int, nargs="+", default=DEFAULT_WIDTHS, help="Target widths in pixels"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count(), help="Number of worker processes"
+    )
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    manifest = build_manifest(tuple(args.widths), args.workers)
+    elapsed = time.perf_counter() - start
+    source_bytes = sum((ASSETS_DIR / src.lstrip("/")).stat().st_size for src in manifest)
+    largest_bytes = sum(
+        (OUTPUT_DIR / entry["variants"]["webp"][-1]["src"].rsplit("/", 1)[-1]).stat().st_size
+        for entry in manifest.values()
+    )
+    print(
+        f"Optimized {len(manifest)} images into {OUTPUT_DIR}/ in {elapsed:.2f}s "
+        f"(full-width WebP {largest_bytes / 1e6:.1f} MB vs PNG {source_bytes / 1e6:.1f} MB)"
+    )
+
+
+if __name__ == "__main__":
+    main()
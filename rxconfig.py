@@ -1,3 +1,12 @@
+import os
+
 import reflex as rx
 
-config = rx.Config(app_name="app", plugins=[rx.plugins.TailwindV3Plugin(), rx.plugins.sitemap.SitemapPlugin()])
+config = rx.Config(
+    app_name="app",
+    plugins=[rx.plugins.TailwindV3Plugin(), rx.plugins.sitemap.SitemapPlugin()],
+    # Where session state lives: empty keeps it in backend memory, a redis:// URL
+    # in Redis, and memory:// in an in-process stand-in (needs fakeredis).
+    # See app/states/redis_state.py.
+    polyunap_redis_url=os.environ.get("POLYUNAP_REDIS_URL", ""),
+)
@@ -0,0 +1,170 @@
+"""Cold start benchmark: process launch to first served event.
+
+Usage:
+    python startup_benchmark.py --runs 5 --budget 10
+
+Each run starts a fresh backend (``reflex run --env prod --backend-only`` on a
+free port), then measures how long it takes until ``/ping`` answers and until
+a websocket session gets the final update of its hydrate event, as the first
+browser tab after a redeploy would. With ``--budget`` the command exits
+non-zero when the median time to first event is over budget, so it can gate
+deploys. ``--imports`` additionally lists the slowest imports of the app
+module, from ``python -X importtime``.
+
+Requires the asyncio Socket.IO client, like ``load_test.py``.
+"""
+
+import argparse
+import asyncio
+import os
+import re
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+from reflex import constants
+
+from load_test import ROOT_STATE, Results, StudentSession
+
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_ping(url: str, process: subprocess.Popen, timeout: float):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"backend exited with code {process.returncode}")
+        try:
+            with urllib.request.urlopen(f"{url}/ping", timeout=1):
+                return
+        except (urllib.error.URLError, ConnectionError, TimeoutError):
+            time.sleep(0.02)
+    raise TimeoutError(f"backend did not answer /ping within {timeout}s")
+
+
+async def _first_event(url: str, timeout: float):
+    results = Results()
+    session = StudentSession(url, results, timeout)
+    try:
+        await session.connect()
+        await session.send(f"{ROOT_STATE}.{constants.CompileVars.HYDRATE}", {})
+    finally:
+        await session.client.disconnect()
+    if results.timeouts:
+        raise TimeoutError(f"hydrate was not answered within {timeout}s")
+
+
+def start_backend(port: int, env: dict[str, str] | None = None) -> subprocess.Popen:
+    """``reflex run --env prod --backend-only`` on ``port``, with extra environment variables."""
+    command = ["reflex", "run", "--env", "prod", "--backend-only", "--backend-port", str(port)]
+    return subprocess.Popen(
+        command,
+        env={**os.environ, **(env or {})},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+def stop_backend(process: subprocess.Popen):
+    # reflex run forks the ASGI server, so stop the whole process group
+    os.killpg(process.pid, signal.SIGTERM)
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        os.killpg(process.pid, signal.SIGKILL)
+
+
+def measure_cold_start(timeout: float) -> tuple[float, float]:
+    """Seconds from launch to /ping and to the first served event."""
+    port = free_port()
+    url = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    process = start_backend(port)
+    try:
+        wait_for_ping(url, process, timeout)
+        ping = time.perf_counter() - started
+        asyncio.run(_first_event(url, timeout))
+        return ping, time.perf_counter() - started
+    finally:
+        stop_backend(process)
+
+
+def _package(module: str) -> str:
+    # App modules are ours to fix, so they are reported one by one
+    return module if module.startswith("app.") else module.split(".")[0]
+
+
+def slowest_imports(module: str, top: int) -> list[tuple[str, float]]:
+    """(package, ms) of the slowest imports when loading ``module``.
+
+    Third-party packages are charged the cumulative time of imports made from
+    outside the package. App modules are charged only their own (self) time,
+    because reflex loads lazily and would otherwise be billed to whichever
+    app module touches it first.
+    """
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    rows = [
+        (name, len(indent), int(self_us) / 1000, int(cumulative_us) / 1000)
+        for self_us, cumulative_us, indent, name in IMPORT_LINE.findall(output)
+    ]
+    totals: dict[str, float] = {}
+    # importtime lists children before their parent, one indent level deeper
+    for index, (name, depth, self_ms, cumulative_ms) in enumerate(rows):
+        package = _package(name)
+        if name.startswith("app.") or name == "app":
+            totals[package] = totals.get(package, 0.0) + self_ms
+            continue
+        parent = next((other for other, d, _, _ in rows[index + 1 :] if d < depth), "")
+        if _package(parent) != package:
+            totals[package] = totals.get(package, 0.0) + cumulative_ms
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure Poly U Nap backend cold start time.")
+    parser.add_argument("--runs", type=int, default=3, help="Cold starts to measure")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Per-run timeout (s)")
+    parser.add_argument(
+        "--budget", type=float, default=None, help="Fail if the median time to first event exceeds this (s)"
+    )
+    parser.add_argument("--imports", type=int, default=0, help="Also list the N slowest app imports")
+    args = parser.parse_args()
+
+    if args.imports:
+        print("Slowest imports of app.app (ms):")
+        for package, milliseconds in slowest_imports("app.app", args.imports):
+            print(f"  {package:<40} {milliseconds:8.1f}")
+
+    pings, first_events = [], []
+    for run in range(1, args.runs + 1):
+        ping, first_event = measure_cold_start(args.timeout)
+        pings.append(ping)
+        first_events.append(first_event)
+        print(f"Run {run}: /ping after {ping:.2f}s, first event served after {first_event:.2f}s")
+
+    median = statistics.median(first_events)
+    print(f"Median: /ping {statistics.median(pings):.2f}s, first event {median:.2f}s")
+    if args.budget is not None and median > args.budget:
+        print(f"Over budget: {median:.2f}s > {args.budget:.2f}s", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
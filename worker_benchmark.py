@@ -0,0 +1,109 @@
+"""Throughput of the backend at several worker counts on one machine.
+
+Usage:
+    python worker_benchmark.py --redis-url redis://localhost:6379/15 --workers 1 2 4 8
+
+For each worker count the benchmark starts a fresh production backend
+(``GRANIAN_WORKERS=<n>``) with its state in Redis and its own empty SQLite
+store, warms every worker up, then runs the ``load_test.py`` student flows
+from several client processes at once, so the load generator itself is not
+the bottleneck. It reports events per second and latency per worker count.
+
+The Redis database given by ``--redis-url`` is flushed before every run, so
+point it at a database nothing else uses. Requires the asyncio Socket.IO
+client, like ``load_test.py``.
+"""
+
+import argparse
+import asyncio
+import concurrent.futures
+import sys
+import tempfile
+from pathlib import Path
+
+import redis
+
+from load_test import Results, percentile, run_load_test
+from startup_benchmark import free_port, start_backend, stop_backend, wait_for_ping
+
+DEFAULT_REDIS_URL = "redis://localhost:6379/15"
+DEFAULT_WORKERS = (1, 2, 4, 8)
+
+
+def _client(url: str, sessions: int, ramp: float, timeout: float) -> tuple[Results, float]:
+    return asyncio.run(run_load_test(url, sessions, ramp, 0.0, timeout))
+
+
+def run_clients(url: str, sessions: int, ramp: float, timeout: float, processes: int) -> tuple[Results, float]:
+    """Split ``sessions`` over ``processes`` load generators; merged results and wall time."""
+    shares = [sessions // processes + (index < sessions % processes) for index in range(processes)]
+    with concurrent.futures.ProcessPoolExecutor(processes) as pool:
+        futures = [pool.submit(_client, url, share, ramp, timeout) for share in shares if share]
+        outcomes = [future.result() for future in futures]
+    merged = Results()
+    for results, _ in outcomes:
+        for name, latencies in results.latencies.items():
+            merged.latencies[name] += latencies
+        merged.delta_bytes += results.delta_bytes
+        merged.errors += results.errors
+        merged.timeouts += results.timeouts
+        merged.last_error = results.last_error or merged.last_error
+    return merged, max(elapsed for _, elapsed in outcomes)
+
+
+def benchmark(workers: int, args: argparse.Namespace) -> tuple[Results, float]:
+    redis.Redis.from_url(args.redis_url).flushdb()
+    port = free_port()
+    url = f"http://127.0.0.1:{port}"
+    with tempfile.TemporaryDirectory() as tmp:
+        process = start_backend(
+            port,
+            {
+                "GRANIAN_WORKERS": str(workers),
+                "POLYUNAP_REDIS_URL": args.redis_url,
+                "POLYUNAP_DB": str(Path(tmp) / "polyunap.db"),
+            },
+        )
+        try:
+            wait_for_ping(url, process, args.timeout)
+            # /ping is answered by the first worker up; give the rest a few sessions too
+            run_clients(url, workers * 4, 0.0, args.timeout, args.client_processes)
+            return run_clients(url, args.sessions, args.ramp, args.timeout, args.client_processes)
+        finally:
+            stop_backend(process)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure Poly U Nap throughput at several backend worker counts.")
+    parser.add_argument("--redis-url", default=DEFAULT_REDIS_URL, help="Redis database to keep state in (flushed!)")
+    parser.add_argument("--workers", type=int, nargs="+", default=DEFAULT_WORKERS, help="Worker counts to measure")
+    parser.add_argument("--sessions", type=int, default=200, help="Student sessions per run")
+    parser.add_argument("--ramp", type=float, default=2.0, help="Seconds over which sessions start")
+    parser.add_argument("--client-processes", type=int, default=4, help="Load generator processes")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Startup and per-event timeout (s)")
+    args = parser.parse_args()
+
+    try:
+        redis.Redis.from_url(args.redis_url).ping()
+    except redis.RedisError as exc:
+        print(f"Cannot reach Redis at {args.redis_url}: {exc}", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"{'workers':>7} {'events':>7} {'events/s':>9} {'scaling':>8} {'p50 ms':>8} {'p95 ms':>8} {'failed':>7}")
+    baseline = None
+    for workers in args.workers:
+        results, elapsed = benchmark(workers, args)
+        latencies = results.all_latencies()
+        throughput = len(latencies) / elapsed
+        baseline = baseline or throughput
+        print(
+            f"{workers:>7} {len(latencies):>7} {throughput:>9.1f} {throughput / baseline:>7.2f}x "
+            f"{percentile(latencies, 50) * 1000:>8.1f} {percentile(latencies, 95) * 1000:>8.1f} "
+            f"{results.errors + results.timeouts:>7}"
+        )
+        if results.last_error:
+            print(f"        last error: {results.last_error}")
+
+
+if __name__ == "__main__":
+    main()